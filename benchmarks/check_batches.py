@@ -0,0 +1,169 @@
+"""
+Проверка пакетных операций TaskManager во всех режимах хранения.
+
+Каждый сценарий выполняется на новом менеджере для каждого режима
+(JSON, журнал, SQLite с pushdown, бинарный снимок в режиме lazy),
+после чего задачи перечитываются из хранилища и сравниваются
+с ожидаемыми. Сценарии:
+
+- изменение и завершение одной задачи в одном пакете;
+- повторное добавление задачи с тем же id в одном пакете;
+- завершение задачи, добавленной ранее в том же пакете;
+- откат пакета, прерванного исключением;
+- приоритеты CachedPriorityStrategy после отката изменения;
+- дедлайны с часовым поясом вперемешку с дедлайнами без пояса.
+
+В режиме pushdown изменения пакета попадают в хранилище только
+при сохранении, поэтому эти сценарии проверяют, что менеджер
+видит их до записи.
+
+Запуск из корня проекта:
+    python -m benchmarks.check_batches
+"""
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from models.enums import Priority
+from models.task import Task
+from services.history import HistoryStore
+from services.task_manager import TaskManager
+from storage.binary_storage import BinaryStorage
+from storage.journal_storage import JournalStorage
+from storage.json_storage import JSONStorage
+from storage.sqlite_storage import SQLiteStorage
+from strategies.cached import CachedPriorityStrategy
+from strategies.importance import ImportancePriorityStrategy
+
+# Режим: (класс хранилища, имя файла, параметры TaskManager)
+MODES = {
+    "json": (JSONStorage, "tasks.json", {}),
+    "journal": (JournalStorage, "tasks.json", {}),
+    "sqlite-pushdown": (SQLiteStorage, "tasks.db", {"pushdown": True}),
+    "binary-lazy": (BinaryStorage, "tasks.bin", {"lazy": True}),
+}
+
+
+def check(condition: bool, message: str) -> None:
+    if not condition:
+        raise AssertionError(message)
+
+
+def update_then_complete(manager: TaskManager) -> Dict[str, dict]:
+    manager.add_task(Task(title="Задача", description="", id="a"))
+    with manager.batch():
+        check(manager.update_task("a", title="Изменённая", priority=Priority.HIGH),
+              "update_task вернул False")
+        check(manager.complete_task("a"), "complete_task вернул False")
+        stats = manager.get_statistics()
+        check(stats["completed"] == 1 and stats["by_priority"]["high"] == 1,
+              f"статистика внутри пакета не видит изменений: {stats}")
+    return {"a": {"title": "Изменённая", "priority": "high", "completed": True}}
+
+
+def duplicate_add(manager: TaskManager) -> Dict[str, dict]:
+    added = manager.add_tasks([
+        Task(title="Первая", description="", id="a"),
+        Task(title="Вторая", description="", id="a"),
+    ])
+    check(added == 1, f"добавлено {added} задач с одним id")
+    return {"a": {"title": "Первая"}}
+
+
+def complete_added(manager: TaskManager) -> Dict[str, dict]:
+    with manager.batch():
+        manager.add_task(Task(title="Новая", description="", id="a", tags=["тег"]))
+        check(manager.complete_task("a"), "complete_task не нашёл задачу пакета")
+        check([task.id for task in manager.get_tasks_by_tag("тег")] == ["a"],
+              "выборка по тегу не видит задачу пакета")
+        check(len(manager.search_tasks("нов")) == 1, "поиск не видит задачу пакета")
+    return {"a": {"title": "Новая", "completed": True}}
+
+
+def rollback(manager: TaskManager) -> Dict[str, dict]:
+    manager.add_task(Task(title="Задача", description="", id="a"))
+    try:
+        with manager.batch():
+            manager.add_task(Task(title="Лишняя", description="", id="b"))
+            manager.update_task("a", title="Откатится")
+            manager.delete_task("a")
+            raise RuntimeError("прерываем пакет")
+    except RuntimeError:
+        pass
+    check(manager.get_task("b") is None, "добавление не откатилось")
+    check(manager.get_task("a") is not None, "удаление не откатилось")
+    check(len(manager.get_all_tasks()) == 1, "лишние задачи после отката")
+    return {"a": {"title": "Задача"}}
+
+
+def cached_after_rollback(manager: TaskManager) -> Dict[str, dict]:
+    manager.add_task(Task(title="Задача", description="", id="a", priority=Priority.LOW))
+    strategy = CachedPriorityStrategy(ImportancePriorityStrategy())
+    expected = ImportancePriorityStrategy().calculate_priority(manager.get_task("a"))
+    try:
+        with manager.batch():
+            manager.update_task("a", priority=Priority.HIGH)
+            manager.sort_tasks(strategy=strategy)
+            raise RuntimeError("прерываем пакет")
+    except RuntimeError:
+        pass
+    manager.update_task("a", title="Переименованная")
+    score = strategy.calculate_priorities(manager.get_all_tasks())[0]
+    check(score == expected, f"приоритет из кэша {score}, ожидался {expected}")
+    return {"a": {"title": "Переименованная", "priority": "low"}}
+
+
+def aware_deadline(manager: TaskManager) -> Dict[str, dict]:
+    soon = datetime.now() + timedelta(days=1)
+    manager.add_task(Task(title="Без пояса", description="", id="a", deadline=soon))
+    with manager.batch():
+        check(manager.add_task(Task(title="С поясом", description="", id="b",
+                                    deadline=datetime.now(timezone.utc) - timedelta(days=1))),
+              "задача с дедлайном в UTC не добавлена")
+        check(manager.update_task("a", deadline=soon.astimezone(timezone.utc)),
+              "дедлайн в UTC не принят при изменении")
+        check(manager.get_statistics()["overdue"] == 1, "просроченные не посчитаны")
+    return {"a": {"deadline": soon.isoformat()}, "b": {"title": "С поясом"}}
+
+
+SCENARIOS: List[Callable[[TaskManager], Dict[str, dict]]] = [
+    update_then_complete, duplicate_add, complete_added, rollback,
+    cached_after_rollback, aware_deadline,
+]
+
+
+def run_scenario(scenario, mode: str, directory: Path) -> None:
+    storage_class, file_name, options = MODES[mode]
+    history = HistoryStore(directory / "history.jsonl")
+    manager = TaskManager(storage_class(directory / file_name), history=history, **options)
+    expected = scenario(manager)
+
+    reloaded = TaskManager(storage_class(directory / file_name), history=history, **options)
+    tasks = {task.id: task.to_dict() for task in reloaded.get_all_tasks()}
+    check(set(tasks) == set(expected), f"в хранилище задачи {sorted(tasks)}")
+    for task_id, fields in expected.items():
+        for name, value in fields.items():
+            check(tasks[task_id][name] == value,
+                  f"{task_id}.{name} = {tasks[task_id][name]!r}, ожидалось {value!r}")
+    history.close()
+
+
+def main() -> int:
+    failures = 0
+    for scenario in SCENARIOS:
+        for mode in MODES:
+            with tempfile.TemporaryDirectory() as tmp:
+                try:
+                    run_scenario(scenario, mode, Path(tmp))
+                except AssertionError as e:
+                    failures += 1
+                    print(f"{scenario.__name__} [{mode}]: {e}", file=sys.stderr)
+    total = len(SCENARIOS) * len(MODES)
+    print(f"Сценариев: {total}, ошибок: {failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
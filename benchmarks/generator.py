@@ -0,0 +1,73 @@
+"""
+Детерминированный генератор синтетических задач для бенчмарков.
+
+Одинаковые count и seed всегда дают одинаковые задачи (включая id
+и метки времени), поэтому результаты разных запусков сравнимы.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import List
+from uuid import UUID
+
+from models.enums import Priority, TaskStatus
+from models.task import Task
+
+# Фиксированный «текущий» момент: не зависит от даты запуска
+BASE_TIME = datetime(2025, 1, 1, 12, 0)
+
+VERBS = [
+    "Подготовить", "Проверить", "Написать", "Обсудить", "Исправить",
+    "Согласовать", "Обновить", "Изучить", "Отправить", "Настроить",
+]
+OBJECTS = [
+    "отчёт по проекту", "презентацию для клиента", "документацию API",
+    "план спринта", "ошибку в модуле оплаты", "договор с подрядчиком",
+    "зависимости сервера", "курс по алгоритмам", "письмо руководителю",
+    "резервное копирование", "бюджет на квартал", "тесты производительности",
+]
+DETAILS = [
+    "до конца недели", "вместе с командой", "по замечаниям ревью",
+    "после созвона", "для нового релиза", "с учётом обратной связи",
+]
+TAGS = [
+    "работа", "учёба", "дом", "здоровье", "спорт", "финансы",
+    "программирование", "срочно", "встречи", "чтение",
+]
+
+PRIORITIES = list(Priority)
+STATUSES = list(TaskStatus)
+
+
+def generate_tasks(count: int, seed: int = 42) -> List[Task]:
+    """
+    Сгенерировать count задач.
+
+    Args:
+        count: Количество задач
+        seed: Начальное значение генератора случайных чисел
+
+    Returns:
+        List[Task]: Задачи со смешанными приоритетами, статусами,
+            тегами и дедлайнами (часть — просроченные, часть — без дедлайна)
+    """
+    rng = random.Random(seed)
+    tasks = []
+    for _ in range(count):
+        status = rng.choices(STATUSES, weights=(5, 3, 3, 1))[0]
+        created_at = BASE_TIME - timedelta(minutes=rng.randrange(60 * 24 * 90))
+        deadline = None
+        if rng.random() < 0.7:
+            deadline = BASE_TIME + timedelta(hours=rng.randrange(-24 * 14, 24 * 60))
+        tasks.append(Task(
+            title=f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}",
+            description=f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(DETAILS)}",
+            priority=rng.choice(PRIORITIES),
+            deadline=deadline,
+            status=status,
+            completed=status == TaskStatus.DONE,
+            id=str(UUID(int=rng.getrandbits(128), version=4)),
+            created_at=created_at,
+            updated_at=created_at,
+            tags=rng.sample(TAGS, rng.randrange(4)),
+        ))
+    return tasks
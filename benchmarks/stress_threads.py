@@ -0,0 +1,247 @@
+"""
+Нагрузочная проверка потокобезопасности TaskManager.
+
+Потоки-читатели параллельно вызывают выборки, поиск, сортировку,
+top_tasks и get_statistics, а потоки-писатели добавляют, меняют,
+завершают и удаляют задачи, в том числе пакетами. Читатели
+проверяют инварианты согласованного снимка:
+
+- в статистике total = completed + incomplete, а суммы по
+  приоритетам и статусам равны total;
+- задачи с тегом «пара» добавляются и удаляются только парами
+  в одном пакете, поэтому их число всегда чётное;
+- в списке всех задач нет повторов.
+
+Менеджер возвращает живые объекты задач, поэтому поля задачи
+после выхода из вызова могут измениться; инварианты проверяются
+только по тому, что вызов вернул.
+
+После остановки потоков число задач сверяется с операциями
+писателей, а индексы менеджера — с задачами, перечитанными
+из хранилища.
+
+С --fail-rate хранилище отказывает в части сохранений: изменение,
+которое не удалось сохранить, должно быть отменено и в памяти,
+поэтому сверка с хранилищем проверяет и откат.
+
+Запуск из корня проекта:
+    python -m benchmarks.stress_threads --readers 8 --writers 4 --seconds 5
+    python -m benchmarks.stress_threads --fail-rate 0.2
+"""
+import argparse
+import random
+import sys
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import List
+
+from benchmarks.generator import generate_tasks
+from models.enums import Priority, TaskStatus
+from models.task import Task
+from services.history import HistoryStore
+from services.task_manager import TaskManager
+from storage.journal_storage import JournalStorage
+from strategies.combined import CombinedPriorityStrategy
+from strategies.deadline import DeadlinePriorityStrategy
+
+PAIR_TAG = "пара"
+
+
+class FlakyJournalStorage(JournalStorage):
+    """JournalStorage, который отказывает в доле сохранений изменений"""
+
+    def __init__(self, file_path: Path, fail_rate: float, seed: int):
+        super().__init__(file_path)
+        self.fail_rate = fail_rate
+        self.random = random.Random(seed)
+        self.failures = 0
+
+    def save_changes(self, changes, tasks) -> bool:
+        # Вызывается под блокировкой записи менеджера, по одному
+        if self.random.random() < self.fail_rate:
+            self.failures += 1
+            return False
+        return super().save_changes(changes, tasks)
+
+
+class Worker(threading.Thread):
+    """Поток, повторяющий шаги до остановки и запоминающий первую ошибку"""
+
+    def __init__(self, step, stop: threading.Event, seed: int):
+        super().__init__(daemon=True)
+        self.step = step
+        self.stop = stop
+        self.random = random.Random(seed)
+        self.operations = 0
+        self.error = None
+
+    def run(self) -> None:
+        try:
+            while not self.stop.is_set():
+                self.step(self.random)
+                self.operations += 1
+        except BaseException as e:
+            self.error = e
+            self.stop.set()
+
+
+def check(condition: bool, message: str) -> None:
+    if not condition:
+        raise AssertionError(message)
+
+
+def make_reader(manager: TaskManager, tracked: CombinedPriorityStrategy):
+    deadline = DeadlinePriorityStrategy()
+
+    def step(rnd: random.Random) -> None:
+        choice = rnd.randrange(6)
+        if choice == 0:
+            stats = manager.get_statistics()
+            check(stats["completed"] + stats["incomplete"] == stats["total"],
+                  f"completed + incomplete != total: {stats}")
+            check(sum(stats["by_priority"].values()) == stats["total"],
+                  f"сумма по приоритетам != total: {stats}")
+            check(sum(stats["by_status"].values()) == stats["total"],
+                  f"сумма по статусам != total: {stats}")
+        elif choice == 1:
+            pairs = manager.get_tasks_by_tag(PAIR_TAG)
+            check(len(pairs) % 2 == 0, f"нечётное число парных задач: {len(pairs)}")
+        elif choice == 2:
+            ids = [task.id for task in manager.get_all_tasks()]
+            check(len(ids) == len(set(ids)), "повторяющиеся задачи в списке")
+        elif choice == 3:
+            manager.search_tasks(rnd.choice(["отчёт", "план", "ошибку", PAIR_TAG]))
+        elif choice == 4:
+            top = manager.top_tasks(10, tracked, filter=lambda t: not t.completed)
+            check(all(not task.completed for task in top), "завершённая задача в top")
+        else:
+            manager.sort_tasks(manager.get_incomplete_tasks(), strategy=deadline)
+
+    return step
+
+
+def make_writer(manager: TaskManager, counts: Counter, lock: threading.Lock):
+    def step(rnd: random.Random) -> None:
+        choice = rnd.randrange(5)
+        if choice == 0:
+            try:
+                with manager.batch():
+                    for _ in range(2):
+                        manager.add_task(Task(title="Парная задача", description="",
+                                              tags=[PAIR_TAG]))
+                delta = 2
+            except IOError:
+                delta = 0
+        elif choice == 1:
+            pairs = manager.get_tasks_by_tag(PAIR_TAG)[:2]
+            delta = -manager.delete_tasks(task.id for task in pairs)
+        elif choice == 2:
+            added = manager.add_task(Task(title="Новая задача", description="план",
+                                          priority=rnd.choice(list(Priority))))
+            delta = 1 if added else 0
+        else:
+            tasks = manager.get_incomplete_tasks()
+            if not tasks:
+                return
+            task = rnd.choice(tasks)
+            if choice == 3:
+                manager.update_task(task.id, priority=rnd.choice(list(Priority)),
+                                    status=rnd.choice(list(TaskStatus)))
+            else:
+                manager.complete_task(task.id)
+            delta = 0
+        with lock:
+            counts["delta"] += delta
+
+    return step
+
+
+def verify(manager: TaskManager, expected: int, storage_path: Path) -> List[str]:
+    """Сверить индексы менеджера и хранилище после остановки потоков"""
+    problems = []
+    tasks = manager.get_all_tasks()
+    if len(tasks) != expected:
+        problems.append(f"задач {len(tasks)}, ожидалось {expected}")
+    by_status = sum(len(manager.get_tasks_by_status(status)) for status in TaskStatus)
+    if by_status != len(tasks):
+        problems.append(f"в индексе статусов {by_status} задач из {len(tasks)}")
+    completed = {task.id for task in tasks if task.completed}
+    if {task.id for task in manager.get_completed_tasks()} != completed:
+        problems.append("индекс завершённых задач расходится с задачами")
+
+    # Откат несохранённого изменения увеличивает версию задачи только
+    # в памяти (версии не повторяются), поэтому версию не сравниваем
+    def fields(task: Task) -> dict:
+        data = task.to_dict()
+        del data["version"]
+        return data
+
+    reloaded = TaskManager(JournalStorage(storage_path), history=manager.history)
+    if [fields(task) for task in reloaded.get_all_tasks()] != [fields(task) for task in tasks]:
+        problems.append("хранилище расходится с задачами в памяти")
+    return problems
+
+
+def run(count: int, readers: int, writers: int, seconds: float, seed: int,
+        fail_rate: float = 0.0) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "stress.json"
+        JournalStorage(path).save(generate_tasks(count, seed))
+        storage = FlakyJournalStorage(path, fail_rate, seed)
+        manager = TaskManager(storage, history=HistoryStore(Path(tmp) / "history.jsonl"))
+        tracked = CombinedPriorityStrategy()
+        manager.track_strategy(tracked)
+        initial = len(manager.get_all_tasks())
+
+        stop = threading.Event()
+        counts: Counter = Counter()
+        counts_lock = threading.Lock()
+        reader_threads = [Worker(make_reader(manager, tracked), stop, seed + i)
+                          for i in range(readers)]
+        writer_threads = [Worker(make_writer(manager, counts, counts_lock), stop, seed + readers + i)
+                          for i in range(writers)]
+        threads = reader_threads + writer_threads
+        for thread in threads:
+            thread.start()
+        stop.wait(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        errors = [thread.error for thread in threads if thread.error is not None]
+        for error in errors:
+            print(f"Ошибка в потоке: {error!r}", file=sys.stderr)
+        problems = verify(manager, initial + counts["delta"], path)
+        for problem in problems:
+            print(f"Нарушен инвариант: {problem}", file=sys.stderr)
+        manager.history.close()
+
+    reads = sum(thread.operations for thread in reader_threads)
+    writes = sum(thread.operations for thread in writer_threads)
+    print(f"Читатели: {readers}, операций {reads} ({reads / seconds:.0f}/с)")
+    print(f"Писатели: {writers}, операций {writes} ({writes / seconds:.0f}/с)")
+    print(f"Задач в конце: {initial + counts['delta']}")
+    if fail_rate:
+        print(f"Отказов хранилища: {storage.failures}")
+    return 1 if errors or problems else 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Нагрузочная проверка TaskManager из потоков")
+    parser.add_argument("--tasks", type=int, default=2_000,
+                        help="Число задач в начале (по умолчанию 2000)")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="Доля сохранений, в которых хранилище отказывает")
+    args = parser.parse_args(argv)
+    return run(args.tasks, args.readers, args.writers, args.seconds, args.seed,
+               args.fail_rate)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+Бенчмарки основных операций TaskManager и хранилищ.
+
+Замеряет add_task, update_task, complete_task, delete_task,
+search_tasks, sort_tasks с каждой стратегией, get_statistics,
+JSONStorage.save/load, BinaryStorage.save/load и CSVStorage.export на синтетических задачах
+разного объёма. Результат — JSON, который можно сравнить
+с предыдущим запуском.
+
+Запуск из корня проекта:
+    python -m benchmarks.suite --sizes 10000 100000 --output bench.json
+    python -m benchmarks.suite --compare bench.json
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks.generator import OBJECTS, TAGS, generate_tasks
+from services.history import HistoryStore
+from services.task_manager import TaskManager
+from storage.base import LazyStorage
+from storage.binary_storage import BinaryStorage
+from storage.csv_storage import CSVStorage
+from storage.journal_storage import JournalStorage
+from storage.json_storage import JSONStorage
+from storage.sqlite_storage import SQLiteStorage
+from strategies.combined import CombinedPriorityStrategy
+from strategies.deadline import DeadlinePriorityStrategy
+from strategies.importance import ImportancePriorityStrategy
+
+DEFAULT_SIZES = [10_000, 100_000]
+# Хранилища для замеров мутаций через TaskManager
+STORAGES = {
+    "json": (JSONStorage, "manager.json"),
+    "journal": (JournalStorage, "manager.json"),
+    "sqlite": (SQLiteStorage, "manager.db"),
+    "binary": (BinaryStorage, "manager.bin"),
+}
+STRATEGIES = {
+    "deadline": DeadlinePriorityStrategy,
+    "importance": ImportancePriorityStrategy,
+    "combined": CombinedPriorityStrategy,
+}
+SEARCH_QUERIES = ["отчёт", "презентацию клиента", "ошибку", "план", "резерв"]
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Время выполнения func в секундах по repeat запускам"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def measure_each(func: Callable[[object], object], items: List) -> Dict[str, float]:
+    """Время одного вызова func для каждого элемента items"""
+    timings = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    return {
+        "runs": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "max": max(timings),
+    }
+
+
+def bench_storage(tasks, directory: Path, repeat: int) -> Dict[str, dict]:
+    results = {}
+    json_storage = JSONStorage(directory / "bench.json")
+    results["json_save"] = measure(lambda: json_storage.save(tasks), repeat)
+    results["json_load"] = measure(json_storage.load, repeat)
+
+    binary_storage = BinaryStorage(directory / "bench.bin")
+    results["binary_save"] = measure(lambda: binary_storage.save(tasks), repeat)
+    results["binary_load"] = measure(binary_storage.load, repeat)
+
+    csv_storage = CSVStorage(directory / "bench.csv")
+    results["csv_export"] = measure(
+        lambda: csv_storage.export(tasks, csv_storage.file_path), repeat
+    )
+    return results
+
+
+def bench_manager(tasks, directory: Path, storage_name: str, ops: int,
+                  repeat: int, seed: int) -> Dict[str, dict]:
+    results = {}
+    storage_class, file_name = STORAGES[storage_name]
+    storage = storage_class(directory / file_name)
+    storage.save(tasks)
+    if isinstance(storage, SQLiteStorage):
+        storage.close()
+        storage = SQLiteStorage(storage.file_path)
+
+    history = HistoryStore(directory / "history.jsonl")
+    start = time.perf_counter()
+    manager = TaskManager(storage, history=history)
+    results["manager_load"] = summarize([time.perf_counter() - start])
+    if len(manager.tasks) != len(tasks):
+        raise RuntimeError("Задачи не загрузились из хранилища")
+
+    if isinstance(storage, LazyStorage):
+        start = time.perf_counter()
+        lazy = TaskManager(storage_class(storage.file_path), history=history, lazy=True)
+        results["lazy_load"] = summarize([time.perf_counter() - start])
+        results["lazy_get_task"] = measure_each(
+            lazy.get_task, [task.id for task in tasks[:ops]]
+        )
+        # Первая выборка строит индексы по ключевым полям
+        start = time.perf_counter()
+        lazy.get_statistics()
+        results["lazy_first_query"] = summarize([time.perf_counter() - start])
+
+    rng = random.Random(seed)
+    new_tasks = generate_tasks(ops, seed=seed + 1)
+    ids = [task.id for task in rng.sample(tasks, min(ops, len(tasks)))]
+
+    results["add_task"] = measure_each(manager.add_task, new_tasks)
+    results["update_task"] = measure_each(
+        lambda task_id: manager.update_task(
+            task_id, description=rng.choice(OBJECTS), tags=[rng.choice(TAGS)]
+        ),
+        ids,
+    )
+    results["complete_task"] = measure_each(manager.complete_task, ids)
+    results["delete_task"] = measure_each(
+        manager.delete_task, [task.id for task in new_tasks]
+    )
+
+    results["search_tasks"] = measure(
+        lambda: [manager.search_tasks(query) for query in SEARCH_QUERIES], repeat
+    )
+    for name, strategy_class in STRATEGIES.items():
+        strategy = strategy_class()
+        results[f"sort_tasks[{name}]"] = measure(
+            lambda: manager.sort_tasks(strategy=strategy), repeat
+        )
+    results["get_statistics"] = measure(manager.get_statistics, repeat)
+
+    manager.history.close()
+    if isinstance(storage, SQLiteStorage):
+        storage.close()
+    return results
+
+
+def run(sizes: List[int], storage_name: str, ops: int, repeat: int,
+        seed: int) -> dict:
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "storage": storage_name,
+            "ops": ops,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": {},
+    }
+    for size in sizes:
+        print(f"Задач: {size}...", file=sys.stderr)
+        tasks = generate_tasks(size, seed=seed)
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            results = bench_storage(tasks, directory, repeat)
+            results.update(bench_manager(tasks, directory, storage_name, ops, repeat, seed))
+        report["results"][str(size)] = results
+    return report
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    Операции, ставшие медленнее базового запуска.
+
+    Сравниваются медианы; регрессией считается рост больше чем
+    в threshold раз.
+    """
+    regressions = []
+    for size, results in report["results"].items():
+        for name, timing in results.items():
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if not base or not base["median"]:
+                continue
+            ratio = timing["median"] / base["median"]
+            if ratio > threshold:
+                regressions.append(f"{size} {name}: x{ratio:.2f}")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки TaskManager")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Объёмы данных (по умолчанию 10000 100000)")
+    parser.add_argument("--storage", choices=sorted(STORAGES), default="journal",
+                        help="Хранилище для замеров мутаций")
+    parser.add_argument("--ops", type=int, default=200,
+                        help="Число вызовов для каждой мутации")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Число повторов для остальных операций")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Файл для JSON-отчёта")
+    parser.add_argument("--compare", type=Path, help="JSON-отчёт базового запуска")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Допустимый рост медианы относительно базы")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.storage, args.ops, args.repeat, args.seed)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"Регрессия: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Сравнение памяти на задачу: Task против CompactTask.
+
+Запуск из корня проекта:
+    python -m benchmarks.task_memory [количество задач]
+"""
+import gc
+import json
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+from models.compact_task import CompactTask
+from models.enums import Priority, TaskStatus
+from models.task import Task
+
+TAGS = ["работа", "учёба", "быт", "здоровье", "спорт", "программирование"]
+
+
+def make_tasks(count: int) -> list[Task]:
+    now = datetime(2025, 1, 1, 12, 0)
+    priorities = list(Priority)
+    statuses = list(TaskStatus)
+    return [
+        Task(
+            title=f"Задача номер {i}",
+            description=f"Описание задачи {i}",
+            priority=priorities[i % 3],
+            status=statuses[i % 4],
+            deadline=now + timedelta(days=i % 30) if i % 3 else None,
+            created_at=now - timedelta(minutes=i),
+            updated_at=now,
+            tags=[TAGS[i % 6], TAGS[(i + 1) % 6]],
+        )
+        for i in range(count)
+    ]
+
+
+def measure(build) -> int:
+    """Сколько байт удерживает результат build()"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return used
+
+
+def main(count: int = 100_000) -> None:
+    # Задачи строятся из JSON, как при загрузке, чтобы все строки были свои
+    text = json.dumps([task.to_dict() for task in make_tasks(count)], ensure_ascii=False)
+
+    task_bytes = measure(lambda: [Task.from_dict(item) for item in json.loads(text)])
+    compact_bytes = measure(lambda: [CompactTask.from_dict(item) for item in json.loads(text)])
+
+    print(f"Задач: {count}")
+    print(f"Task:        {task_bytes / count:8.1f} байт на задачу")
+    print(f"CompactTask: {compact_bytes / count:8.1f} байт на задачу")
+    print(f"Экономия:    {(1 - compact_bytes / task_bytes) * 100:8.1f}%")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
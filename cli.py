@@ -0,0 +1,364 @@
+"""
+Неинтерактивный интерфейс командной строки.
+
+Примеры:
+    python cli.py add "Купить продукты" -p high --deadline +1 --tag быт
+    python cli.py list --top 5 --strategy combined --incomplete
+    python cli.py complete 3f2c...
+    python cli.py search презентация
+    python cli.py stats --json
+    python cli.py export csv data/tasks_export.csv
+    cat tasks.jsonl | python cli.py ingest
+
+Модули хранилищ, стратегий и наблюдателей импортируются только
+для выбранной команды, а бинарное хранилище открывается в режиме
+lazy, поэтому команде над одной задачей не нужно загружать остальные.
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+from importlib import import_module
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+DEFAULT_FILE = Path("data/tasks.json")
+
+# Хранилище: (модуль, класс, режим TaskManager)
+BACKENDS = {
+    "json": ("storage.json_storage", "JSONStorage", None),
+    "locking": ("storage.locking_storage", "LockingJSONStorage", None),
+    "journal": ("storage.journal_storage", "JournalStorage", None),
+    "binary": ("storage.binary_storage", "BinaryStorage", "lazy"),
+    "sqlite": ("storage.sqlite_storage", "SQLiteStorage", "pushdown"),
+}
+# Хранилище по расширению файла, если --backend не указан
+SUFFIXES = {
+    ".json": "json",
+    ".bin": "binary",
+    ".db": "sqlite",
+    ".sqlite": "sqlite",
+    ".sqlite3": "sqlite",
+}
+
+STRATEGIES = {
+    "deadline": ("strategies.deadline", "DeadlinePriorityStrategy"),
+    "importance": ("strategies.importance", "ImportancePriorityStrategy"),
+    "combined": ("strategies.combined", "CombinedPriorityStrategy"),
+}
+
+PRIORITIES = ("low", "medium", "high")
+STATUSES = ("todo", "in_progress", "done", "cancelled")
+
+
+def load_class(module: str, name: str):
+    """Импортировать класс только тогда, когда он понадобился"""
+    return getattr(import_module(module), name)
+
+
+def parse_deadline(value: str) -> datetime:
+    """Дедлайн в формате ISO (2025-06-01, 2025-06-01T18:00) или +N дней"""
+    try:
+        if value.startswith("+"):
+            return datetime.now() + timedelta(days=int(value[1:]))
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"неверный дедлайн {value!r}: ожидается дата ISO или +N дней"
+        )
+
+
+def positive_int(value: str) -> int:
+    """Целое число не меньше 1 (например, N для --top)"""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f"неверное число {value!r}: ожидается целое не меньше 1"
+        )
+    return number
+
+
+def open_manager(args: argparse.Namespace, pushdown: bool = True):
+    """
+    Создать TaskManager для выбранного хранилища.
+
+    Args:
+        args: Разобранные аргументы с file, backend и log
+        pushdown: Разрешить режим pushdown; без него SQLite
+            загружается в память, как остальные хранилища
+    """
+    from services.task_manager import TaskManager
+
+    backend = args.backend or SUFFIXES.get(args.file.suffix, "json")
+    module, name, mode = BACKENDS[backend]
+    if mode == "pushdown" and not pushdown:
+        mode = None
+    storage = load_class(module, name)(args.file)
+    manager = TaskManager(
+        storage,
+        lazy=mode == "lazy",
+        pushdown=mode == "pushdown",
+    )
+    if args.log is not None:
+        observer_class = load_class("observers.logger", "LoggerObserver")
+        manager.add_observer(observer_class(args.log, console=False))
+    return manager
+
+
+def close_manager(manager) -> None:
+    manager.flush()
+    manager.history.close()
+    close = getattr(manager.storage, "close", None)
+    if close is not None:
+        close()
+
+
+def print_tasks(tasks, as_json: bool) -> None:
+    if as_json:
+        import json
+        for task in tasks:
+            print(json.dumps(task.to_dict(), ensure_ascii=False))
+        return
+    for task in tasks:
+        print(f"{task.id}  {task}")
+
+
+def read_json_lines(stream, errors: List[tuple]) -> Iterator:
+    """
+    Задачи из JSON lines: по объекту Task.to_dict на строку.
+
+    Обязательно только поле title. Некорректные строки пропускаются,
+    а (номер строки, причина) добавляются в errors.
+    """
+    import json
+    from models.task import Task
+
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+            if not isinstance(data, dict):
+                raise ValueError("ожидается JSON-объект")
+            data.setdefault("description", "")
+            yield Task.from_dict(data)
+        except (ValueError, TypeError, KeyError) as e:
+            errors.append((line_number, str(e)))
+
+
+def cmd_add(manager, args) -> int:
+    from models.enums import Priority
+    from models.task import Task
+
+    task = Task(
+        title=args.title,
+        description=args.description,
+        priority=Priority(args.priority),
+        deadline=args.deadline,
+        tags=args.tag,
+    )
+    if not manager.add_task(task):
+        print("Не удалось добавить задачу", file=sys.stderr)
+        return 1
+    if args.json:
+        print_tasks([task], True)
+    else:
+        print(task.id)
+    return 0
+
+
+def cmd_ingest(manager, args) -> int:
+    errors: List[tuple] = []
+    stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        count = manager.add_tasks(read_json_lines(stream, errors))
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    for line_number, message in errors:
+        print(f"строка {line_number}: {message}", file=sys.stderr)
+    print(count)
+    return 1 if errors else 0
+
+
+def cmd_complete(manager, args) -> int:
+    missing = []
+    try:
+        with manager.batch():
+            for task_id in args.ids:
+                if not manager.complete_task(task_id):
+                    missing.append(task_id)
+    except IOError as e:
+        print(e, file=sys.stderr)
+        return 1
+    for task_id in missing:
+        print(f"Задача не найдена: {task_id}", file=sys.stderr)
+    return 1 if missing else 0
+
+
+def cmd_list(manager, args) -> int:
+    from models.enums import Priority, TaskStatus
+
+    strategy = None
+    if args.strategy:
+        strategy = load_class(*STRATEGIES[args.strategy])()
+
+    # Первый фильтр берём из индекса, остальные проверяем по задаче
+    tasks = None
+    checks: List[Callable] = []
+    if args.tag is not None:
+        tasks = manager.get_tasks_by_tag(args.tag)
+    if args.status is not None:
+        status = TaskStatus[args.status.upper()]
+        if tasks is None:
+            tasks = manager.get_tasks_by_status(status)
+        else:
+            checks.append(lambda task: task.status == status)
+    if args.priority is not None:
+        priority = Priority(args.priority)
+        if tasks is None:
+            tasks = manager.get_tasks_by_priority(priority)
+        else:
+            checks.append(lambda task: task.priority == priority)
+    if args.overdue:
+        if tasks is None:
+            tasks = manager.get_overdue_tasks()
+        else:
+            checks.append(lambda task: task.is_overdue())
+    if args.incomplete:
+        if tasks is None:
+            tasks = manager.get_incomplete_tasks()
+        else:
+            checks.append(lambda task: not task.completed)
+
+    check: Optional[Callable] = None
+    if checks:
+        check = lambda task: all(condition(task) for condition in checks)
+
+    if tasks is None and args.top is not None:
+        # Без выборки по индексу — выбор k лучших без полной сортировки
+        result = manager.top_tasks(args.top, strategy, filter=check)
+    else:
+        if tasks is None:
+            tasks = manager.get_all_tasks()
+        if check is not None:
+            tasks = [task for task in tasks if check(task)]
+        result = manager.sort_tasks(tasks, strategy=strategy)
+        if args.top is not None:
+            result = result[:args.top]
+    print_tasks(result, args.json)
+    return 0
+
+
+def cmd_search(manager, args) -> int:
+    print_tasks(manager.search_tasks(" ".join(args.query)), args.json)
+    return 0
+
+
+def cmd_stats(manager, args) -> int:
+    stats = manager.get_statistics()
+    if args.json:
+        import json
+        print(json.dumps(stats, ensure_ascii=False))
+        return 0
+    print(f"Всего: {stats['total']}")
+    print(f"Завершено: {stats['completed']}")
+    print(f"Не завершено: {stats['incomplete']}")
+    print(f"Просрочено: {stats['overdue']}")
+    print(f"Процент выполнения: {stats['completion_rate']}%")
+    print("По приоритетам: " + ", ".join(
+        f"{name} {count}" for name, count in stats["by_priority"].items()
+    ))
+    print("По статусам: " + ", ".join(
+        f"{name} {count}" for name, count in stats["by_status"].items()
+    ))
+    return 0
+
+
+def cmd_export(manager, args) -> int:
+    if not manager.export_tasks(args.format, args.path):
+        print(f"Не удалось экспортировать в {args.path}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="task-manager",
+        description="Управление задачами из командной строки",
+    )
+    parser.add_argument("--file", type=Path, default=DEFAULT_FILE,
+                        help=f"файл хранилища (по умолчанию {DEFAULT_FILE})")
+    parser.add_argument("--backend", choices=sorted(BACKENDS),
+                        help="тип хранилища (по умолчанию по расширению файла)")
+    parser.add_argument("--log", type=Path,
+                        help="писать события в лог-файл")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Общий для команд флаг формата вывода
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--json", action="store_true",
+                        help="вывод в JSON (задачи — по объекту на строку)")
+
+    add = commands.add_parser("add", parents=[output], help="добавить задачу")
+    add.add_argument("title")
+    add.add_argument("-d", "--description", default="")
+    add.add_argument("-p", "--priority", choices=PRIORITIES, default="medium")
+    add.add_argument("--deadline", type=parse_deadline,
+                     help="дата ISO или +N дней")
+    add.add_argument("-t", "--tag", action="append", default=[],
+                     help="тег (можно повторять)")
+    add.set_defaults(handler=cmd_add)
+
+    ingest = commands.add_parser(
+        "ingest", help="добавить задачи из JSON lines одним пакетом"
+    )
+    ingest.add_argument("input", nargs="?", default="-",
+                        help="файл JSON lines (по умолчанию stdin)")
+    ingest.set_defaults(handler=cmd_ingest)
+
+    complete = commands.add_parser("complete", help="отметить задачи выполненными")
+    complete.add_argument("ids", nargs="+", metavar="id")
+    complete.set_defaults(handler=cmd_complete)
+
+    list_ = commands.add_parser("list", parents=[output], help="показать задачи")
+    list_.add_argument("--top", type=positive_int, metavar="N",
+                       help="только N первых задач")
+    list_.add_argument("--strategy", choices=sorted(STRATEGIES),
+                       help="сортировать по приоритету стратегии")
+    list_.add_argument("--status", choices=STATUSES)
+    list_.add_argument("--priority", choices=PRIORITIES)
+    list_.add_argument("--tag")
+    list_.add_argument("--incomplete", action="store_true",
+                       help="только незавершённые")
+    list_.add_argument("--overdue", action="store_true",
+                       help="только просроченные")
+    list_.set_defaults(handler=cmd_list)
+
+    search = commands.add_parser("search", parents=[output], help="поиск по названию, описанию и тегам")
+    search.add_argument("query", nargs="+")
+    search.set_defaults(handler=cmd_search)
+
+    stats = commands.add_parser("stats", parents=[output], help="статистика задач")
+    stats.set_defaults(handler=cmd_stats)
+
+    export = commands.add_parser("export", help="экспорт задач в файл")
+    export.add_argument("format", choices=("json", "csv"))
+    export.add_argument("path", type=Path)
+    export.set_defaults(handler=cmd_export)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    manager = open_manager(args)
+    try:
+        return args.handler(manager, args)
+    finally:
+        close_manager(manager)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
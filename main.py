@@ -1,15 +1,10 @@
+import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 
-from models.task import Task
-from models.enums import Priority, TaskStatus
-from services.task_manager import TaskManager
-from storage.json_storage import JSONStorage
-from observers.logger import LoggerObserver
-from observers.notifier import NotificationObserver
-from strategies.deadline import DeadlinePriorityStrategy
-from strategies.importance import ImportancePriorityStrategy
-from strategies.combined import CombinedPriorityStrategy
+# Модули менеджера, хранилищ, наблюдателей и стратегий импортируются
+# внутри режимов: запуск с аргументами командной строки (cli.py)
+# не должен платить за то, что ему не нужно
 
 
 def print_task_list(tasks: list, title: str = "Tasks"):
@@ -56,6 +51,14 @@ def print_statistics(stats: dict):
 
 def demo_basic_operations():
     """Демонстрация базовых операций"""
+    from models.task import Task
+    from models.enums import Priority, TaskStatus
+    from services.task_manager import TaskManager
+    from storage.json_storage import JSONStorage
+    from observers.logger import LoggerObserver
+    from observers.notifier import NotificationObserver
+    from strategies.deadline import DeadlinePriorityStrategy
+
     print("\n🚀 Демонстрация Task Manager\n")
     
     # Создаём менеджер
@@ -154,7 +157,7 @@ def demo_basic_operations():
     # Экспорт
     print("\n--- Экспорт ---")
     csv_path = Path("data/tasks_export.csv")
-    manager.export_tasks(csv_path, format='csv')
+    manager.export_tasks('csv', csv_path)
     print(f"✅ Задачи экспортированы в {csv_path}")
     
     # История
@@ -169,6 +172,13 @@ def demo_basic_operations():
 
 def demo_strategies():
     """Демонстрация разных стратегий сортировки"""
+    from services.task_manager import TaskManager
+    from storage.json_storage import JSONStorage
+    from strategies.deadline import DeadlinePriorityStrategy
+    from strategies.importance import ImportancePriorityStrategy
+    from strategies.combined import CombinedPriorityStrategy
+    from strategies.cached import CachedPriorityStrategy
+
     print("\n\n🎯 Демонстрация стратегий приоритизации\n")
     
     # Создаём менеджер с задачами
@@ -176,18 +186,31 @@ def demo_strategies():
     manager = TaskManager(storage)
     
     strategies = [
-        DeadlinePriorityStrategy(),
-        ImportancePriorityStrategy(),
-        CombinedPriorityStrategy()
+        CachedPriorityStrategy(DeadlinePriorityStrategy()),
+        CachedPriorityStrategy(ImportancePriorityStrategy()),
+        CachedPriorityStrategy(CombinedPriorityStrategy())
     ]
     
     for strategy in strategies:
         sorted_tasks = manager.sort_tasks(strategy=strategy)
         print_task_list(sorted_tasks, f"Стратегия: {strategy.get_name()}")
 
+    # Повторная сортировка берёт приоритеты из кэша
+    for strategy in strategies:
+        manager.sort_tasks(strategy=strategy)
+        stats = strategy.get_stats()
+        print(f"Кэш {strategy.get_name()}: попаданий {stats['hits']}, "
+              f"промахов {stats['misses']} ({stats['hit_rate']}%)")
+
 
 def interactive_mode():
     """Интерактивный режим"""
+    from models.task import Task
+    from models.enums import Priority
+    from services.task_manager import TaskManager
+    from storage.json_storage import JSONStorage
+    from observers.logger import LoggerObserver
+
     storage = JSONStorage(Path("data/tasks.json"))
     manager = TaskManager(storage)
     
@@ -339,4 +362,8 @@ def main():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # С аргументами — неинтерактивные команды (см. cli.py)
+        from cli import main as cli_main
+        sys.exit(cli_main())
     main()
@@ -0,0 +1,202 @@
+import struct
+import sys
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from uuid import UUID, uuid4
+
+from models.enums import Priority, TaskStatus
+from models.task import MAX_LENGTH, Task, local_time
+
+PRIORITIES = tuple(Priority)
+STATUSES = tuple(TaskStatus)
+PRIORITY_CODES = {priority: code for code, priority in enumerate(PRIORITIES)}
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+# Три метки времени (дедлайн, создание, изменение) в микросекундах
+TIMES = struct.Struct("<qqq")
+NO_DEADLINE = -(2 ** 63)
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def pack_time(moment: datetime) -> int:
+    """Момент времени в микросекундах от 1970-01-01 (местное время)"""
+    return (local_time(moment) - EPOCH) // MICROSECOND
+
+
+def unpack_time(micros: int) -> datetime:
+    """Обратное преобразование для pack_time"""
+    return EPOCH + timedelta(0, 0, micros)
+
+
+class CompactTask:
+    """
+    Компактное представление задачи для больших объёмов в памяти.
+
+    В отличие от Task (датакласс с __dict__):
+    - атрибуты хранятся в __slots__;
+    - id в формате UUID хранится как 16 байт вместо строки из 36 символов;
+    - приоритет, статус и признак выполнения упакованы в одно число;
+    - три метки времени упакованы в одну строку байт;
+    - теги — кортеж интернированных строк, общих для всех задач.
+
+    to_dict, from_dict и __str__ совместимы с Task.
+    """
+
+    __slots__ = ("title", "description", "version", "_id", "_flags", "_times", "_tags")
+
+    def __init__(self, title: str, description: str,
+                 priority: Priority = Priority.MEDIUM,
+                 deadline: Optional[datetime] = None,
+                 status: TaskStatus = TaskStatus.TODO,
+                 completed: bool = False,
+                 id: Optional[str] = None,
+                 created_at: Optional[datetime] = None,
+                 updated_at: Optional[datetime] = None,
+                 tags: Iterable[str] = (),
+                 version: int = 0):
+        if not title.strip():
+            raise ValueError("Title cannot be empty")
+
+        if len(title) > MAX_LENGTH:
+            raise ValueError("Title is too long (max 200 characters)")
+
+        now = datetime.now()
+        self.title = title
+        self.description = description
+        self.version = version
+        self.id = id or str(uuid4())
+        self._flags = self._pack_flags(Priority(priority), TaskStatus(status), completed)
+        self._times = TIMES.pack(
+            pack_time(deadline) if deadline else NO_DEADLINE,
+            pack_time(created_at or now),
+            pack_time(updated_at or now),
+        )
+        self.tags = tags
+
+    @property
+    def id(self) -> str:
+        value = self._id
+        return str(UUID(bytes=value)) if isinstance(value, bytes) else value
+
+    @id.setter
+    def id(self, value: str):
+        try:
+            packed = UUID(value).bytes
+        except ValueError:
+            # Не UUID — храним строку как есть
+            self._id = value
+            return
+        # Упаковываем только каноническую запись, чтобы id читался обратно без изменений
+        self._id = packed if str(UUID(bytes=packed)) == value else value
+
+    @property
+    def priority(self) -> Priority:
+        return PRIORITIES[self._flags & 0b11]
+
+    @property
+    def status(self) -> TaskStatus:
+        return STATUSES[(self._flags >> 2) & 0b111]
+
+    @property
+    def completed(self) -> bool:
+        return bool(self._flags >> 5)
+
+    @property
+    def deadline(self) -> Optional[datetime]:
+        micros = TIMES.unpack(self._times)[0]
+        return None if micros == NO_DEADLINE else unpack_time(micros)
+
+    @property
+    def created_at(self) -> datetime:
+        return unpack_time(TIMES.unpack(self._times)[1])
+
+    @property
+    def updated_at(self) -> datetime:
+        return unpack_time(TIMES.unpack(self._times)[2])
+
+    @property
+    def tags(self) -> list[str]:
+        return list(self._tags)
+
+    @tags.setter
+    def tags(self, value: Iterable[str]):
+        self._tags = tuple(sys.intern(tag) for tag in value) if value else ()
+
+    # Отображение и проверки полностью совпадают с Task
+    is_overdue = Task.is_overdue
+    days_until_deadline = Task.days_until_deadline
+    __str__ = Task.__str__
+
+    def __repr__(self) -> str:
+        return f"CompactTask(id={self.id!r}, title={self.title!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (CompactTask, Task)):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def to_dict(self) -> dict:
+        deadline, created_at, updated_at = TIMES.unpack(self._times)
+        return {
+            "title": self.title,
+            "description": self.description,
+            "priority": self.priority.value,
+            "deadline": None if deadline == NO_DEADLINE
+                        else unpack_time(deadline).isoformat(),
+            "status": self.status.value,
+            "completed": self.completed,
+            "id": self.id,
+            "created_at": unpack_time(created_at).isoformat(),
+            "updated_at": unpack_time(updated_at).isoformat(),
+            "tags": list(self._tags),
+            "version": self.version,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CompactTask':
+        """Создание задачи из словаря (формат Task.to_dict)"""
+        data = dict(data)
+        for name in ("created_at", "updated_at", "deadline"):
+            if data.get(name):
+                data[name] = datetime.fromisoformat(data[name])
+        return cls(**data)
+
+    @classmethod
+    def from_task(cls, task: Task) -> 'CompactTask':
+        """Упаковать обычную задачу"""
+        return cls(
+            title=task.title,
+            description=task.description,
+            priority=task.priority,
+            deadline=task.deadline,
+            status=task.status,
+            completed=task.completed,
+            id=task.id,
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+            tags=task.tags,
+            version=task.version,
+        )
+
+    def to_task(self) -> Task:
+        """Распаковать в обычную задачу"""
+        return Task(
+            title=self.title,
+            description=self.description,
+            priority=self.priority,
+            deadline=self.deadline,
+            status=self.status,
+            completed=self.completed,
+            id=self.id,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            tags=self.tags,
+            version=self.version,
+        )
+
+    @staticmethod
+    def _pack_flags(priority: Priority, status: TaskStatus, completed: bool) -> int:
+        return (PRIORITY_CODES[priority]
+                | STATUS_CODES[status] << 2
+                | int(bool(completed)) << 5)
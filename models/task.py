@@ -1,6 +1,6 @@
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
 from uuid import uuid4
 
 from models.enums import Priority, TaskStatus
@@ -8,6 +8,19 @@ from models.enums import Priority, TaskStatus
 MAX_LENGTH = 200
 
 
+def local_time(moment: Optional[datetime]) -> Optional[datetime]:
+    """
+    Момент времени без часового пояса, в местном времени.
+
+    Все даты задач хранятся «наивными», как datetime.now(): такие
+    значения нельзя сравнивать с datetime, у которых указан пояс,
+    поэтому пояс переводится в местный и отбрасывается.
+    """
+    if moment is not None and moment.tzinfo is not None:
+        return moment.astimezone().replace(tzinfo=None)
+    return moment
+
+
 @dataclass
 class Task:
     title: str
@@ -20,6 +33,8 @@ class Task:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     tags: list[str] = field(default_factory=list)
+    # Растёт при каждом изменении через update/mark_*
+    version: int = 0
 
     def __post_init__(self):
         if not self.title.strip():
@@ -28,21 +43,47 @@ class Task:
         if len(self.title) > MAX_LENGTH:
             raise ValueError("Title is too long (max 200 characters)")
 
-        if isinstance(self.priority, str):
+        # Priority и TaskStatus сами наследуют str: конвертируем только
+        # настоящие строки, а не уже готовые значения перечислений
+        if not isinstance(self.priority, Priority):
             self.priority = Priority(self.priority)
 
-        if isinstance(self.status, str):
+        if not isinstance(self.status, TaskStatus):
             self.status = TaskStatus(self.status)
 
+        self.deadline = local_time(self.deadline)
+        self.created_at = local_time(self.created_at)
+        self.updated_at = local_time(self.updated_at)
+
+        # Подписчики на изменения задачи (не поле датакласса,
+        # поэтому не попадает в to_dict и сравнение)
+        self._listeners: list[Callable[['Task'], None]] = []
+
+    def add_listener(self, listener: Callable[['Task'], None]):
+        """Подписаться на изменения задачи через update/mark_*"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[['Task'], None]):
+        """Отписаться от изменений задачи"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _changed(self):
+        self.updated_at = datetime.now()
+        self.version += 1
+        for listener in self._listeners:
+            listener(self)
+
     def mark_completed(self):
-        self.complited = True
+        self.completed = True
         self.status = TaskStatus.DONE
-        self.updated_at = datetime.now()
+        self._changed()
 
     def mark_uncompleted(self):
-        self.complited = True
+        self.completed = False
         self.status = TaskStatus.TODO
-        self.updated_at = datetime.now()
+        self._changed()
 
     def update(self, **kwargs):
         allowed_fields = {
@@ -54,10 +95,18 @@ class Task:
             if field_name in allowed_fields:
                 setattr(self, field_name, value)
 
-        self.updated_at = datetime.now()
+        if isinstance(self.priority, str):
+            self.priority = Priority(self.priority)
+
+        if isinstance(self.status, str):
+            self.status = TaskStatus(self.status)
+
+        self.deadline = local_time(self.deadline)
+
+        self._changed()
 
     def is_overdue(self) -> bool:
-        if self.deadline and not self.complited:
+        if self.deadline and not self.completed:
             return datetime.now() > self.deadline
         return False
 
@@ -68,22 +117,56 @@ class Task:
         return False
 
     def to_dict(self) -> dict:
-        data = asdict(self)
-
-        data['created_at'] = self.created_at.isoformat()
-        data['updated_at'] = self.updated_at.isoformat()
-
-        if self.deadline:
-            data['deadline'] = self.deadline.isoformat
-
-        data['priority'] = self.priority.value
-        data['status'] = self.status.value
+        # Поля перечислены явно: asdict копирует значения через deepcopy
+        # и заметно замедляет сохранение и импорт больших списков
+        return {
+            'title': self.title,
+            'description': self.description,
+            'priority': self.priority.value,
+            'deadline': self.deadline.isoformat() if self.deadline else None,
+            'status': self.status.value,
+            'completed': self.completed,
+            'id': self.id,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat(),
+            'tags': list(self.tags),
+            'version': self.version,
+        }
 
-        return data
+    @classmethod
+    def _restore(cls, title: str, description: str, priority: Priority,
+                 deadline: Optional[datetime], status: TaskStatus,
+                 completed: bool, id: str, created_at: datetime,
+                 updated_at: datetime, tags: list[str], version: int) -> 'Task':
+        """
+        Быстро восстановить задачу из уже проверенных значений.
+
+        Минует __init__ и __post_init__ (проверку заголовка и приведение
+        типов), поэтому годится только для хранилищ, которые сами
+        записали эти значения из Task.
+        """
+        task = cls.__new__(cls)
+        task.__dict__ = {
+            'title': title,
+            'description': description,
+            'priority': priority,
+            'deadline': deadline,
+            'status': status,
+            'completed': completed,
+            'id': id,
+            'created_at': created_at,
+            'updated_at': updated_at,
+            'tags': tags,
+            'version': version,
+            '_listeners': [],
+        }
+        return task
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Task':
         """Создание задачи из словаря"""
+        data = dict(data)
+
         # Конвертируем строки обратно в datetime
         if 'created_at' in data:
             data['created_at'] = datetime.fromisoformat(data['created_at'])
@@ -91,15 +174,15 @@ class Task:
         if 'updated_at' in data:
             data['updated_at'] = datetime.fromisoformat(data['updated_at'])
 
-        if 'deadline' in data:
+        if data.get('deadline'):
             data['deadline'] = datetime.fromisoformat(data['deadline'])
 
         # Конвертируем строки в Enum
         if 'priority' in data:
-            data['priority'] = datetime.fromisoformat(data['priority'])
+            data['priority'] = Priority(data['priority'])
 
         if 'status' in data:
-            data['status'] = datetime.fromisoformat(data['status'])
+            data['status'] = TaskStatus(data['status'])
 
         return cls(**data)
 
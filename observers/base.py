@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List, Tuple
 
 
 class Observer(ABC):
@@ -15,3 +15,16 @@ class Observer(ABC):
             data: Данные события
         """
         pass
+
+    def update_batch(self, events: List[Tuple[str, Any]]):
+        """
+        Получение пачки событий
+
+        По умолчанию вызывает update для каждого события; наблюдатели,
+        которым выгодно обрабатывать события пачкой, переопределяют метод.
+
+        Args:
+            events: Список пар (событие, данные) в порядке возникновения
+        """
+        for event, data in events:
+            self.update(event, data)
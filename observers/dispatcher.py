@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+Event = Tuple[str, Any]
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+POLICIES = (BLOCK, DROP_OLDEST, COALESCE)
+
+
+class AsyncDispatcher:
+    """
+    Асинхронная доставка событий наблюдателям.
+
+    События кладутся в ограниченную очередь и доставляются пачками
+    из фонового потока, поэтому медленный наблюдатель не задерживает
+    add_task/update_task. Что делать при заполненной очереди,
+    задаёт политика:
+    - block — ждать, пока освободится место;
+    - drop_oldest — выбросить самое старое событие;
+    - coalesce — заменить уже ждущее событие того же типа для той же
+      задачи (по data['id']), а если такого нет — ждать, как block.
+    """
+
+    def __init__(self, deliver: Callable[[List[Event]], None],
+                 maxsize: int = 10_000, policy: str = BLOCK,
+                 batch_size: int = 100):
+        """
+        Args:
+            deliver: Функция доставки пачки событий наблюдателям
+            maxsize: Максимальная длина очереди
+            policy: Политика при заполненной очереди (block, drop_oldest, coalesce)
+            batch_size: Максимальный размер пачки
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Неизвестная политика {policy}")
+
+        self._deliver = deliver
+        self.maxsize = maxsize
+        self.policy = policy
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.coalesced = 0
+
+        self._queue: Deque[Event] = deque()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._run, name="observer-dispatcher", daemon=True
+        )
+        self._worker.start()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def submit(self, event: str, data: Any) -> None:
+        """Поставить событие в очередь на доставку"""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Диспетчер остановлен")
+
+            if len(self._queue) >= self.maxsize:
+                if self.policy == DROP_OLDEST:
+                    self._queue.popleft()
+                    self.dropped += 1
+                elif self.policy == COALESCE and self._coalesce(event, data):
+                    return
+
+            while len(self._queue) >= self.maxsize and not self._closed:
+                self._condition.wait()
+
+            self._queue.append((event, data))
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Дождаться доставки всех событий из очереди.
+
+        Returns:
+            bool: True, если очередь опустела до истечения timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._queue or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Доставить оставшиеся события и остановить фоновый поток"""
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join(timeout)
+
+    def _coalesce(self, event: str, data: Any) -> bool:
+        task_id = data.get("id") if isinstance(data, dict) else None
+        if task_id is None:
+            return False
+        for position in range(len(self._queue) - 1, -1, -1):
+            queued_event, queued_data = self._queue[position]
+            if (queued_event == event and isinstance(queued_data, dict)
+                    and queued_data.get("id") == task_id):
+                self._queue[position] = (event, data)
+                self.coalesced += 1
+                return True
+        return False
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                size = min(self.batch_size, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(size)]
+                self._in_flight = size
+                self._condition.notify_all()
+
+            try:
+                self._deliver(batch)
+            except Exception as e:
+                print(f"Dispatcher error: {e}")
+            finally:
+                with self._condition:
+                    self._in_flight = 0
+                    self._condition.notify_all()
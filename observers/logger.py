@@ -1,66 +1,219 @@
+import atexit
+import json
 import logging
-from calendar import error
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 
 from observers.base import Observer
-from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+# Запись в файл копится в буфере и сбрасывается по размеру или по времени
+DEFAULT_BUFFER_SIZE = 64 * 1024
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    Файловый обработчик с буферизованной записью.
+
+    Строки накапливаются в памяти и записываются одним вызовом,
+    когда буфер превышает buffer_size байт или с прошлой записи
+    прошло flush_interval секунд. Фоновый таймер сбрасывает буфер
+    и тогда, когда новых записей нет.
+    """
+
+    def __init__(self, filename: Path, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 encoding: str = "utf-8"):
+        super().__init__(filename, encoding=encoding)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._buffer: list[str] = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, name="log-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            line = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self.lock:
+            self._buffer.append(line)
+            self._buffered_bytes += len(line)
+            due = (self._buffered_bytes >= self.buffer_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if self._buffer:
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write("".join(self._buffer))
+                self._buffer.clear()
+                self._buffered_bytes = 0
+            self._last_flush = time.monotonic()
+            if self.stream is not None:
+                self.stream.flush()
+
+    def close(self):
+        self._stopped.set()
+        self.flush()
+        super().close()
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.flush_interval):
+            if self._buffer:
+                self.flush()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Форматирование записи в одну JSON-строку со структурными полями"""
+
+    FIELDS = ("event", "task_id", "title", "count")
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        for name in self.FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler, который не форматирует запись в потоке вызывающего.
+
+    Стандартный prepare() подставляет аргументы в сообщение сразу;
+    здесь запись уходит в очередь как есть, и %-форматирование
+    выполняется уже в потоке QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
 
 class LoggerObserver(Observer):
     """Наблюдатель, который логирует все собития"""
 
-    def __init__(self, log_file: Path):
+    def __init__(self, log_file: Path, json_lines: bool = False,
+                 console: bool = True, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
         """
         Args:
             log_file: Путь к файлу логов
+            json_lines: Писать в файл JSON-строки вместо текста
+            console: Дублировать записи в консоль
+            buffer_size: Размер буфера записи в файл, байт
+            flush_interval: Максимальная задержка записи в файл, секунд
         """
         self.log_file = log_file
+        self.json_lines = json_lines
+        self.console = console
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.logger = None
+        self._listener = None
+        self.setup_logger()
 
     def setup_logger(self):
-        self.logger = logging.getLogger("TaskManager")
-        self.logger.setLevel(logging.INFO)
+        """
+        Настроить логирование через очередь.
+
+        Вызывающий поток только кладёт запись в очередь; форматирование
+        и запись в файл/консоль выполняет фоновый QueueListener.
+        Повторный вызов ничего не делает.
+        """
+        if self._listener is not None:
+            return
+
+        # Собственный логгер у каждого наблюдателя: обработчики
+        # разных экземпляров не складываются друг с другом
+        self.logger = logging.Logger("TaskManager", logging.INFO)
 
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
 
-        file_handler = logging.FileHandler(self.log_file, encoding="utf-8")
+        file_handler = BufferedFileHandler(
+            self.log_file, self.buffer_size, self.flush_interval
+        )
         file_handler.setLevel(logging.INFO)
 
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-
         formatter = logging.Formatter(
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
             datefmt='%Y-%m-%d %H:%M:%S'
         )
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        file_handler.setFormatter(JsonLinesFormatter() if self.json_lines else formatter)
+        handlers = [file_handler]
+
+        if self.console:
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(formatter)
+            handlers.append(console_handler)
+
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(_DeferredQueueHandler(log_queue))
+        self._listener = QueueListener(log_queue, *handlers)
+        self._listener.start()
+        atexit.register(self.close)
+
+    def close(self):
+        """Дописать оставшиеся записи и остановить фоновый поток"""
+        listener, self._listener = self._listener, None
+        if listener is None:
+            return
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        atexit.unregister(self.close)
 
     def update(self, event: str, data: Any):
         """Логирование событий"""
         if event == "task_added":
-            self.logger.info(f"Task added: {data['title']}")
+            self.logger.info("Task added: %s", data['title'],
+                             extra={"event": event, "task_id": data.get('id'),
+                                    "title": data['title']})
 
         elif event == 'task_updated':
-            self.logger.info(f'Task Updated: {data['title']}')
+            self.logger.info("Task Updated: %s", data['title'],
+                             extra={"event": event, "task_id": data.get('id'),
+                                    "title": data['title']})
 
         elif event == 'task_deleted':
-            self.logger.info(f'Task Deleted: {data['title']}')
+            self.logger.info("Task Deleted: %s", data['title'],
+                             extra={"event": event, "task_id": data.get('id'),
+                                    "title": data['title']})
 
         elif event == 'task_completed':
-            self.logger.info(f'Task Completed: {data['title']}')
+            self.logger.info("Task Completed: %s", data['title'],
+                             extra={"event": event, "task_id": data.get('id'),
+                                    "title": data['title']})
 
         elif event == 'task_loaded':
-            self.logger.info(f'Loaded {data['count']} tasks')
+            self.logger.info("Loaded %s tasks", data['count'],
+                             extra={"event": event, "count": data['count']})
 
         elif event == 'task_saved':
-            self.logger.info(f'Saved {data['count']} tasks')
+            self.logger.info("Saved %s tasks", data['count'],
+                             extra={"event": event, "count": data['count']})
         elif event == 'error':
-            self.logger.error(f'Error: {data['message']}')
+            self.logger.error("Error: %s", data['message'], extra={"event": event})
 
         else:
-            self.logger.info(f'Event {event}: {data}')
-
+            self.logger.info("Event %s: %s", event, data, extra={"event": event})
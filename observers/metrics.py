@@ -0,0 +1,35 @@
+from typing import Any, List, Optional, Tuple
+
+from observers.base import Observer
+from services.metrics import Metrics
+
+
+class MetricsObserver(Observer):
+    """
+    Наблюдатель, считающий события менеджера.
+
+    Каждое событие увеличивает счётчик «event.<тип>» в Metrics.
+    Если передать тот же объект Metrics, что и TaskManager,
+    счётчики событий попадут в общий снимок рядом с длительностями.
+    """
+
+    def __init__(self, metrics: Optional[Metrics] = None):
+        """
+        Args:
+            metrics: Куда записывать счётчики (по умолчанию — новый Metrics)
+        """
+        self.metrics = metrics if metrics is not None else Metrics()
+
+    def update(self, event: str, data: Any):
+        self.metrics.increment(f"event.{event}")
+
+    def update_batch(self, events: List[Tuple[str, Any]]):
+        counts = {}
+        for event, _ in events:
+            counts[event] = counts.get(event, 0) + 1
+        for event, count in counts.items():
+            self.metrics.increment(f"event.{event}", count)
+
+    def snapshot(self) -> dict:
+        """Текущие значения метрик"""
+        return self.metrics.snapshot()
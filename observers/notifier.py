@@ -1,23 +1,149 @@
+import threading
+from collections import deque
 from datetime import datetime
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
 from observers.base import Observer
 
+DEFAULT_CAPACITY = 1000
+
 
 class NotificationObserver(Observer):
+    """
+    Наблюдатель, хранящий последние уведомления.
+
+    Уведомления лежат в кольцевом буфере ограниченного размера:
+    при переполнении вытесняются самые старые. Каждое уведомление
+    получает порядковый номер (seq), по которому можно читать только
+    новые записи, и попадает в индексы по типу события и по id задачи.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, echo: bool = True):
+        """
+        Args:
+            capacity: Максимальное число хранимых уведомлений
+            echo: Печатать уведомление в консоль при получении
+        """
+        if capacity < 1:
+            raise ValueError("Ёмкость должна быть положительной")
+
+        self.capacity = capacity
+        self.echo = echo
+        self._notifications: Deque[dict] = deque()
+        self._by_event: Dict[str, Deque[dict]] = {}
+        self._by_task: Dict[str, Deque[dict]] = {}
+        self._next_seq = 1
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._notifications)
+
+    @property
+    def last_seq(self) -> int:
+        """Номер последнего полученного уведомления (0, если их не было)"""
+        return self._next_seq - 1
+
+    def update(self, event: str, data: Any):
+        with self._lock:
+            self._append(event, data, datetime.now())
+        if self.echo:
+            print(f"🔔 Notification: {event}")
+
+    def update_batch(self, events: List[Tuple[str, Any]]):
+        timestamp = datetime.now()
+        with self._lock:
+            for event, data in events:
+                self._append(event, data, timestamp)
+        if self.echo:
+            for event, _ in events:
+                print(f"🔔 Notification: {event}")
+
+    def get_notifications(self, limit: int) -> List[dict]:
+        """Последние limit уведомлений, от старых к новым"""
+        with self._lock:
+            return self._tail(self._notifications, limit)
 
-    def __init__(self):
-        self._notifications = []
+    def get_by_event(self, event: str, limit: Optional[int] = None) -> List[dict]:
+        """Последние уведомления о событии указанного типа"""
+        with self._lock:
+            return self._tail(self._by_event.get(event, ()), limit)
 
-    def update(self, event: str, data):
+    def get_by_task(self, task_id: str, limit: Optional[int] = None) -> List[dict]:
+        """Последние уведомления, относящиеся к задаче"""
+        with self._lock:
+            return self._tail(self._by_task.get(task_id, ()), limit)
+
+    def get_since(self, seq: int, limit: Optional[int] = None) -> List[dict]:
+        """
+        Уведомления с номером больше seq, от старых к новым.
+
+        Опрашивающий код хранит seq последнего прочитанного уведомления
+        и получает только новые записи, не копируя всю историю.
+        Если часть записей уже вытеснена, возвращаются оставшиеся.
+
+        Args:
+            seq: Номер последнего прочитанного уведомления
+            limit: Максимальное число возвращаемых уведомлений
+
+        Returns:
+            List[dict]: Уведомления с ключами seq, event, data, timestamp
+        """
+        with self._lock:
+            count = min(self._next_seq - 1 - seq, len(self._notifications))
+            if count <= 0:
+                return []
+            # Новые записи лежат в конце буфера: идём с хвоста
+            result = list(islice(reversed(self._notifications), count))
+            result.reverse()
+            return result[:limit] if limit is not None else result
+
+    def clear_notifications(self):
+        """Удалить все уведомления; нумерация продолжается"""
+        with self._lock:
+            self._notifications.clear()
+            self._by_event.clear()
+            self._by_task.clear()
+
+    def _append(self, event: str, data: Any, timestamp: datetime) -> None:
+        if len(self._notifications) >= self.capacity:
+            self._evict()
+
+        task_id = data.get("id") if isinstance(data, dict) else None
         notification = {
+            "seq": self._next_seq,
             "event": event,
             "data": data,
-            "timestamp": datetime.now()
+            "timestamp": timestamp,
         }
+        self._next_seq += 1
         self._notifications.append(notification)
-        print(f"🔔 Notification: {event}")
+        self._by_event.setdefault(event, deque()).append(notification)
+        if task_id is not None:
+            self._by_task.setdefault(task_id, deque()).append(notification)
 
-    def get_notifications(self, limit: int):
-        return self._notifications[-limit:]
+    def _evict(self) -> None:
+        # Вытесняемое уведомление — самое старое и в своих индексах
+        oldest = self._notifications.popleft()
+        self._discard(self._by_event, oldest["event"])
+        data = oldest["data"]
+        task_id = data.get("id") if isinstance(data, dict) else None
+        if task_id is not None:
+            self._discard(self._by_task, task_id)
 
-    def clear_notifications(self):
-        self._notifications.clear()
+    @staticmethod
+    def _discard(index: Dict[str, Deque[dict]], key: str) -> None:
+        bucket = index[key]
+        bucket.popleft()
+        if not bucket:
+            del index[key]
+
+    @staticmethod
+    def _tail(items, limit: Optional[int]) -> List[dict]:
+        if limit is None:
+            return list(items)
+        if limit <= 0:
+            return []
+        result = list(islice(reversed(items), limit))
+        result.reverse()
+        return result
@@ -0,0 +1,444 @@
+"""
+HTTP API с JSON поверх TaskManager.
+
+Запуск:
+    python server.py --file data/tasks.json --port 8000
+
+Маршруты:
+    GET    /tasks                 страница задач: ?limit=&cursor=&status=
+                                  &priority=&tag=&completed=true|false&q=
+    POST   /tasks                 создать задачу (тело — поля Task.to_dict,
+                                  обязателен title)
+    GET    /tasks/<id>            задача
+    PATCH  /tasks/<id>            изменить поля title, description, priority,
+                                  status, deadline, tags
+    DELETE /tasks/<id>            удалить задачу
+    POST   /tasks/<id>/complete   отметить выполненной
+    GET    /top?k=10&strategy=combined&incomplete=true
+                                  первые k задач по приоритету стратегии
+    GET    /stats                 статистика
+
+Списки отдаются страницами: ответ содержит next_cursor, который
+передаётся в cursor следующего запроса. Ответы на GET несут ETag
+по номеру состояния менеджера (TaskManager.version) и метке запуска
+сервера: номер состояния начинается заново при каждом запуске.
+Запрос с If-None-Match без изменений получает 304 без тела.
+Соединения HTTP/1.1 остаются открытыми между запросами.
+"""
+import argparse
+import json
+import sys
+import uuid
+from datetime import date, datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from cli import BACKENDS, DEFAULT_FILE, STRATEGIES, close_manager, load_class, open_manager
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+# Максимальный размер тела запроса, байт
+MAX_BODY = 1 << 20
+# Поля, которые можно менять через PATCH
+UPDATABLE = {"title", "description", "priority", "status", "deadline", "tags"}
+# Поля, которые можно передать в POST (формат Task.to_dict)
+CREATABLE = UPDATABLE | {"id", "completed", "created_at", "updated_at", "version"}
+
+
+class ApiError(Exception):
+    """Ошибка запроса, которая отдаётся клиенту с кодом status"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_bool(value: str) -> bool:
+    if value in ("1", "true", "yes"):
+        return True
+    if value in ("0", "false", "no"):
+        return False
+    raise ApiError(HTTPStatus.BAD_REQUEST, f"ожидается true или false, а не {value!r}")
+
+
+def parse_int(value: str, name: str, minimum: int, maximum: int = None) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} должен быть целым числом")
+    if number < minimum or (maximum is not None and number > maximum):
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} вне допустимых границ")
+    return number
+
+
+def task_filter(params: dict) -> Optional[Callable]:
+    """Фильтр задач по параметрам status, priority, tag и completed"""
+    from models.enums import Priority, TaskStatus
+
+    checks: List[Callable] = []
+    try:
+        if "status" in params:
+            status = TaskStatus(params["status"])
+            checks.append(lambda task: task.status == status)
+        if "priority" in params:
+            priority = Priority(params["priority"])
+            checks.append(lambda task: task.priority == priority)
+    except ValueError as e:
+        raise ApiError(HTTPStatus.BAD_REQUEST, str(e))
+    if "tag" in params:
+        tag = params["tag"]
+        checks.append(lambda task: tag in task.tags)
+    if "completed" in params:
+        completed = parse_bool(params["completed"])
+        checks.append(lambda task: task.completed == completed)
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    return lambda task: all(check(task) for check in checks)
+
+
+def task_fields(data: dict, allowed: set = UPDATABLE) -> dict:
+    """
+    Значения полей из JSON, приведённые к типам Task.
+
+    Args:
+        data: Тело запроса
+        allowed: Допустимые поля (UPDATABLE для PATCH, CREATABLE для POST)
+
+    Returns:
+        dict: Поля для Task.update или конструктора Task; при ошибке
+            в типе или значении — ApiError с кодом 400
+    """
+    from models.enums import Priority, TaskStatus
+    from models.task import MAX_LENGTH, local_time
+
+    unknown = set(data) - allowed
+    if unknown:
+        raise ApiError(HTTPStatus.BAD_REQUEST,
+                       f"недопустимые поля: {', '.join(sorted(unknown))}")
+    fields = dict(data)
+    try:
+        if "title" in fields:
+            title = fields["title"]
+            if not isinstance(title, str) or not title.strip() or len(title) > MAX_LENGTH:
+                raise ValueError("некорректное название задачи")
+        if "description" in fields and not isinstance(fields["description"], str):
+            raise ValueError("description должен быть строкой")
+        if "id" in fields and not (isinstance(fields["id"], str) and fields["id"].strip()):
+            raise ValueError("id должен быть непустой строкой")
+        if "completed" in fields and not isinstance(fields["completed"], bool):
+            raise ValueError("completed должен быть true или false")
+        if "version" in fields and (type(fields["version"]) is not int or fields["version"] < 0):
+            raise ValueError("version должен быть неотрицательным целым")
+        for name in ("created_at", "updated_at"):
+            if name in fields:
+                fields[name] = local_time(datetime.fromisoformat(fields[name]))
+        if "priority" in fields:
+            fields["priority"] = Priority(fields["priority"])
+        if "status" in fields:
+            fields["status"] = TaskStatus(fields["status"])
+        if fields.get("deadline") is not None:
+            fields["deadline"] = local_time(datetime.fromisoformat(fields["deadline"]))
+        if "tags" in fields and not (isinstance(fields["tags"], list)
+                                     and all(isinstance(tag, str) for tag in fields["tags"])):
+            raise ValueError("tags должен быть списком строк")
+    except (TypeError, ValueError) as e:
+        raise ApiError(HTTPStatus.BAD_REQUEST, str(e))
+    return fields
+
+
+class TaskApiHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов; менеджер задач хранится в self.server.manager"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "TaskManagerAPI/1.0"
+    # Заголовки и тело уходят одним пакетом (ответ буферизуется до
+    # flush в handle_one_request), иначе в открытом соединении
+    # алгоритм Нейгла и отложенный ACK добавляют ~40 мс на ответ
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    @property
+    def manager(self):
+        return self.server.manager
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _handle(self, method: str) -> None:
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            # Тело читается всегда, иначе остаток сломает следующий
+            # запрос в том же соединении
+            body = self._read_body()
+            route = self._route(method, parts)
+            route(parts, params, body)
+        except ApiError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+
+    def _route(self, method: str, parts: List[str]) -> Callable:
+        routes = {
+            ("GET", 1, "tasks"): self.list_tasks,
+            ("POST", 1, "tasks"): self.create_task,
+            ("GET", 2, "tasks"): self.get_task,
+            ("PATCH", 2, "tasks"): self.update_task,
+            ("DELETE", 2, "tasks"): self.delete_task,
+            ("GET", 1, "top"): self.top_tasks,
+            ("GET", 1, "stats"): self.statistics,
+        }
+        if len(parts) == 3 and parts[0] == "tasks" and parts[2] == "complete":
+            if method == "POST":
+                return self.complete_task
+            raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, "метод не поддерживается")
+        route = routes.get((method, len(parts), parts[0] if parts else ""))
+        if route is None:
+            if any(key[1:] == (len(parts), parts[0] if parts else "") for key in routes):
+                raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, "метод не поддерживается")
+            raise ApiError(HTTPStatus.NOT_FOUND, "нет такого ресурса")
+        return route
+
+    def list_tasks(self, parts, params, body) -> None:
+        limit = parse_int(params.get("limit", str(DEFAULT_LIMIT)), "limit", 1, MAX_LIMIT)
+        cursor = None
+        if "cursor" in params:
+            cursor = parse_int(params["cursor"], "cursor", 0)
+        check = task_filter(params)
+        # Номер состояния читается до выборки: если задачи изменятся
+        # во время запроса, ETag окажется старше ответа, а не наоборот
+        etag = self._state_etag(self.manager.version)
+        if self._not_modified(etag):
+            return
+        tasks, next_cursor = self.manager.page_tasks(cursor, limit, check, params.get("q"))
+        self._send_json(HTTPStatus.OK, {
+            "tasks": [task.to_dict() for task in tasks],
+            "next_cursor": None if next_cursor is None else str(next_cursor),
+        }, etag)
+
+    def create_task(self, parts, params, body) -> None:
+        from models.task import Task
+
+        data = self._json(body)
+        if "title" not in data:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "не указано поле title")
+        fields = task_fields(data, CREATABLE)
+        fields.setdefault("description", "")
+        try:
+            task = Task(**fields)
+        except (TypeError, ValueError) as e:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"некорректная задача: {e}")
+        try:
+            # Проверка и добавление — одна операция для других потоков
+            with self.manager.batch():
+                if self.manager.get_task(task.id) is not None:
+                    raise ApiError(HTTPStatus.CONFLICT, f"задача {task.id} уже есть")
+                self.manager.add_task(task)
+        except IOError:
+            raise ApiError(HTTPStatus.INTERNAL_SERVER_ERROR, "не удалось сохранить задачу")
+        self._send_json(HTTPStatus.CREATED, task.to_dict(), self._task_etag(task),
+                        {"Location": f"/tasks/{task.id}"})
+
+    def get_task(self, parts, params, body) -> None:
+        task = self._find(parts[1])
+        etag = self._task_etag(task)
+        if not self._not_modified(etag):
+            self._send_json(HTTPStatus.OK, task.to_dict(), etag)
+
+    def update_task(self, parts, params, body) -> None:
+        fields = task_fields(self._json(body))
+        task = self._find(parts[1])
+        if fields and not self.manager.update_task(task.id, **fields):
+            raise ApiError(HTTPStatus.CONFLICT, "не удалось сохранить изменения")
+        self._send_json(HTTPStatus.OK, task.to_dict(), self._task_etag(task))
+
+    def delete_task(self, parts, params, body) -> None:
+        if not self.manager.delete_task(parts[1]):
+            raise ApiError(HTTPStatus.NOT_FOUND, f"задача {parts[1]} не найдена")
+        self._send(HTTPStatus.NO_CONTENT)
+
+    def complete_task(self, parts, params, body) -> None:
+        task = self._find(parts[1])
+        if not self.manager.complete_task(task.id):
+            raise ApiError(HTTPStatus.CONFLICT, "не удалось сохранить изменения")
+        self._send_json(HTTPStatus.OK, task.to_dict(), self._task_etag(task))
+
+    def top_tasks(self, parts, params, body) -> None:
+        k = parse_int(params.get("k", "10"), "k", 1, MAX_LIMIT)
+        name = params.get("strategy")
+        if name is not None and name not in STRATEGIES:
+            raise ApiError(HTTPStatus.BAD_REQUEST,
+                           f"стратегия должна быть одной из: {', '.join(sorted(STRATEGIES))}")
+        strategy = self.server.strategy(name)
+        check = task_filter({
+            "completed": "false" if parse_bool(params["incomplete"]) else "true"
+        } if "incomplete" in params else {})
+        # Приоритеты стратегий зависят от текущей даты
+        etag = self._state_etag(self.manager.version, date.today().isoformat())
+        if self._not_modified(etag):
+            return
+        tasks = self.manager.top_tasks(k, strategy, filter=check)
+        self._send_json(HTTPStatus.OK, {"tasks": [task.to_dict() for task in tasks]}, etag)
+
+    def statistics(self, parts, params, body) -> None:
+        version = self.manager.version
+        stats = self.manager.get_statistics()
+        # Просроченные задачи меняются со временем без изменений задач,
+        # но их число только растёт, поэтому годится в ETag
+        etag = self._state_etag(version, stats["overdue"])
+        if not self._not_modified(etag):
+            self._send_json(HTTPStatus.OK, stats, etag)
+
+    def _find(self, task_id: str):
+        task = self.manager.get_task(task_id)
+        if task is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"задача {task_id} не найдена")
+        return task
+
+    def _state_etag(self, version: int, *extra) -> str:
+        """
+        ETag состояния всех задач.
+
+        TaskManager.version перед чтением перечитывает задачи,
+        изменённые другим процессом, а метка запуска не даёт
+        совпасть номерам состояний разных запусков сервера.
+        """
+        parts = (self.server.boot_id, version) + extra
+        return '"' + "-".join(map(str, parts)) + '"'
+
+    @staticmethod
+    def _task_etag(task) -> str:
+        return f'"{task.id}-{task.version}"'
+
+    def _not_modified(self, etag: str) -> bool:
+        """Ответить 304, если у клиента уже есть эта версия"""
+        header = self.headers.get("If-None-Match")
+        if header is None:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        if etag not in tags and "*" not in tags:
+            return False
+        self._send(HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+        return True
+
+    def _read_body(self) -> bytes:
+        length = self.headers.get("Content-Length")
+        if not length:
+            return b""
+        try:
+            length = parse_int(length, "Content-Length", 0)
+            if length > MAX_BODY:
+                raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "слишком большое тело запроса")
+        except ApiError:
+            # Непрочитанное тело не даст продолжить соединение
+            self.close_connection = True
+            raise
+        return self.rfile.read(length)
+
+    @staticmethod
+    def _json(body: bytes) -> dict:
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError as e:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"некорректный JSON: {e}")
+        if not isinstance(data, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "ожидается JSON-объект")
+        return data
+
+    def _send_json(self, status: HTTPStatus, data, etag: str = None,
+                   headers: dict = None) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        headers = dict(headers or {})
+        headers["Content-Type"] = "application/json; charset=utf-8"
+        if etag is not None:
+            headers["ETag"] = etag
+        self._send(status, body, headers)
+
+    def _send(self, status: HTTPStatus, body: bytes = b"", headers: dict = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        # Длина нужна всегда: без неё клиент не найдёт конец ответа
+        # в открытом соединении
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+class TaskApiServer(ThreadingHTTPServer):
+    """
+    Многопоточный HTTP-сервер над одним TaskManager.
+
+    Каждое соединение обслуживается своим потоком; TaskManager
+    потокобезопасен, поэтому запросы на чтение выполняются параллельно.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], manager, quiet: bool = False):
+        super().__init__(address, TaskApiHandler)
+        self.manager = manager
+        self.quiet = quiet
+        # Метка запуска для ETag: номера состояний начинаются заново
+        self.boot_id = uuid.uuid4().hex[:12]
+        self._strategies = {}
+
+    def strategy(self, name: Optional[str]):
+        """Экземпляр стратегии по имени, один на сервер (None — по дате создания)"""
+        if name is None:
+            return None
+        strategy = self._strategies.get(name)
+        if strategy is None:
+            strategy = self._strategies.setdefault(name, load_class(*STRATEGIES[name])())
+        return strategy
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="HTTP API для задач")
+    parser.add_argument("--file", type=Path, default=DEFAULT_FILE,
+                        help=f"файл хранилища (по умолчанию {DEFAULT_FILE})")
+    parser.add_argument("--backend", choices=sorted(BACKENDS),
+                        help="тип хранилища (по умолчанию по расширению файла)")
+    parser.add_argument("--log", type=Path, help="писать события в лог-файл")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--quiet", action="store_true", help="не печатать запросы")
+    args = parser.parse_args(argv)
+
+    # Постраничная выборка идёт по TaskIndex, поэтому без pushdown
+    manager = open_manager(args, pushdown=False)
+    server = TaskApiServer((args.host, args.port), manager, quiet=args.quiet)
+    print(f"Сервер запущен на http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        close_manager(manager)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
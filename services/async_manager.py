@@ -0,0 +1,227 @@
+import asyncio
+import inspect
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from models.task import Task
+from observers.base import Observer
+from services.task_manager import TaskManager
+from storage.base import Storage
+
+# Сколько ждать новых изменений перед записью, секунд
+DEFAULT_DELAY = 0.01
+
+
+class _LoopObserver(Observer):
+    """
+    Переносит события из потока менеджера в цикл событий.
+
+    События кладутся в очередь и доставляются наблюдателю
+    по одному в порядке возникновения; async-методы наблюдателя
+    ожидаются, обычные вызываются в цикле.
+    """
+
+    def __init__(self, observer, loop: asyncio.AbstractEventLoop):
+        self.observer = observer
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._consumer = loop.create_task(self._consume())
+
+    def update(self, event: str, data: Any):
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (event, data))
+
+    def update_batch(self, events: List[Tuple[str, Any]]):
+        self._loop.call_soon_threadsafe(self._put_all, list(events))
+
+    def _put_all(self, events: List[Tuple[str, Any]]) -> None:
+        for item in events:
+            self._queue.put_nowait(item)
+
+    async def join(self) -> None:
+        """Дождаться доставки всех поставленных событий"""
+        # Даём call_soon_threadsafe из других потоков дойти до очереди
+        await asyncio.sleep(0)
+        await self._queue.join()
+
+    def close(self) -> None:
+        self._consumer.cancel()
+
+    async def _consume(self) -> None:
+        while True:
+            event, data = await self._queue.get()
+            try:
+                result = self.observer.update(event, data)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"Observer error: {e}")
+            finally:
+                self._queue.task_done()
+
+
+class AsyncTaskManager:
+    """
+    Асинхронный фасад TaskManager для приложений на asyncio.
+
+    Операции менеджера выполняются в пуле потоков (asyncio.to_thread),
+    поэтому цикл событий не блокируется ни на вычислениях, ни на
+    ожидании блокировок. Изменения применяются в памяти сразу, а в
+    хранилище записываются с объединением: запись ждёт delay секунд,
+    собирая все изменения за это время, и пока одна запись идёт,
+    следующие изменения копятся для одной следующей. Корутина
+    изменения завершается, когда запись с этим изменением готова.
+    Если запись не удалась, все вошедшие в неё изменения откатываются
+    в памяти (как при неудачном сохранении в TaskManager), а их
+    корутины возвращают False. Запись в историю и события наблюдателям
+    появляются только после успешной записи.
+
+    Наблюдатели могут быть обычными или с async def update: события
+    доставляются им в цикле событий в порядке возникновения.
+
+    Example:
+        manager = await AsyncTaskManager.create(JSONStorage(path))
+        await asyncio.gather(*(manager.add_task(task) for task in tasks))
+        found = await manager.search_tasks("отчёт")
+        await manager.close()
+    """
+
+    def __init__(self, manager: TaskManager, delay: float = DEFAULT_DELAY):
+        """
+        Args:
+            manager: Менеджер задач; он переводится в режим autosave=False,
+                и сохранять изменения дальше должен этот фасад
+            delay: Сколько ждать новых изменений перед записью, секунд
+        """
+        manager.autosave = False
+        self.manager = manager
+        self.delay = delay
+        # Ожидание следующей записи и задача, которая её выполняет
+        self._next_save: Optional[asyncio.Future] = None
+        self._saver: Optional[asyncio.Task] = None
+        self._observers: Dict[int, _LoopObserver] = {}
+
+    @classmethod
+    async def create(cls, storage: Storage, delay: float = DEFAULT_DELAY,
+                     **kwargs) -> 'AsyncTaskManager':
+        """
+        Создать менеджер, загрузив задачи вне цикла событий.
+
+        Args:
+            storage: Хранилище задач
+            delay: Сколько ждать новых изменений перед записью, секунд
+            **kwargs: Остальные параметры TaskManager
+        """
+        manager = await asyncio.to_thread(TaskManager, storage, **kwargs)
+        return cls(manager, delay)
+
+    async def add_task(self, task: Task) -> bool:
+        """Добавить задачу; True, когда она записана в хранилище"""
+        return await self._mutate(self.manager.add_task, task)
+
+    async def add_tasks(self, tasks: Iterable[Task]) -> int:
+        """Добавить задачи одним пакетом; число добавленных (0 при ошибке)"""
+        count = await asyncio.to_thread(self.manager.add_tasks, list(tasks))
+        if count and not await self.save():
+            return 0
+        return count
+
+    async def update_task(self, task_id: str, **kwargs) -> bool:
+        """Изменить поля задачи; True, когда изменение записано"""
+        return await self._mutate(self.manager.update_task, task_id, **kwargs)
+
+    async def complete_task(self, task_id: str) -> bool:
+        """Отметить задачу выполненной; True, когда изменение записано"""
+        return await self._mutate(self.manager.complete_task, task_id)
+
+    async def delete_task(self, task_id: str) -> bool:
+        """Удалить задачу; True, когда удаление записано"""
+        return await self._mutate(self.manager.delete_task, task_id)
+
+    async def get_task(self, task_id: str) -> Optional[Task]:
+        """Задача по идентификатору или None"""
+        return await asyncio.to_thread(self.manager.get_task, task_id)
+
+    async def search_tasks(self, query: str) -> List[Task]:
+        """Поиск задач (см. TaskManager.search_tasks)"""
+        return await asyncio.to_thread(self.manager.search_tasks, query)
+
+    async def get_statistics(self) -> dict:
+        """Статистика задач (см. TaskManager.get_statistics)"""
+        return await asyncio.to_thread(self.manager.get_statistics)
+
+    async def export_tasks(self, format: str, path: Path) -> bool:
+        """Экспорт задач в json или csv"""
+        return await asyncio.to_thread(self.manager.export_tasks, format, path)
+
+    async def save(self) -> bool:
+        """
+        Записать все накопленные изменения.
+
+        Returns:
+            bool: True, если запись удалась (или записывать нечего)
+        """
+        if self._next_save is None:
+            self._next_save = asyncio.get_running_loop().create_future()
+            if self._saver is None or self._saver.done():
+                self._saver = asyncio.create_task(self._save_loop())
+        return await asyncio.shield(self._next_save)
+
+    async def load(self) -> bool:
+        """Записать накопленные изменения и перечитать задачи из хранилища"""
+        await self.save()
+        return await asyncio.to_thread(self.manager.load_task)
+
+    async def add_observer(self, observer) -> None:
+        """
+        Добавить наблюдателя.
+
+        Args:
+            observer: Объект с методом update(event, data),
+                обычным или async def
+        """
+        if id(observer) in self._observers:
+            return
+        adapter = _LoopObserver(observer, asyncio.get_running_loop())
+        self._observers[id(observer)] = adapter
+        # Менеджер может быть занят записью — не ждём его в цикле событий
+        await asyncio.to_thread(self.manager.add_observer, adapter)
+
+    async def remove_observer(self, observer) -> None:
+        """Удалить наблюдателя, добавленного через add_observer"""
+        adapter = self._observers.pop(id(observer), None)
+        if adapter is not None:
+            await asyncio.to_thread(self.manager.remove_observer, adapter)
+            adapter.close()
+
+    async def flush(self) -> bool:
+        """Записать изменения и дождаться доставки событий наблюдателям"""
+        saved = await self.save()
+        for adapter in list(self._observers.values()):
+            await adapter.join()
+        return saved
+
+    async def close(self) -> bool:
+        """Записать изменения, доставить события и закрыть историю"""
+        saved = await self.flush()
+        for observer in [adapter.observer for adapter in self._observers.values()]:
+            await self.remove_observer(observer)
+        await asyncio.to_thread(self.manager.history.close)
+        return saved
+
+    async def _mutate(self, method, *args, **kwargs) -> bool:
+        if not await asyncio.to_thread(method, *args, **kwargs):
+            return False
+        return await self.save()
+
+    async def _save_loop(self) -> None:
+        # Пока идёт запись, новые изменения ждут следующей
+        while self._next_save is not None:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            future, self._next_save = self._next_save, None
+            try:
+                saved = await asyncio.to_thread(self.manager.save_pending)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(saved)
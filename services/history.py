@@ -0,0 +1,329 @@
+import json
+import os
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировка между процессами недоступна
+    fcntl = None
+
+# Размер активного файла истории, после которого он ротируется
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+
+# Положение записи: (номер файла, смещение строки в нём)
+Location = Tuple[int, int]
+# Отпечаток активного файла: inode и размер (None, если файла нет)
+Stamp = Optional[Tuple[int, int]]
+
+
+def to_jsonable(value: Any) -> Any:
+    """Значение поля задачи в виде, пригодном для JSON (как в Task.to_dict)"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return value
+
+
+def diff_fields(old_values: Dict[str, Any], task) -> Dict[str, list]:
+    """
+    Изменения полей задачи в виде {поле: [старое, новое]}.
+
+    Args:
+        old_values: Значения полей до изменения
+        task: Задача после изменения
+
+    Returns:
+        Dict[str, list]: Только поля, значение которых изменилось
+    """
+    changes = {}
+    for name, old in old_values.items():
+        old, new = to_jsonable(old), to_jsonable(getattr(task, name))
+        if old != new:
+            changes[name] = [old, new]
+    return changes
+
+
+class HistoryStore:
+    """
+    Постоянная история изменений задач.
+
+    Записи дописываются JSON-строками в файл; для изменений хранятся
+    только затронутые поля парами [старое, новое]. Когда файл превышает
+    max_bytes, он переименовывается в <имя>.<номер><расширение>,
+    и хранится не больше backup_count таких файлов.
+
+    В памяти держатся только индексы — смещения записей по id задачи
+    и по времени, — поэтому выборки «история задачи X» и «изменения
+    после T» читают с диска лишь нужные строки. Индексы строятся
+    при первой выборке: чтобы дописать записи, читать историю
+    не нужно.
+
+    С одним файлом истории могут работать несколько процессов:
+    дописывание и ротация идут под блокировкой fcntl.flock на файле
+    <имя>.lock, а чтение — под разделяемой. Если файл дописал или
+    ротировал другой процесс, индексы строятся заново.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_MAX_BYTES,
+                 backup_count: int = DEFAULT_BACKUP_COUNT):
+        """
+        Args:
+            path: Путь к активному файлу истории (JSON lines)
+            max_bytes: Размер файла в байтах, после которого он ротируется
+            backup_count: Сколько ротированных файлов хранить
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock_path = path.with_name(path.name + ".lock")
+
+        self._lock = threading.RLock()
+        self._file = None
+        # Индексы упорядочены по положению записи, то есть по времени
+        self._locations: List[Location] = []
+        self._timestamps: List[float] = []
+        self._by_task: Dict[str, List[Location]] = {}
+        self._segments: List[int] = []
+        self._indexed = False
+        self._find_segments()
+        # Отпечаток активного файла после нашей последней записи или чтения
+        self._seen: Stamp = self._stamp()
+
+    def __len__(self) -> int:
+        with self._lock, self._locked(shared=True):
+            self._ensure_index()
+            return len(self._locations)
+
+    def append(self, entries: Iterable[dict]) -> None:
+        """Дописать записи одним вызовом записи в файл"""
+        lines = []
+        indexed = []
+        with self._lock, self._locked():
+            self._sync()
+            if self._file is None:
+                self._open_active()
+            # Другие процессы могли дописать файл после нашей записи
+            offset = self._file.seek(0, 2)
+            active = self._segments[-1]
+            for entry in entries:
+                line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+                indexed.append((entry, (active, offset)))
+                lines.append(line)
+                offset += len(line)
+            if not lines:
+                return
+            self._file.write(b"".join(lines))
+            self._file.flush()
+            # Индексируем только после успешной записи; если индексы
+            # ещё не построены, записи попадут в них при построении
+            if self._indexed:
+                for entry, location in indexed:
+                    self._index_entry(entry, location)
+            self._seen = (os.fstat(self._file.fileno()).st_ino, offset)
+            if offset >= self.max_bytes:
+                self._rotate()
+                self._seen = None
+
+    def tail(self, limit: int) -> List[dict]:
+        """Последние limit записей, от старых к новым"""
+        with self._lock, self._locked(shared=True):
+            self._ensure_index()
+            locations = self._locations[-limit:] if limit > 0 else []
+            return self._read(locations)
+
+    def for_task(self, task_id: str, limit: Optional[int] = None) -> List[dict]:
+        """История одной задачи, от старых записей к новым"""
+        with self._lock, self._locked(shared=True):
+            self._ensure_index()
+            locations = self._by_task.get(task_id, [])
+            if limit is not None:
+                locations = locations[-limit:] if limit > 0 else []
+            return self._read(locations)
+
+    def since(self, moment: datetime, limit: Optional[int] = None) -> List[dict]:
+        """Записи, сделанные не раньше moment, от старых к новым"""
+        with self._lock, self._locked(shared=True):
+            self._ensure_index()
+            start = bisect_left(self._timestamps, moment.timestamp())
+            end = len(self._locations) if limit is None else start + limit
+            return self._read(self._locations[start:end])
+
+    def clear(self) -> None:
+        """Удалить всю историю вместе с файлами"""
+        with self._lock, self._locked():
+            self._sync()
+            self._close_file()
+            for segment in self._segments:
+                self._segment_path(segment).unlink(missing_ok=True)
+            self._locations.clear()
+            self._timestamps.clear()
+            self._by_task.clear()
+            self._segments = [self._segments[-1]]
+            self._indexed = True
+            self._seen = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_file()
+
+    @contextmanager
+    def _locked(self, shared: bool = False):
+        """Блокировка файла истории между процессами"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _stamp(self) -> Stamp:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size
+
+    def _sync(self) -> None:
+        """Забыть индексы и открытый файл, если историю менял другой процесс"""
+        if self._stamp() == self._seen:
+            return
+        # После чужой ротации наш файл — уже не активный
+        self._close_file()
+        self._locations.clear()
+        self._timestamps.clear()
+        self._by_task.clear()
+        self._indexed = False
+        self._find_segments()
+
+    def _index_entry(self, entry: dict, location: Location) -> None:
+        self._locations.append(location)
+        self._timestamps.append(datetime.fromisoformat(entry["timestamp"]).timestamp())
+        self._by_task.setdefault(entry["task_id"], []).append(location)
+
+    def _read(self, locations: List[Location]) -> List[dict]:
+        if self._file is not None:
+            self._file.flush()
+        entries = []
+        files = {}
+        try:
+            for segment, offset in locations:
+                f = files.get(segment)
+                if f is None:
+                    f = files[segment] = open(self._segment_path(segment), "rb")
+                f.seek(offset)
+                entries.append(json.loads(f.readline()))
+        finally:
+            for f in files.values():
+                f.close()
+        return entries
+
+    def _segment_path(self, segment: int) -> Path:
+        # Активный файл — последний сегмент, он лежит по основному пути
+        if segment == self._segments[-1]:
+            return self.path
+        return self.path.with_name(f"{self.path.stem}.{segment}{self.path.suffix}")
+
+    def _rotate(self) -> None:
+        self._close_file()
+        active = self._segments[-1]
+        self.path.replace(self.path.with_name(f"{self.path.stem}.{active}{self.path.suffix}"))
+        self._segments.append(active + 1)
+
+        while len(self._segments) - 1 > self.backup_count:
+            self._drop_segment(self._segments[0])
+
+    def _drop_segment(self, segment: int) -> None:
+        self._segment_path(segment).unlink(missing_ok=True)
+        self._segments.pop(0)
+        # Записи удаляемого файла — самые старые, они в начале индексов
+        boundary = (segment + 1, 0)
+        cut = bisect_left(self._locations, boundary)
+        del self._locations[:cut]
+        del self._timestamps[:cut]
+        for task_id in list(self._by_task):
+            locations = self._by_task[task_id]
+            cut = bisect_left(locations, boundary)
+            if cut == len(locations):
+                del self._by_task[task_id]
+            elif cut:
+                del locations[:cut]
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open_active(self) -> None:
+        """Открыть активный файл для дописывания, отрезав недописанную строку"""
+        f = open(self.path, "a+b")
+        try:
+            size = f.seek(0, 2)
+            if size:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    # Сбой посреди записи: ищем конец последней целой строки
+                    position = size
+                    while position > 0:
+                        step = min(64 * 1024, position)
+                        f.seek(position - step)
+                        chunk = f.read(step)
+                        newline = chunk.rfind(b"\n")
+                        if newline != -1:
+                            position = position - step + newline + 1
+                            break
+                        position -= step
+                    f.truncate(position)
+            f.seek(0, 2)
+        except BaseException:
+            f.close()
+            raise
+        self._file = f
+
+    def _find_segments(self) -> None:
+        pattern = f"{self.path.stem}.*{self.path.suffix}"
+        rotated = []
+        for candidate in self.path.parent.glob(pattern):
+            number = candidate.name[len(self.path.stem) + 1:len(candidate.name) - len(self.path.suffix)]
+            if number.isdigit():
+                rotated.append(int(number))
+        rotated.sort()
+        self._segments = rotated + [rotated[-1] + 1 if rotated else 0]
+
+    def _ensure_index(self) -> None:
+        self._sync()
+        if self._indexed:
+            return
+        self._indexed = True
+        if self._file is not None:
+            self._file.flush()
+        for segment in self._segments:
+            path = self._segment_path(segment)
+            if not path.exists():
+                continue
+            with open(path, "r+b") as f:
+                while True:
+                    offset = f.tell()
+                    line = f.readline()
+                    if not line:
+                        break
+                    try:
+                        self._index_entry(json.loads(line), (segment, offset))
+                    except ValueError:
+                        # Недописанная строка после сбоя
+                        f.truncate(offset)
+                        break
+        self._seen = self._stamp()
@@ -0,0 +1,163 @@
+import functools
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+# Верхние границы корзин гистограммы, секунд: от 1 мкс до ~34 с, шаг x2
+BUCKET_BOUNDS: List[float] = [1e-6 * 2 ** i for i in range(26)]
+PERCENTILES = (50, 90, 99)
+
+
+class Histogram:
+    """
+    Гистограмма длительностей с логарифмическими корзинами.
+
+    Хранит только счётчики по корзинам, сумму, минимум и максимум,
+    поэтому память не зависит от числа замеров. Перцентили
+    оцениваются по верхней границе корзины.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        # Последняя корзина — всё, что больше последней границы
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+
+    def percentile(self, percent: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = self.count * percent / 100
+        seen = 0
+        for position, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                bound = BUCKET_BOUNDS[position] if position < len(BUCKET_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        result = {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+        for percent in PERCENTILES:
+            result[f"p{percent}"] = self.percentile(percent)
+        result["buckets"] = {
+            (f"{BUCKET_BOUNDS[i]:.6g}" if i < len(BUCKET_BOUNDS) else "inf"): count
+            for i, count in enumerate(self.buckets) if count
+        }
+        return result
+
+
+class Metrics:
+    """
+    Сборщик метрик: гистограммы длительностей и счётчики.
+
+    Имена задаются строками с префиксом по виду метрики:
+    «op.add», «observer.LoggerObserver», «strategy.Deadline»,
+    «event.task_added». Потокобезопасен.
+    """
+
+    def __init__(self):
+        self._timings: Dict[str, Histogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Записать длительность операции"""
+        with self._lock:
+            histogram = self._timings.get(name)
+            if histogram is None:
+                histogram = self._timings[name] = Histogram()
+            histogram.record(seconds)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Увеличить счётчик"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def timer(self, name: str) -> '_Timer':
+        """
+        Контекстный менеджер для замера блока кода.
+
+        Example:
+            with metrics.timer("op.export"):
+                storage.export(tasks, path)
+        """
+        return _Timer(self, name)
+
+    def snapshot(self) -> dict:
+        """
+        Текущие значения метрик.
+
+        Returns:
+            dict: {"timings": {имя: сводка гистограммы},
+                   "counters": {имя: значение}}
+        """
+        with self._lock:
+            return {
+                "timings": {name: histogram.snapshot()
+                            for name, histogram in sorted(self._timings.items())},
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def reset(self) -> None:
+        """Обнулить все метрики"""
+        with self._lock:
+            self._timings.clear()
+            self._counters.clear()
+
+
+class _Timer:
+    __slots__ = ("_metrics", "_name", "_start")
+
+    def __init__(self, metrics: Metrics, name: str):
+        self._metrics = metrics
+        self._name = name
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._metrics.observe(self._name, perf_counter() - self._start)
+
+
+def timed(operation: str) -> Callable:
+    """
+    Декоратор метода, замеряющий его длительность в self.metrics.
+
+    Если метрики выключены (self.metrics is None), метод вызывается
+    напрямую — накладные расходы сводятся к одной проверке атрибута.
+    """
+    name = f"op.{operation}"
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics: Optional[Metrics] = self.metrics
+            if metrics is None:
+                return method(self, *args, **kwargs)
+            start = perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                metrics.observe(name, perf_counter() - start)
+        return wrapper
+
+    return decorator
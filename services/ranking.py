@@ -0,0 +1,101 @@
+import heapq
+import threading
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from models.task import Task
+from strategies.base import PriorityStrategy
+
+# Запись очереди: (-приоритет, порядковый номер задачи, id)
+Entry = Tuple[float, int, str]
+
+
+class RankedQueue:
+    """
+    Поддерживаемая очередь задач по приоритету одной стратегии.
+
+    Хранит двоичную кучу с ленивым удалением: при изменении задачи
+    пересчитывается только её приоритет и в кучу кладётся новая
+    запись, а старая считается устаревшей и отбрасывается при чтении.
+    Приоритеты стратегий зависят от текущей даты, поэтому при смене
+    дня очередь пересчитывается целиком.
+
+    top снимает записи с кучи и возвращает обратно, поэтому
+    параллельные вызовы top сериализуются собственной блокировкой.
+    """
+
+    def __init__(self, strategy: PriorityStrategy, order: Callable[[str], int]):
+        """
+        Args:
+            strategy: Стратегия, по которой ранжируются задачи
+            order: Порядковый номер задачи (для стабильности при равных приоритетах)
+        """
+        self.strategy = strategy
+        self._order = order
+        self._heap: List[Entry] = []
+        self._entries: Dict[str, Entry] = {}
+        self._tasks: Dict[str, Task] = {}
+        self._day = date.today()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """Заново рассчитать приоритеты всех задач"""
+        self._tasks = {task.id: task for task in tasks}
+        self._entries = {task.id: self._entry(task) for task in self._tasks.values()}
+        self._heap = list(self._entries.values())
+        heapq.heapify(self._heap)
+        self._day = date.today()
+
+    def update(self, task: Task) -> None:
+        """Добавить задачу или пересчитать приоритет изменённой"""
+        entry = self._entry(task)
+        self._tasks[task.id] = task
+        self._entries[task.id] = entry
+        heapq.heappush(self._heap, entry)
+        self._compact()
+
+    def remove(self, task_id: str) -> None:
+        """Убрать задачу из очереди"""
+        self._tasks.pop(task_id, None)
+        self._entries.pop(task_id, None)
+        self._compact()
+
+    def top(self, k: int, filter: Optional[Callable[[Task], bool]] = None) -> List[Task]:
+        """
+        Первые k задач по убыванию приоритета.
+
+        Снимает с кучи не больше, чем нужно, и возвращает
+        снятые записи обратно: O(k log n) без фильтра.
+        """
+        with self._lock:
+            if date.today() != self._day:
+                self.rebuild(list(self._tasks.values()))
+
+            result: List[Task] = []
+            taken: List[Entry] = []
+            heap = self._heap
+            while heap and len(result) < k:
+                entry = heapq.heappop(heap)
+                task_id = entry[2]
+                if self._entries.get(task_id) is not entry:
+                    continue  # устаревшая запись
+                taken.append(entry)
+                task = self._tasks[task_id]
+                if filter is None or filter(task):
+                    result.append(task)
+
+            for entry in taken:
+                heapq.heappush(heap, entry)
+            return result
+
+    def _entry(self, task: Task) -> Entry:
+        return (-self.strategy.calculate_priority(task), self._order(task.id), task.id)
+
+    def _compact(self) -> None:
+        # Не даём устаревшим записям разрастись больше живых
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
@@ -0,0 +1,102 @@
+import threading
+from contextlib import contextmanager
+
+
+class RWLock:
+    """
+    Блокировка «много читателей — один писатель».
+
+    Читатели работают параллельно, писатель получает эксклюзивный
+    доступ. Ожидающий писатель не пропускает новых читателей,
+    поэтому поток чтений не может задержать запись навсегда.
+
+    Блокировка реентерабельна: поток может повторно взять ту,
+    которую уже держит, а писатель может читать. Повысить чтение
+    до записи нельзя — два таких читателя ждали бы друг друга.
+
+    Example:
+        lock = RWLock()
+        with lock.read():
+            ...
+        with lock.write():
+            ...
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0  # потоки, держащие чтение
+        self._writer = None  # идентификатор потока-писателя
+        self._write_depth = 0
+        self._waiting_writers = 0
+        self._local = threading.local()  # глубина чтения текущего потока
+
+    @contextmanager
+    def read(self):
+        """Разделяемая блокировка на время блока"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """Эксклюзивная блокировка на время блока"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def reading(self) -> bool:
+        """Держит ли текущий поток блокировку чтения"""
+        return getattr(self._local, "depth", 0) > 0
+
+    def acquire_read(self) -> None:
+        if self._writer == threading.get_ident():
+            # Чтение внутри записи — просто ещё один уровень записи
+            self._write_depth += 1
+            return
+        depth = getattr(self._local, "depth", 0)
+        if not depth:
+            with self._condition:
+                while self._writer is not None or self._waiting_writers:
+                    self._condition.wait()
+                self._readers += 1
+        self._local.depth = depth + 1
+
+    def release_read(self) -> None:
+        if self._writer == threading.get_ident():
+            self._write_depth -= 1
+            return
+        depth = self._local.depth - 1
+        self._local.depth = depth
+        if not depth:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+        if getattr(self._local, "depth", 0):
+            raise RuntimeError("Нельзя взять запись, удерживая чтение")
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self) -> None:
+        self._write_depth -= 1
+        if not self._write_depth:
+            with self._condition:
+                self._writer = None
+                self._condition.notify_all()
@@ -0,0 +1,111 @@
+import re
+from bisect import bisect_left, insort
+from typing import Dict, FrozenSet, List, Set
+
+from models.task import Task
+
+# Слово — последовательность букв и цифр любого алфавита (включая кириллицу)
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Разбить текст на нормализованные слова.
+
+    Текст приводится к casefold, «ё» заменяется на «е», чтобы
+    «Ёлка» и «елка» считались одним словом.
+    """
+    return TOKEN_RE.findall(text.casefold().replace("ё", "е"))
+
+
+def task_tokens(task: Task) -> FrozenSet[str]:
+    """Слова названия, описания и тегов задачи, по которым она ищется"""
+    text = " ".join((task.title, task.description or "", *task.tags))
+    return frozenset(tokenize(text))
+
+
+class SearchIndex:
+    """
+    Инвертированный индекс по названию, описанию и тегам задач.
+
+    Для каждого слова хранит множество идентификаторов задач,
+    а словарь слов держит отсортированным для поиска по префиксу.
+    Индекс обновляется инкрементально, поэтому запрос стоит
+    пропорционально числу совпадений, а не объёму всех текстов.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._vocabulary: List[str] = []  # отсортированные слова
+        self._task_tokens: Dict[str, FrozenSet[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._task_tokens)
+
+    def add(self, task: Task) -> None:
+        """Проиндексировать задачу (или переиндексировать изменённую)"""
+        tokens = task_tokens(task)
+        old_tokens = self._task_tokens.get(task.id, frozenset())
+        if tokens == old_tokens:
+            return
+
+        for token in old_tokens - tokens:
+            self._unlink(token, task.id)
+        for token in tokens - old_tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                insort(self._vocabulary, token)
+            postings.add(task.id)
+        self._task_tokens[task.id] = tokens
+
+    def remove(self, task_id: str) -> None:
+        """Убрать задачу из индекса"""
+        for token in self._task_tokens.pop(task_id, frozenset()):
+            self._unlink(token, task_id)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._vocabulary.clear()
+        self._task_tokens.clear()
+
+    def search(self, query: str) -> Set[str]:
+        """
+        Найти задачи, содержащие все слова запроса.
+
+        Каждое слово запроса ищется как префикс: «презентац» найдёт
+        и «презентация», и «презентацию».
+
+        Returns:
+            Set[str]: Идентификаторы найденных задач
+        """
+        terms = sorted(set(tokenize(query)), key=len, reverse=True)
+        if not terms:
+            return set(self._task_tokens)
+
+        result = None
+        # Длинные префиксы обычно избирательнее — начинаем с них
+        for term in terms:
+            matches = self._prefix_matches(term)
+            result = matches if result is None else result & matches
+            if not result:
+                return set()
+        return result
+
+    def _prefix_matches(self, prefix: str) -> Set[str]:
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, prefix)
+        matched: Set[str] = set()
+        for position in range(start, len(vocabulary)):
+            token = vocabulary[position]
+            if not token.startswith(prefix):
+                break
+            matched |= self._postings[token]
+        return matched
+
+    def _unlink(self, token: str, task_id: str) -> None:
+        postings = self._postings[token]
+        postings.discard(task_id)
+        if not postings:
+            del self._postings[token]
+            del self._vocabulary[bisect_left(self._vocabulary, token)]
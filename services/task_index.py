@@ -0,0 +1,748 @@
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from models.enums import Priority, TaskStatus
+from models.task import Task
+from storage.base import LazyStorage, QueryableStorage
+
+
+class TaskIndex:
+    """
+    Хранилище задач в памяти с вторичными индексами.
+
+    Держит отображение id -> Task и индексы по статусу, приоритету,
+    тегам и признаку выполнения. Индексы хранят идентификаторы
+    в словарях (упорядоченное множество), поэтому поиск задачи
+    стоит O(1), выборка — O(размер результата), а подсчёт — O(1).
+    Дедлайны незавершённых задач хранятся отсортированными, так что
+    число просроченных находится бинарным поиском.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, Task] = {}
+        self._by_status: Dict[TaskStatus, Dict[str, None]] = {
+            status: {} for status in TaskStatus
+        }
+        self._by_priority: Dict[Priority, Dict[str, None]] = {
+            priority: {} for priority in Priority
+        }
+        self._by_tag: Dict[str, Dict[str, None]] = {}
+        self._completed: Dict[str, None] = {}
+        # (дедлайн, id) незавершённых задач с дедлайном, по возрастанию
+        self._deadlines: List[Tuple[datetime, str]] = []
+        # Ключи, под которыми задача сейчас проиндексирована
+        self._keys: Dict[str, tuple] = {}
+        # Порядковый номер добавления задачи и id по номеру (None на
+        # месте удалённой): номера не переиспользуются до clear()
+        self._order: Dict[str, int] = {}
+        self._sequence: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._tasks
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._tasks.values())
+
+    def values(self):
+        """Представление всех задач в порядке добавления"""
+        return self._tasks.values()
+
+    def loaded(self) -> List[Task]:
+        """Задачи, уже находящиеся в памяти"""
+        return list(self._tasks.values())
+
+    def add(self, task: Task) -> None:
+        """Добавить задачу (или переиндексировать уже добавленную)"""
+        keys = self._index_deadline(task)
+        if task.id in self._tasks:
+            self._unindex(task.id)
+        else:
+            self._number(task.id)
+        self._tasks[task.id] = task
+        self._index_keys(task.id, keys)
+
+    def remove(self, task_id: str) -> Optional[Task]:
+        """Удалить задачу из хранилища и всех индексов"""
+        if task_id not in self._tasks:
+            return None
+        task = self._tasks.pop(task_id)
+        self._unindex(task_id)
+        self._sequence[self._order.pop(task_id)] = None
+        return task
+
+    def restore(self, task: Task, number: Optional[int]) -> None:
+        """
+        Вернуть удалённую задачу под её прежним номером (откат удаления).
+
+        Args:
+            task: Удалённая задача
+            number: Номер задачи до удаления (см. number); без него
+                или если номер уже занят, задача добавляется в конец
+        """
+        if (number is None or task.id in self._tasks
+                or number >= len(self._sequence) or self._sequence[number] is not None):
+            self.add(task)
+            return
+        keys = self._index_deadline(task)
+        self._sequence[number] = task.id
+        self._order[task.id] = number
+        tasks = self._tasks
+        tasks[task.id] = task
+        if number < len(self._sequence) - 1:
+            # Словарь задач хранит порядок добавления — восстанавливаем его
+            ordered = [(task_id, tasks[task_id]) for task_id in self._sequence
+                       if task_id is not None]
+            tasks.clear()
+            tasks.update(ordered)
+        self._index_keys(task.id, keys)
+
+    def reindex(self, task: Task) -> None:
+        """
+        Обновить индексы после изменения задачи.
+
+        Задача перемещается только между теми корзинами,
+        ключи которых действительно изменились.
+        """
+        if task.id not in self._tasks:
+            return
+        old_keys = self._keys[task.id]
+        new_keys = self._make_keys(task)
+        if old_keys == new_keys:
+            return
+
+        old_status, old_priority, old_completed, old_tags, old_deadline = old_keys
+        status, priority, completed, tags, deadline = new_keys
+        if old_deadline != deadline:
+            # Первым: вставка может не удаться, и тогда индекс не тронут
+            self._add_deadline(deadline, task.id)
+            self._drop_deadline(old_deadline, task.id)
+        if old_status != status:
+            del self._by_status[old_status][task.id]
+            self._by_status[status][task.id] = None
+        if old_priority != priority:
+            del self._by_priority[old_priority][task.id]
+            self._by_priority[priority][task.id] = None
+        if old_completed != completed:
+            if completed:
+                self._completed[task.id] = None
+            else:
+                del self._completed[task.id]
+        if old_tags != tags:
+            for tag in old_tags:
+                if tag not in tags:
+                    self._drop_tag(tag, task.id)
+            for tag in tags:
+                self._by_tag.setdefault(tag, {})[task.id] = None
+        self._keys[task.id] = new_keys
+
+    def clear(self) -> None:
+        self._tasks.clear()
+        for bucket in self._by_status.values():
+            bucket.clear()
+        for bucket in self._by_priority.values():
+            bucket.clear()
+        self._by_tag.clear()
+        self._completed.clear()
+        self._deadlines.clear()
+        self._keys.clear()
+        self._order.clear()
+        self._sequence.clear()
+
+    def get(self, task_id: str) -> Optional[Task]:
+        return self._tasks.get(task_id)
+
+    def by_status(self, status: TaskStatus) -> List[Task]:
+        return self._resolve(self._by_status.get(TaskStatus(status), {}))
+
+    def by_priority(self, priority: Priority) -> List[Task]:
+        return self._resolve(self._by_priority.get(Priority(priority), {}))
+
+    def by_tag(self, tag: str) -> List[Task]:
+        return self._resolve(self._by_tag.get(tag, {}))
+
+    def completed(self) -> List[Task]:
+        return self._resolve(self._completed)
+
+    def incomplete(self) -> List[Task]:
+        completed = self._completed
+        return self._resolve(task_id for task_id in self._tasks
+                             if task_id not in completed)
+
+    def overdue(self, now: datetime) -> List[Task]:
+        position = self._overdue_position(now)
+        return self.ordered(task_id for _, task_id in self._deadlines[:position])
+
+    def count_by_status(self, status: TaskStatus) -> int:
+        return len(self._by_status.get(TaskStatus(status), ()))
+
+    def count_by_priority(self, priority: Priority) -> int:
+        return len(self._by_priority.get(Priority(priority), ()))
+
+    def count_completed(self) -> int:
+        return len(self._completed)
+
+    def count_overdue(self, now: datetime) -> int:
+        return self._overdue_position(now)
+
+    def _overdue_position(self, now: datetime) -> int:
+        # Просрочены задачи с дедлайном строго раньше now
+        return bisect_left(self._deadlines, (now, ""))
+
+    def order(self, task_id: str) -> int:
+        """Порядковый номер добавления задачи"""
+        return self._order[task_id]
+
+    def number(self, task_id: str) -> Optional[int]:
+        """Номер задачи, если он уже выдан, без построения индексов"""
+        return self._order.get(task_id)
+
+    def ordered(self, task_ids: Iterable[str]) -> List[Task]:
+        """Задачи с данными id в порядке добавления"""
+        return self._resolve(sorted(task_ids, key=self._order.__getitem__))
+
+    def page(self, after: int, limit: int,
+             filter: Optional[Callable[[Task], bool]] = None,
+             task_ids: Optional[Iterable[str]] = None) -> Tuple[List[Task], Optional[int]]:
+        """
+        Страница задач в порядке добавления после номера after.
+
+        Номера задач не переиспользуются, поэтому номер последней
+        задачи страницы служит курсором следующей: добавления
+        и удаления между запросами не сдвигают страницы.
+
+        Args:
+            after: Номер, после которого начинается страница (-1 — с начала)
+            limit: Размер страницы
+            filter: Функция-фильтр задач (опционально)
+            task_ids: Искать только среди этих задач (например,
+                результатов поиска) вместо просмотра всех подряд
+
+        Returns:
+            Tuple: Задачи страницы и курсор следующей страницы
+                (None, если страница неполная и дальше задач нет)
+        """
+        if task_ids is not None:
+            order = self._order
+            numbers = sorted(number for number in map(order.get, task_ids)
+                             if number is not None and number > after)
+        else:
+            numbers = range(after + 1, len(self._sequence))
+
+        sequence = self._sequence
+        tasks: List[Task] = []
+        last = after
+        for number in numbers:
+            task_id = sequence[number]
+            if task_id is None:
+                continue
+            task = self.get(task_id)
+            if filter is None or filter(task):
+                tasks.append(task)
+                last = number
+                if len(tasks) == limit:
+                    return tasks, last
+        return tasks, None
+
+    def _number(self, task_id: str) -> None:
+        """Выдать задаче следующий порядковый номер"""
+        self._order[task_id] = len(self._sequence)
+        self._sequence.append(task_id)
+
+    def _resolve(self, ids: Iterable[str]) -> List[Task]:
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in ids]
+
+    @staticmethod
+    def _make_keys(task: Task) -> tuple:
+        return (
+            TaskStatus(task.status),
+            Priority(task.priority),
+            bool(task.completed),
+            tuple(dict.fromkeys(task.tags or ())),
+            # В индексе дедлайнов только незавершённые задачи
+            None if task.completed else task.deadline,
+        )
+
+    def _index_deadline(self, task: Task) -> tuple:
+        """
+        Ключи задачи с уже вставленным дедлайном.
+
+        Вызывается до любых изменений индекса: если ключи не строятся
+        или дедлайн не сравнивается с остальными, индекс остаётся прежним.
+        """
+        keys = self._make_keys(task)
+        self._add_deadline(keys[4], task.id)
+        return keys
+
+    def _index_keys(self, task_id: str, keys: tuple) -> None:
+        """Разложить id по корзинам; дедлайн добавляет вызывающий"""
+        status, priority, completed, tags, _ = keys
+        self._by_status[status][task_id] = None
+        self._by_priority[priority][task_id] = None
+        if completed:
+            self._completed[task_id] = None
+        for tag in tags:
+            self._by_tag.setdefault(tag, {})[task_id] = None
+        self._keys[task_id] = keys
+
+    def _unindex(self, task_id: str) -> None:
+        status, priority, completed, tags, deadline = self._keys.pop(task_id)
+        self._by_status[status].pop(task_id, None)
+        self._by_priority[priority].pop(task_id, None)
+        if completed:
+            self._completed.pop(task_id, None)
+        for tag in tags:
+            self._drop_tag(tag, task_id)
+        self._drop_deadline(deadline, task_id)
+
+    def _add_deadline(self, deadline: Optional[datetime], task_id: str) -> None:
+        if deadline is not None:
+            insort(self._deadlines, (deadline, task_id))
+
+    def _drop_deadline(self, deadline: Optional[datetime], task_id: str) -> None:
+        if deadline is not None:
+            del self._deadlines[bisect_left(self._deadlines, (deadline, task_id))]
+
+    def _drop_tag(self, tag: str, task_id: str) -> None:
+        bucket = self._by_tag.get(tag)
+        if bucket is not None:
+            bucket.pop(task_id, None)
+            if not bucket:
+                del self._by_tag[tag]
+
+
+class LazyTaskIndex(TaskIndex):
+    """
+    TaskIndex, который читает задачи из LazyStorage по требованию.
+
+    При создании ничего не загружается: число задач и задача по id
+    берутся из хранилища напрямую, а добавленные и удалённые задачи
+    запоминаются отдельно. При первой выборке индексы строятся
+    по ключевым полям (LazyStorage.iter_keys) без создания объектов
+    Task — на месте ещё не прочитанной задачи
+    в отображении лежит None. Полная задача читается при обращении
+    и остаётся в памяти; если нужна значительная часть непрочитанных
+    задач, они читаются одним проходом по хранилищу.
+    """
+
+    def __init__(self, storage: LazyStorage,
+                 on_load: Optional[Callable[[Task], None]] = None):
+        """
+        Args:
+            storage: Хранилище, из которого читаются задачи
+            on_load: Вызывается для каждой прочитанной задачи
+        """
+        super().__init__()
+        self.storage = storage
+        self._on_load = on_load
+        self._built = False
+        # Задачи, прочитанные или добавленные до построения индексов
+        self._early: Dict[str, Task] = {}
+        # id задач, добавленных и удалённых до построения индексов
+        self._added: Dict[str, None] = {}
+        self._removed: Set[str] = set()
+        # Сколько задач в индексе ещё не прочитано
+        self._unloaded = 0
+
+    def __len__(self) -> int:
+        if not self._built:
+            if not self._added and not self._removed:
+                return self.storage.count()
+            self._ensure()
+        return len(self._tasks)
+
+    def __contains__(self, task_id: str) -> bool:
+        if not self._built:
+            return self.get(task_id) is not None
+        return task_id in self._tasks
+
+    def __iter__(self) -> Iterator[Task]:
+        return self.values()
+
+    def values(self) -> Iterator[Task]:
+        """
+        Все задачи в порядке добавления.
+
+        Индексы строятся, а непрочитанные задачи загружаются только
+        при начале обхода, поэтому передать values() туда, где оно
+        может не понадобиться (Storage.save_changes), ничего не стоит.
+        """
+        return self._iter_all()
+
+    def loaded(self) -> List[Task]:
+        early = list(self._early.values())
+        return early + [task for task in self._tasks.values() if task is not None]
+
+    def add(self, task: Task) -> None:
+        if not self._built:
+            self._early[task.id] = task
+            self._added[task.id] = None
+            self._removed.discard(task.id)
+            return
+        unloaded = self._tasks.get(task.id, 0) is None
+        super().add(task)
+        if unloaded:
+            self._unloaded -= 1
+
+    def remove(self, task_id: str) -> Optional[Task]:
+        if not self._built:
+            task = self.get(task_id)
+            if task is not None:
+                del self._early[task_id]
+                self._added.pop(task_id, None)
+                self._removed.add(task_id)
+            return task
+        if self._tasks.get(task_id, 0) is None:
+            self._unloaded -= 1
+        return super().remove(task_id)
+
+    def reindex(self, task: Task) -> None:
+        # До построения индексов перекладывать нечего: ключи уже
+        # прочитанных задач при построении берутся из самих задач
+        if self._built:
+            super().reindex(task)
+
+    def clear(self) -> None:
+        """Оставить индекс пустым, не читая хранилище"""
+        super().clear()
+        self._early.clear()
+        self._added.clear()
+        self._removed.clear()
+        self._unloaded = 0
+        self._built = True
+
+    def reset(self) -> None:
+        """Забыть прочитанное; следующее обращение снова пойдёт в хранилище"""
+        self.clear()
+        self._built = False
+
+    def get(self, task_id: str) -> Optional[Task]:
+        if not self._built:
+            if task_id in self._removed:
+                return None
+            task = self._early.get(task_id)
+            if task is None:
+                task = self._read(task_id)
+                if task is not None:
+                    self._early[task_id] = task
+            return task
+
+        task = self._tasks.get(task_id)
+        if task is None and task_id in self._tasks:
+            task = self._read(task_id)
+            if task is not None:
+                self._tasks[task_id] = task
+                self._unloaded -= 1
+        return task
+
+    def by_status(self, status: TaskStatus) -> List[Task]:
+        self._ensure()
+        return super().by_status(status)
+
+    def by_priority(self, priority: Priority) -> List[Task]:
+        self._ensure()
+        return super().by_priority(priority)
+
+    def by_tag(self, tag: str) -> List[Task]:
+        self._ensure()
+        return super().by_tag(tag)
+
+    def completed(self) -> List[Task]:
+        self._ensure()
+        return super().completed()
+
+    def incomplete(self) -> List[Task]:
+        self._ensure()
+        return super().incomplete()
+
+    def overdue(self, now: datetime) -> List[Task]:
+        self._ensure()
+        return super().overdue(now)
+
+    def count_by_status(self, status: TaskStatus) -> int:
+        self._ensure()
+        return super().count_by_status(status)
+
+    def count_by_priority(self, priority: Priority) -> int:
+        self._ensure()
+        return super().count_by_priority(priority)
+
+    def count_completed(self) -> int:
+        self._ensure()
+        return super().count_completed()
+
+    def count_overdue(self, now: datetime) -> int:
+        self._ensure()
+        return super().count_overdue(now)
+
+    def order(self, task_id: str) -> int:
+        self._ensure()
+        return super().order(task_id)
+
+    def ordered(self, task_ids: Iterable[str]) -> List[Task]:
+        self._ensure()
+        return super().ordered(task_ids)
+
+    def page(self, after: int, limit: int,
+             filter: Optional[Callable[[Task], bool]] = None,
+             task_ids: Optional[Iterable[str]] = None) -> Tuple[List[Task], Optional[int]]:
+        self._ensure()
+        return super().page(after, limit, filter, task_ids)
+
+    def _resolve(self, ids: Iterable[str]) -> List[Task]:
+        tasks = self._tasks
+        if not self._unloaded:
+            return [tasks[task_id] for task_id in ids]
+
+        ids = list(ids)
+        missing = [task_id for task_id in ids if tasks[task_id] is None]
+        # Чтение по одной — бинарный поиск на задачу; когда нужно
+        # много задач, дешевле один проход по всему хранилищу
+        if len(missing) * 4 > self._unloaded:
+            self._load_all()
+        else:
+            for task_id in missing:
+                self.get(task_id)
+        return [tasks[task_id] for task_id in ids]
+
+    def _ensure(self) -> None:
+        """Построить индексы по ключевым полям, если ещё не построены"""
+        if self._built:
+            return
+        self._built = True
+        early = self._early
+        removed = self._removed
+        deadlines = self._deadlines
+        for task_id, status, priority, completed, tags, deadline in self.storage.iter_keys():
+            if task_id in removed:
+                continue
+            self._number(task_id)
+            task = early.get(task_id)
+            if task is not None:
+                keys = self._make_keys(task)
+            else:
+                self._unloaded += 1
+                keys = (status, priority, completed, tuple(dict.fromkeys(tags)),
+                        None if completed else deadline)
+            self._tasks[task_id] = task
+            self._index_keys(task_id, keys)
+            if keys[4] is not None:
+                deadlines.append((keys[4], task_id))
+        deadlines.sort()
+        # Добавленные задачи, которых ещё нет в хранилище, — в конец
+        for task_id in self._added:
+            if task_id not in self._tasks:
+                TaskIndex.add(self, early[task_id])
+        early.clear()
+        self._added.clear()
+        removed.clear()
+
+    def _iter_all(self) -> Iterator[Task]:
+        self._ensure()
+        if self._unloaded:
+            self._load_all()
+        yield from self._tasks.values()
+
+    def _load_all(self) -> None:
+        """Прочитать все непрочитанные задачи одним проходом"""
+        tasks = self._tasks
+        on_load = self._on_load
+        for task in self.storage.iter_load():
+            if tasks.get(task.id, 0) is None:
+                tasks[task.id] = task
+                self._unloaded -= 1
+                if on_load is not None:
+                    on_load(task)
+
+    def _read(self, task_id: str) -> Optional[Task]:
+        task = self.storage.read_task(task_id)
+        if task is not None and self._on_load is not None:
+            self._on_load(task)
+        return task
+
+
+class StorageTaskIndex:
+    """
+    Источник задач для режима pushdown.
+
+    Повторяет интерфейс TaskIndex, но ничего не держит в памяти:
+    все выборки выполняет само хранилище (например, SQL-запросами
+    в SQLiteStorage). Изменения попадают в хранилище через
+    Storage.save_changes, поэтому вне пакета add/remove/reindex
+    здесь пустые.
+
+    Пока открыт пакет (begin_batch), изменения ещё не записаны,
+    поэтому индекс помнит затронутые пакетом задачи и накладывает
+    их на ответы хранилища: повторный get возвращает тот же объект,
+    добавленные задачи видны, удалённые — нет, а счётчики
+    поправляются на разницу. Задачи, изменённые или добавленные
+    в пакете, в выборках идут после остальных.
+    """
+
+    def __init__(self, storage: QueryableStorage):
+        self.storage = storage
+        # Задачи открытого пакета: id -> задача (None — удалена);
+        # None вне пакета
+        self._pending: Optional[Dict[str, Optional[Task]]] = None
+        # Ключи TaskIndex тех же задач в хранилище (None — её там нет)
+        self._stored: Dict[str, Optional[tuple]] = {}
+
+    def begin_batch(self) -> None:
+        """Начать накапливать задачи пакета"""
+        self._pending = {}
+        self._stored = {}
+
+    def end_batch(self) -> None:
+        """Забыть задачи пакета после сохранения или отката"""
+        self._pending = None
+        self._stored = {}
+
+    def __len__(self) -> int:
+        return self._count(self.storage.count(), lambda keys: True)
+
+    def __contains__(self, task_id: str) -> bool:
+        return self.get(task_id) is not None
+
+    def __iter__(self) -> Iterator[Task]:
+        return self.values()
+
+    def values(self) -> Iterator[Task]:
+        if not self._pending:
+            return self.storage.iter_tasks()
+        return self._iter_merged(dict(self._pending))
+
+    def _iter_merged(self, pending: Dict[str, Optional[Task]]) -> Iterator[Task]:
+        # Хранилище читается, только если обход действительно начат
+        for task in self.storage.iter_tasks():
+            if task.id not in pending:
+                yield task
+        for task in pending.values():
+            if task is not None:
+                yield task
+
+    def add(self, task: Task) -> None:
+        if self._pending is not None:
+            self._remember_stored(task.id)
+            self._pending[task.id] = task
+
+    def remove(self, task_id: str) -> Optional[Task]:
+        if self._pending is not None:
+            self._remember_stored(task_id)
+            self._pending[task_id] = None
+        return None
+
+    def restore(self, task: Task, number: Optional[int]) -> None:
+        self.add(task)
+
+    def number(self, task_id: str) -> Optional[int]:
+        return None
+
+    def reindex(self, task: Task) -> None:
+        if self._pending is not None and task.id in self._pending:
+            self._pending[task.id] = task
+
+    def clear(self) -> None:
+        pass
+
+    def get(self, task_id: str) -> Optional[Task]:
+        pending = self._pending
+        if pending is None:
+            return self.storage.get_task(task_id)
+        if task_id in pending:
+            return pending[task_id]
+        task = self.storage.get_task(task_id)
+        if task is not None:
+            # Дальше в пакете меняется именно этот объект
+            self._stored[task_id] = TaskIndex._make_keys(task)
+            pending[task_id] = task
+        return task
+
+    def search(self, query: str) -> List[Task]:
+        from services.search_index import task_tokens, tokenize
+
+        terms = set(tokenize(query))
+
+        def matches(task: Task) -> bool:
+            words = task_tokens(task)
+            return all(any(word.startswith(term) for word in words) for term in terms)
+
+        return self._merge(self.storage.search(query), matches)
+
+    def by_status(self, status: TaskStatus) -> List[Task]:
+        status = TaskStatus(status)
+        return self._merge(self.storage.find_by_status(status),
+                           lambda task: task.status == status)
+
+    def by_priority(self, priority: Priority) -> List[Task]:
+        priority = Priority(priority)
+        return self._merge(self.storage.find_by_priority(priority),
+                           lambda task: task.priority == priority)
+
+    def by_tag(self, tag: str) -> List[Task]:
+        return self._merge(self.storage.find_by_tag(tag), lambda task: tag in task.tags)
+
+    def completed(self) -> List[Task]:
+        return self._merge(self.storage.find_by_completed(True),
+                           lambda task: bool(task.completed))
+
+    def incomplete(self) -> List[Task]:
+        return self._merge(self.storage.find_by_completed(False),
+                           lambda task: not task.completed)
+
+    def overdue(self, now: datetime) -> List[Task]:
+        return self._merge(self.storage.find_overdue(now),
+                           lambda task: _overdue(TaskIndex._make_keys(task), now))
+
+    def count_by_status(self, status: TaskStatus) -> int:
+        status = TaskStatus(status)
+        return self._count(self.storage.count_by_status(status),
+                           lambda keys: keys[0] == status)
+
+    def count_by_priority(self, priority: Priority) -> int:
+        priority = Priority(priority)
+        return self._count(self.storage.count_by_priority(priority),
+                           lambda keys: keys[1] == priority)
+
+    def count_completed(self) -> int:
+        return self._count(self.storage.count_completed(), lambda keys: keys[2])
+
+    def count_overdue(self, now: datetime) -> int:
+        return self._count(self.storage.count_overdue(now),
+                           lambda keys: _overdue(keys, now))
+
+    def _remember_stored(self, task_id: str) -> None:
+        """Запомнить ключи задачи в хранилище до её первого изменения в пакете"""
+        if task_id not in self._stored:
+            task = self.storage.get_task(task_id)
+            self._stored[task_id] = None if task is None else TaskIndex._make_keys(task)
+
+    def _merge(self, found: Iterable[Task], match: Callable[[Task], bool]) -> List[Task]:
+        """Наложить задачи пакета на выборку хранилища"""
+        pending = self._pending
+        if not pending:
+            return list(found)
+        tasks = [task for task in found if task.id not in pending]
+        tasks.extend(task for task in pending.values()
+                     if task is not None and match(task))
+        return tasks
+
+    def _count(self, stored: int, match: Callable[[tuple], bool]) -> int:
+        """Поправить счётчик хранилища на изменения пакета"""
+        if not self._pending:
+            return stored
+        for task_id, task in self._pending.items():
+            old = self._stored.get(task_id)
+            if old is not None and match(old):
+                stored -= 1
+            if task is not None and match(TaskIndex._make_keys(task)):
+                stored += 1
+        return stored
+
+
+def _overdue(keys: tuple, now: datetime) -> bool:
+    # В ключах дедлайн есть только у незавершённых задач
+    return keys[4] is not None and keys[4] < now
@@ -1,45 +1,250 @@
-from typing import List, Dict
+import functools
+import heapq
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-from storage.base import Storage
+from storage.base import Change, ConflictError, LazyStorage, QueryableStorage, Storage
 from models.task import Task
 from observers.base import Observer
+from observers.dispatcher import BLOCK, AsyncDispatcher
 from datetime import datetime
 from pathlib import Path
 from models.enums import Priority, TaskStatus
 from typing import Callable
 
-from storage.csv_storage import CSVStorage
-from storage.json_storage import JSONStorage
+from strategies.base import PriorityStrategy
+from services.history import HistoryStore, diff_fields
+from services.metrics import Metrics, timed
+from services.ranking import RankedQueue
+from services.rwlock import RWLock
+from services.search_index import SearchIndex
+from services.task_index import LazyTaskIndex, StorageTaskIndex, TaskIndex
+
+
+def _reader(method):
+    """Выполнить метод TaskManager под блокировкой чтения."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._reading():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _writer(method):
+    """Выполнить метод TaskManager под блокировкой записи."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.write():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+@dataclass
+class _Batch:
+    """Отложенные действия открытой пакетной операции"""
+    changes: List[Change] = field(default_factory=list)
+    history: List[Dict] = field(default_factory=list)
+    events: List[Tuple[str, dict]] = field(default_factory=list)
+    undo: List[Callable[[], None]] = field(default_factory=list)
+    depth: int = 0
 
 
 class TaskManager:
     """
     Основной менеджер задач, реализующий паттерн
     Наблюдатель. Управляет задачами и уведомлениями наблюдателей.
+
+    Менеджер можно использовать из нескольких потоков: выборки,
+    поиск, сортировка и статистика выполняются параллельно под
+    блокировкой чтения и видят согласованное состояние, а изменения
+    и пакеты сериализуются блокировкой записи. Наблюдатели
+    вызываются под блокировкой записи. Возвращаемые задачи — живые
+    объекты: менять их следует только через методы менеджера.
+    В режиме lazy чтение догружает задачи, поэтому там
+    все операции выполняются по одной.
     """
 
-    def __init__(self, storage: Storage):
+    def __init__(self, storage: Storage, pushdown: bool = False,
+                 history: Optional[HistoryStore] = None,
+                 metrics: Optional[Metrics] = None, lazy: bool = False,
+                 autosave: bool = True):
         """
         Инициализировать TaskManager.
 
         Аргументы:
         storage (Storage): Экземпляр Storage для сохранения задач.
+        pushdown (bool): Не загружать задачи в память, а выполнять
+            выборки и поиск в хранилище (нужен QueryableStorage,
+            например SQLiteStorage).
+        history (HistoryStore, optional): Хранилище истории изменений.
+            По умолчанию <имя файла хранилища>.history.jsonl рядом с ним.
+        metrics (Metrics, optional): Сборщик метрик; без него
+            замеры не выполняются (см. enable_metrics).
+        lazy (bool): Не загружать задачи при создании, а читать их
+            из хранилища по мере обращения (нужен LazyStorage,
+            например BinaryStorage). Подходит для коротких команд,
+            которым нужны одна задача или счётчики.
+        autosave (bool): Сохранять каждое изменение сразу. Если False,
+            изменения копятся в памяти и записываются одним вызовом
+            save_pending (так делает AsyncTaskManager); запись в историю
+            и уведомления наблюдателей откладываются до записи, а при
+            неудачной записи изменения откатываются.
         """
+        if pushdown and lazy:
+            raise ValueError("Режимы pushdown и lazy несовместимы")
+        if pushdown and not isinstance(storage, QueryableStorage):
+            raise ValueError("Режим pushdown требует QueryableStorage")
+        if lazy and not isinstance(storage, LazyStorage):
+            raise ValueError("Режим lazy требует LazyStorage")
+
         self.storage: Storage = storage
-        self.tasks: List[Task] = []
+        self.pushdown = pushdown
+        self.lazy = lazy
+        if pushdown:
+            self._index = StorageTaskIndex(storage)
+        elif lazy:
+            self._index = LazyTaskIndex(storage, on_load=self._on_task_loaded)
+        else:
+            self._index = TaskIndex()
+        # В режиме pushdown поиск выполняет хранилище, а в режиме
+        # lazy индекс поиска строится при первом поиске
+        self._search: Optional[SearchIndex] = (
+            None if pushdown or lazy else SearchIndex()
+        )
+        # Поддерживаемые очереди приоритетов: стратегия -> очередь
+        self._rankings: Dict[PriorityStrategy, RankedQueue] = {}
         self.observers: List[Observer] = []
-        self.history: List[Dict] = []
+        if history is None:
+            # Своя история у каждого файла хранилища, даже в одной папке
+            path = storage.file_path
+            history = HistoryStore(path.with_name(f"{path.name}.history.jsonl"))
+        self.history: HistoryStore = history
+        self._batch: Optional[_Batch] = None
+        # Откат одиночного изменения вне пакета, если его не удалось сохранить
+        self._undo: List[Callable[[], None]] = []
+        self.autosave = autosave
+        # Изменения, ещё не записанные в хранилище (при autosave=False),
+        # с их записями истории, событиями и откатом
+        self._unsaved = _Batch()
+        self._lock = RWLock()
+        # Растёт при каждом изменении набора задач (см. version)
+        self._version = 0
+        self.dispatcher: Optional[AsyncDispatcher] = None
+        self.metrics: Optional[Metrics] = None
+        self._io_baseline = (0, 0)
+        if metrics is not None:
+            self.enable_metrics(metrics)
 
         self._load_tasks()
 
+    @property
+    def version(self) -> int:
+        """
+        Номер состояния задач.
+
+        Меняется при каждом изменении, откате пакета и перезагрузке,
+        поэтому по нему можно проверить, изменилось ли что-нибудь
+        с прошлого чтения (например, для ETag). Как и другие чтения,
+        сначала перечитывает задачи, если хранилище изменил другой
+        процесс. Номер действует только внутри процесса: новый
+        менеджер снова начинает с 1.
+        """
+        with self._reading():
+            return self._version
+
+    @property
+    def tasks(self) -> List[Task]:
+        """Список всех задач (копия, в порядке добавления)."""
+        with self._lock.write() if self.lazy else self._lock.read():
+            return list(self._index.values())
+
+    @timed("load")
     def _load_tasks(self) -> None:
         """Загрузить существующие задачи из хранилища."""
+        if self.pushdown:
+            return
+        if self.lazy:
+            try:
+                # Проверяем заголовок хранилища, не читая задачи
+                len(self._index)
+            except Exception as e:
+                print(f"Error loading tasks: {e}")
+                self._index.clear()
+            return
         try:
-            self.tasks = self.storage.load()
+            self._replace_tasks(self.storage.iter_load())
         except Exception as e:
             print(f"Error loading tasks: {e}")
-            self.tasks = []
+            self._replace_tasks([])
 
+    def _replace_tasks(self, tasks: Iterable[Task]) -> None:
+        """
+        Заменить все задачи и перестроить индексы.
+
+        Задачи принимаются по одной, поэтому потоковая загрузка
+        не собирает промежуточный список.
+        """
+        self._version += 1
+        for task in self._index.loaded():
+            task.remove_listener(self._on_task_changed)
+        self._index.clear()
+        if self._search is not None:
+            self._search.clear()
+        for ranking in self._rankings.values():
+            ranking.rebuild(())
+        try:
+            for task in tasks:
+                self._attach(task)
+        except Exception:
+            # Не оставляем частично загруженное состояние
+            self._replace_tasks(())
+            raise
+
+    def _attach(self, task: Task, number: Optional[int] = None) -> None:
+        """
+        Добавить задачу в индекс и подписаться на её изменения.
+
+        С number задача возвращается на прежнее место (откат удаления).
+        Всё или ничего: если задача не добавилась в один из индексов,
+        она убирается из остальных и исключение пробрасывается дальше.
+        """
+        if number is None:
+            self._index.add(task)
+        else:
+            self._index.restore(task, number)
+        try:
+            if self._search is not None:
+                self._search.add(task)
+            for ranking in self._rankings.values():
+                ranking.update(task)
+        except Exception:
+            self._detach(task)
+            raise
+        task.add_listener(self._on_task_changed)
+
+    def _detach(self, task: Task) -> None:
+        """Убрать задачу из индекса и отписаться от её изменений."""
+        task.remove_listener(self._on_task_changed)
+        self._index.remove(task.id)
+        if self._search is not None:
+            self._search.remove(task.id)
+        for ranking in self._rankings.values():
+            ranking.remove(task.id)
+
+    def _on_task_loaded(self, task: Task) -> None:
+        """Вызывается LazyTaskIndex для каждой прочитанной задачи."""
+        task.add_listener(self._on_task_changed)
+
+    def _on_task_changed(self, task: Task) -> None:
+        """Вызывается задачей после update/mark_* — поддерживает индексы."""
+        self._index.reindex(task)
+        if self._search is not None:
+            self._search.add(task)
+        for ranking in self._rankings.values():
+            ranking.update(task)
+
+    @_writer
     def add_observer(self, observer: Observer) -> None:
         """
         Добавить наблюдателя.
@@ -50,6 +255,7 @@ class TaskManager:
         if observer not in self.observers:
             self.observers.append(observer)
 
+    @_writer
     def remove_observer(self, observer: Observer) -> None:
         """
         Удалить наблюдателя.
@@ -68,12 +274,125 @@ class TaskManager:
         event (str): Название события.
         data (dict): Данные события.
         """
+        if self.dispatcher is not None:
+            self.dispatcher.submit(event, data)
+            return
+
+        metrics = self.metrics
         for observer in self.observers:
             try:
-                observer.update(event, data)
+                if metrics is None:
+                    observer.update(event, data)
+                else:
+                    with metrics.timer(f"observer.{type(observer).__name__}"):
+                        observer.update(event, data)
+            except Exception as e:
+                print(f"Observer error: {e}")
+
+    def _publish(self, events: List[Tuple[str, dict]]) -> None:
+        """Уведомить наблюдателей о пачке событий."""
+        if self.dispatcher is not None:
+            for event, data in events:
+                self.dispatcher.submit(event, data)
+        elif events:
+            self._deliver(events)
+
+    def _deliver(self, events: List[Tuple[str, dict]]) -> None:
+        """Доставить пачку событий каждому наблюдателю."""
+        metrics = self.metrics
+        for observer in list(self.observers):
+            try:
+                if metrics is None:
+                    observer.update_batch(events)
+                else:
+                    with metrics.timer(f"observer.{type(observer).__name__}"):
+                        observer.update_batch(events)
             except Exception as e:
                 print(f"Observer error: {e}")
 
+    def start_dispatcher(self, maxsize: int = 10_000, policy: str = BLOCK,
+                         batch_size: int = 100) -> AsyncDispatcher:
+        """
+        Включить асинхронную доставку событий наблюдателям.
+
+        События ставятся в ограниченную очередь и доставляются пачками
+        из фонового потока (см. AsyncDispatcher).
+
+        Аргументы:
+        maxsize (int): Максимальная длина очереди.
+        policy (str): Политика при заполненной очереди:
+            'block', 'drop_oldest' или 'coalesce'.
+        batch_size (int): Максимальный размер пачки.
+        """
+        if self.dispatcher is None:
+            self.dispatcher = AsyncDispatcher(
+                self._deliver, maxsize=maxsize, policy=policy,
+                batch_size=batch_size
+            )
+        return self.dispatcher
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Дождаться доставки всех событий наблюдателям.
+
+        Returns:
+            bool: True, если всё доставлено до истечения timeout
+        """
+        if self.dispatcher is None:
+            return True
+        return self.dispatcher.flush(timeout)
+
+    def enable_metrics(self, metrics: Metrics = None) -> Metrics:
+        """
+        Включить сбор метрик.
+
+        Замеряются длительности операций (op.add, op.update, op.delete,
+        op.search, op.sort, op.save, op.load и др.), доставки событий
+        каждому наблюдателю (observer.<класс>) и расчёта приоритетов
+        (strategy.<название>); объём ввода-вывода хранилища считается
+        с момента включения.
+
+        Аргументы:
+        metrics (Metrics, optional): Сборщик метрик (по умолчанию новый).
+
+        Возвращает:
+        Metrics: Включённый сборщик метрик.
+        """
+        self.metrics = metrics if metrics is not None else Metrics()
+        self._io_baseline = (self.storage.bytes_read, self.storage.bytes_written)
+        return self.metrics
+
+    def disable_metrics(self) -> None:
+        """Выключить сбор метрик."""
+        self.metrics = None
+
+    def get_metrics(self) -> dict:
+        """
+        Снимок метрик.
+
+        Возвращает:
+        dict: timings и counters из Metrics.snapshot() и раздел storage
+            с числом прочитанных и записанных хранилищем байт;
+            пустой словарь, если метрики выключены.
+        """
+        if self.metrics is None:
+            return {}
+        snapshot = self.metrics.snapshot()
+        read, written = self._io_baseline
+        snapshot["storage"] = {
+            "bytes_read": self.storage.bytes_read - read,
+            "bytes_written": self.storage.bytes_written - written,
+        }
+        return snapshot
+
+    def stop_dispatcher(self, timeout: float = None) -> None:
+        """Доставить оставшиеся события и вернуться к синхронной доставке."""
+        dispatcher, self.dispatcher = self.dispatcher, None
+        if dispatcher is not None:
+            dispatcher.close(timeout)
+
+    @_writer
+    @timed("add")
     def add_task(self, task: Task) -> bool:
         """
                 Добавляет новую задачу.
@@ -83,22 +402,35 @@ class TaskManager:
 
                 Returns:
                     bool: True если задача добавлена успешно, иначе False
+                        (в том числе если задача с таким id уже есть)
                 """
+        if task.id in self._index:
+            self.notify_observers('error', {
+                'message': f"Задача {task.id} уже существует"
+            })
+            return False
         try:
-            self.tasks.append(task)
+            # Откат регистрируется до _attach: если добавление упадёт
+            # на полпути, _revert уберёт то, что успело попасть в индексы
+            self._on_rollback(lambda: self._detach(task))
+            self._attach(task)
+            if not self._commit([Change("created", task)]):
+                return False
             self._add_to_history("created", task)
-            self.save_tasks()
-            self.notify_observers('task_added', {
+            self._emit('task_added', {
                 'id': task.id,
                 'title': task.title
             })
             return True
         except Exception as e:
+            self._revert()
             self.notify_observers('error', {
                 'message': str(e)
             })
             return False
 
+    @_writer
+    @timed("delete")
     def delete_task(self, task_id: str):
         """
                 Удаляет задачу по идентификатору.
@@ -109,32 +441,41 @@ class TaskManager:
                 Returns:
                     bool: True при успешном удалении, иначе False
                 """
-        try:
-            task = self.get_task(task_id)
+        task = self.get_task(task_id)
+
+        if not task:
+            return False
 
-            self.tasks.remove(task)
+        try:
+            number = self._index.number(task.id)
+            self._detach(task)
+            self._on_rollback(lambda: self._attach(task, number))
+            if not self._commit([Change("deleted", task)]):
+                return False
             self._add_to_history("deleted", task)
-            self.tasks.remove(task)
-            self.notify_observers('task_deleted', {
+            self._emit('task_deleted', {
                 'id': task.id,
                 'title': task.title
             })
             return True
         except Exception as e:
-            self.notify_observer('error', {
+            self._revert()
+            self.notify_observers('error', {
                 'message': str(e)
             })
             return False
 
 
-    def _add_to_history(self, action: str, task: Task, old_state: dict = None):
+    def _add_to_history(self, action: str, task: Task, old_values: dict = None):
         """
                 Добавляет запись в историю изменений.
 
                 Args:
                     action (str): Тип действия (created, updated, deleted и т.д.)
                     task (Task): Задача, над которой выполнено действие
-                    old_state (dict, optional): Предыдущее состояние задачи
+                    old_values (dict, optional): Значения изменённых полей
+                        до действия; в запись попадают только поля,
+                        которые действительно изменились
                 """
         entry = {
             'timestamp': datetime.now().isoformat(),
@@ -142,26 +483,57 @@ class TaskManager:
             'task_id': task.id,
             'task_title': task.title
         }
-        if action == 'updated' and old_state:
-            entry['old_state'] = old_state
-            entry['new_state'] = task.to_dict()
-        self.history.append(entry)
+        if old_values:
+            entry['changes'] = diff_fields(old_values, task)
+        if self._batch is not None:
+            self._batch.history.append(entry)
+        elif not self.autosave:
+            self._unsaved.history.append(entry)
+        else:
+            self.history.append([entry])
 
-    def save_tasks(self):
+    @_writer
+    @timed("save")
+    def save_tasks(self, changes: List[Change] = None):
         """
         Сохраняет текущие задачи в хранилище.
 
+        Args:
+            changes (List[Change], optional): Изменения с прошлого
+                сохранения. Если переданы, хранилище может записать
+                только их; иначе задачи сохраняются целиком.
+
+        Если хранилище обнаружило, что задачи уже изменил другой
+        процесс (ConflictError), наблюдатели получают событие conflict,
+        а задачи перечитываются при следующем обращении.
+
         Returns:
             bool: True при успешном сохранении
         """
         try:
-            self.storage.save(self.tasks)
+            if changes is None:
+                saved = self.storage.save(self.tasks)
+            else:
+                saved = self.storage.save_changes(changes, self._index.values())
+            if not saved:
+                raise IOError("Не удалось сохранить задачи")
+            if changes is None:
+                # Полная запись включает и отложенные изменения
+                unsaved, self._unsaved = self._unsaved, _Batch()
+                self._finish(unsaved)
             self.notify_observers("tasks_saved", {})
             return True
+        except ConflictError as e:
+            self.notify_observers("conflict", {
+                "message": str(e),
+                "task_ids": e.task_ids
+            })
+            return False
         except Exception as e:
-            self.notify_observer("error", {"message": str(e)})
+            self.notify_observers("error", {"message": str(e)})
             return False
 
+    @_reader
     def get_task(self, task_id: str):
         """
                 Получает задачу по идентификатору.
@@ -172,42 +544,52 @@ class TaskManager:
                 Returns:
                     Task | None: Найденная задача или None
                 """
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None
+        return self._index.get(task_id)
 
+    @_reader
     def get_all_tasks(self) -> List[Task]:
         """Получить все задачи"""
-        return self.tasks.copy()
+        return self.tasks
 
+    @_reader
     def get_tasks_by_status(self, status: TaskStatus) -> List[Task]:
         """Получить задачи по статусу"""
-        return [task for task in self.tasks if task.status == status]
+        return self._index.by_status(status)
 
+    @_reader
     def get_tasks_by_priority(self, priority: Priority) -> List[Task]:
         """Получить задачи по приоритету"""
-        return [task for task in self.tasks if task.priority == priority]
+        return self._index.by_priority(priority)
 
+    @_reader
     def get_completed_tasks(self) -> List[Task]:
         """Получить завершённые задачи"""
-        return [task for task in self.tasks if task.complited]
+        return self._index.completed()
 
+    @_reader
     def get_incomplete_tasks(self) -> List[Task]:
         """Получить незавершённые задачи"""
-        return [task for task in self.tasks if not task.complited]
+        return self._index.incomplete()
 
+    @_reader
     def get_overdue_tasks(self) -> List[Task]:
         """Получить просроченные задачи"""
-        return [task for task in self.tasks if task.is_overdue()]
+        return self._index.overdue(datetime.now())
 
+    @_reader
     def get_tasks_by_tag(self, tag: str) -> List[Task]:
         """Получить задачи по тегу"""
-        return [task for task in self.tasks if tag in task.tags ]
+        return self._index.by_tag(tag)
 
+    @_reader
+    @timed("search")
     def search_tasks(self, query: str) -> List[Task]:
         """
-        Поиск задач по названию или описанию
+        Поиск задач по названию, описанию и тегам
+
+        Запрос разбивается на слова; задача подходит, если каждое
+        слово запроса является началом какого-либо её слова
+        (без учёта регистра, «ё» равно «е»).
 
         Args:
             query: Поисковый запрос
@@ -215,13 +597,47 @@ class TaskManager:
         Returns:
             List[Task]: Найденные задачи
         """
-        query_lower = query.lower()
-        results = []
-        for task in self.tasks:
-            if query_lower in task.title.lower() or query_lower in task.description.lower():
-                results.append(task)
-        return results
+        if self.pushdown:
+            return self._index.search(query)
+        return self._index.ordered(self._search_index().search(query))
+
+    def _search_index(self) -> SearchIndex:
+        """Индекс поиска; в режиме lazy строится при первом обращении."""
+        if self._search is None:
+            search = SearchIndex()
+            for task in self._index.values():
+                search.add(task)
+            self._search = search
+        return self._search
+
+    @_reader
+    def page_tasks(self, cursor: Optional[int] = None, limit: int = 50,
+                   filter: Callable[[Task], bool] = None,
+                   query: str = None) -> Tuple[List[Task], Optional[int]]:
+        """
+        Страница задач в порядке добавления.
+
+        Курсор — порядковый номер последней задачи прошлой страницы,
+        поэтому добавления и удаления между запросами не сдвигают
+        страницы. После перезагрузки задач (load_task) номера
+        выдаются заново и старые курсоры теряют смысл.
+
+        Args:
+            cursor: Курсор из прошлого вызова (None — первая страница)
+            limit: Размер страницы
+            filter: Функция-фильтр задач (опционально)
+            query: Только задачи, найденные этим запросом (как search_tasks)
+
+        Returns:
+            Tuple[List[Task], Optional[int]]: Задачи страницы и курсор
+                следующей страницы (None, если дальше задач нет)
+        """
+        if self.pushdown:
+            raise ValueError("Постраничная выборка недоступна в режиме pushdown")
+        task_ids = None if query is None else self._search_index().search(query)
+        return self._index.page(-1 if cursor is None else cursor, limit, filter, task_ids)
 
+    @_reader
     def filter_tasks(self, filter_func: Callable[[Task], bool]) -> List[Task]:
         """
         Универсальная фильтрация задач
@@ -236,8 +652,10 @@ class TaskManager:
         Returns:
             List[Task]: Отфильтрованные задачи
         """
-        return [task for task in self.tasks if filter_func(task)]
+        return [task for task in self._index.values() if filter_func(task)]
 
+    @_reader
+    @timed("sort")
     def sort_tasks(self, tasks=None, strategy=None , reverse=True):
         """
             Сортировка задач с использованием стратегии или по дате создания
@@ -250,19 +668,93 @@ class TaskManager:
             Returns:
                 List[Task]: Отсортированные задачи
             """
-        tasks_to_sort = tasks if tasks is not None else self.tasks
+        tasks_to_sort = tasks if tasks is not None else self._index.values()
 
         if strategy:
-            return sorted(
-                tasks_to_sort,
-                key=lambda task: strategy.calculate_priority(task),
-                reverse=reverse
-            )
+            # Приоритеты считаются одним пакетом, а не по задаче на сравнение
+            tasks_to_sort = list(tasks_to_sort)
+            scores = self._score(strategy, tasks_to_sort)
+            order = sorted(range(len(tasks_to_sort)), key=scores.__getitem__, reverse=reverse)
+            return [tasks_to_sort[i] for i in order]
         else:
             return sorted(tasks_to_sort, key=lambda  task: task.created_at, reverse=reverse)
 
 
 
+    @_reader
+    @timed("top")
+    def top_tasks(self, k: int, strategy: PriorityStrategy = None,
+                  filter: Callable[[Task], bool] = None) -> List[Task]:
+        """
+        Первые k задач по приоритету без полной сортировки.
+
+        Если для стратегии включена поддерживаемая очередь
+        (track_strategy), ответ берётся из неё; иначе выполняется
+        выбор через кучу за O(n log k). Порядок совпадает с
+        sort_tasks(strategy=strategy)[:k].
+
+        Args:
+            k: Сколько задач вернуть
+            strategy: Стратегия приоритизации (без неё — по дате создания)
+            filter: Функция-фильтр задач (опционально)
+
+        Example:
+            # Что делать дальше: три самые важные незавершённые задачи
+            manager.top_tasks(3, strategy, filter=lambda t: not t.completed)
+
+        Returns:
+            List[Task]: Не больше k задач по убыванию приоритета
+        """
+        if k <= 0:
+            return []
+
+        ranking = self._rankings.get(strategy)
+        if ranking is not None:
+            return ranking.top(k, filter)
+
+        tasks = self._index.values()
+        if filter is not None:
+            tasks = [task for task in tasks if filter(task)]
+
+        if strategy:
+            tasks = list(tasks)
+            scores = self._score(strategy, tasks)
+            best = heapq.nlargest(k, range(len(tasks)), key=scores.__getitem__)
+            return [tasks[i] for i in best]
+        return heapq.nlargest(k, tasks, key=lambda task: task.created_at)
+
+    def _score(self, strategy: PriorityStrategy, tasks: List[Task]) -> List[float]:
+        """Рассчитать приоритеты пакетом, замеряя время стратегии."""
+        if self.metrics is None:
+            return strategy.calculate_priorities(tasks)
+        with self.metrics.timer(f"strategy.{strategy.get_name()}"):
+            return strategy.calculate_priorities(tasks)
+
+    @_writer
+    def track_strategy(self, strategy: PriorityStrategy) -> None:
+        """
+        Включить поддерживаемую очередь приоритетов для стратегии.
+
+        После этого top_tasks по этой стратегии не пересчитывает
+        все задачи: при изменении задачи пересчитывается только она.
+
+        Args:
+            strategy: Стратегия приоритизации
+        """
+        if self.pushdown:
+            raise ValueError("Очереди приоритетов недоступны в режиме pushdown")
+        if strategy not in self._rankings:
+            ranking = RankedQueue(strategy, self._index.order)
+            ranking.rebuild(self._index.values())
+            self._rankings[strategy] = ranking
+
+    @_writer
+    def untrack_strategy(self, strategy: PriorityStrategy) -> None:
+        """Отключить поддерживаемую очередь приоритетов для стратегии."""
+        self._rankings.pop(strategy, None)
+
+    @_writer
+    @timed("update")
     def update_task(self, task_id: str, **kwargs) -> bool:
         """
            Обновляет параметры задачи.
@@ -280,20 +772,29 @@ class TaskManager:
             return False
 
         try:
-            old_state = task.to_dict()
+            old_values = {
+                name: getattr(task, name) for name in kwargs if hasattr(task, name)
+            }
+            self._remember(task, tuple(kwargs) + ('updated_at',))
             task.update(**kwargs)
-            self._add_to_history('updated', task, old_state)
-            self.save_tasks()
-            self.notify_observer('task_updated', {
+            if not self._commit([
+                Change('updated', task, tuple(kwargs) + ('updated_at', 'version'))
+            ]):
+                return False
+            self._add_to_history('updated', task, old_values)
+            self._emit('task_updated', {
                 'id': task_id,
                 'title': task.title,
                 'changes': kwargs
             })
             return True
         except Exception as e:
-            self.notify_observer('error', {'message': str(e)})
+            self._revert()
+            self.notify_observers('error', {'message': str(e)})
             return False
 
+    @_writer
+    @timed("complete")
     def complete_task(self, task_id: str) -> bool:
         """
            Отмечает задачу как выполненную.
@@ -309,15 +810,280 @@ class TaskManager:
         if not task:
             return False
 
+        old_values = {'status': task.status, 'completed': task.completed}
+        self._remember(task, ('status', 'completed', 'updated_at'))
         task.mark_completed()
-        self._add_to_history('completed', task)
-        self.save_tasks()
-        self.notify_observer('task_completed', {
+        if not self._commit([
+            Change('completed', task, ('status', 'completed', 'updated_at', 'version'))
+        ]):
+            return False
+        self._add_to_history('completed', task, old_values)
+        self._emit('task_completed', {
             'id': task_id,
             'title': task.title
         })
         return True
 
+    @contextmanager
+    def batch(self):
+        """
+        Пакетная операция с одним групповым сохранением.
+
+        Внутри блока сохранения, записи в историю и уведомления
+        наблюдателей откладываются и выполняются один раз при выходе.
+        Если блок завершился исключением или сохранение не удалось,
+        изменения в памяти откатываются. Вложенные блоки входят
+        во внешний.
+
+        Example:
+            with manager.batch():
+                manager.add_task(task1)
+                manager.complete_task(task2.id)
+
+        Блок выполняется под блокировкой записи: другие потоки
+        не видят промежуточного состояния пакета.
+
+        Raises:
+            IOError: Если не удалось сохранить изменения
+        """
+        with self._lock.write():
+            if self._batch is not None:
+                self._batch.depth += 1
+                try:
+                    yield self
+                finally:
+                    self._batch.depth -= 1
+                return
+
+            self._sync()
+            batch = self._batch = _Batch()
+            if self.pushdown:
+                # Хранилище увидит изменения только при сохранении —
+                # до тех пор их показывает индекс
+                self._index.begin_batch()
+            try:
+                try:
+                    yield self
+                except BaseException:
+                    self._batch = None
+                    self._rollback(batch)
+                    raise
+                self._batch = None
+
+                if batch.changes and not self._save(batch):
+                    self._rollback(batch)
+                    raise IOError("Не удалось сохранить пакет изменений, изменения отменены")
+            finally:
+                if self.pushdown:
+                    self._index.end_batch()
+
+            # Без autosave история и события пакета ждут save_pending
+            if self.autosave or not batch.changes:
+                self._finish(batch)
+
+    def add_tasks(self, tasks: Iterable[Task]) -> int:
+        """
+        Добавляет несколько задач одним пакетом.
+
+        Args:
+            tasks (Iterable[Task]): Задачи для добавления
+
+        Returns:
+            int: Количество добавленных задач (0, если пакет откатился)
+        """
+        return self._run_batch(self.add_task, ((task,) for task in tasks))
+
+    def update_tasks(self, updates: Union[Dict[str, dict], Iterable[Tuple[str, dict]]]) -> int:
+        """
+        Обновляет несколько задач одним пакетом.
+
+        Args:
+            updates: Словарь {task_id: {поле: значение}}
+                или последовательность пар (task_id, изменения)
+
+        Returns:
+            int: Количество обновлённых задач (0, если пакет откатился)
+        """
+        if isinstance(updates, dict):
+            updates = updates.items()
+        return self._run_batch(
+            lambda task_id, changes: self.update_task(task_id, **changes),
+            updates
+        )
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> int:
+        """
+        Удаляет несколько задач одним пакетом.
+
+        Args:
+            task_ids (Iterable[str]): Идентификаторы задач
+
+        Returns:
+            int: Количество удалённых задач (0, если пакет откатился)
+        """
+        return self._run_batch(self.delete_task, ((task_id,) for task_id in task_ids))
+
+    def _run_batch(self, operation: Callable[..., bool], arguments: Iterable[tuple]) -> int:
+        count = 0
+        try:
+            with self.batch():
+                for args in arguments:
+                    if operation(*args):
+                        count += 1
+        except IOError:
+            # Ошибка сохранения уже передана наблюдателям в save_tasks
+            return 0
+        return count
+
+    def _commit(self, changes: List[Change]) -> bool:
+        """
+        Сохранить изменения сразу или отложить до конца пакета.
+
+        Returns:
+            bool: False, если изменения не удалось сохранить
+        """
+        self._version += 1
+        if self._batch is not None:
+            self._batch.changes.extend(changes)
+            return True
+        if self._save(_Batch(changes, undo=self._undo)):
+            self._undo = []
+            return True
+        self._revert()
+        return False
+
+    def _revert(self) -> None:
+        """Откатить в памяти одиночное изменение, которое не сохранилось."""
+        undo, self._undo = self._undo, []
+        if undo:
+            self._version += 1
+        for action in reversed(undo):
+            action()
+
+    def _save(self, batch: _Batch) -> bool:
+        """
+        Сохранить изменения или, без autosave, отложить до save_pending.
+
+        Отложенные изменения уходят в _unsaved вместе с историей,
+        событиями и откатом пакета.
+        """
+        if self.autosave:
+            return self.save_tasks(batch.changes)
+        unsaved = self._unsaved
+        unsaved.changes.extend(batch.changes)
+        unsaved.history.extend(batch.history)
+        unsaved.events.extend(batch.events)
+        unsaved.undo.extend(batch.undo)
+        return True
+
+    def _finish(self, batch: _Batch) -> None:
+        """Записать историю и уведомить наблюдателей о сохранённых изменениях."""
+        self.history.append(batch.history)
+        self._publish(batch.events)
+
+    @_writer
+    def save_pending(self) -> bool:
+        """
+        Записать изменения, отложенные при autosave=False, одним вызовом.
+
+        После записи их история пишется, а наблюдатели получают события.
+        Если запись не удалась, все отложенные изменения откатываются
+        в памяти, как одиночное изменение при autosave=True.
+
+        Returns:
+            bool: True, если всё отложенное записано
+        """
+        if not self._unsaved.changes:
+            return True
+        unsaved, self._unsaved = self._unsaved, _Batch()
+        if not self.save_tasks(unsaved.changes):
+            self._rollback(unsaved)
+            return False
+        self._finish(unsaved)
+        return True
+
+    @property
+    def pending_changes(self) -> int:
+        """Число изменений, ожидающих save_pending."""
+        return len(self._unsaved.changes)
+
+    def _stale(self) -> bool:
+        """Изменил ли хранилище другой процесс (вне пакета)."""
+        # Перечитывание потеряло бы ещё не записанные изменения
+        return (self._batch is None and not self._unsaved.changes and not self.pushdown
+                and self.storage.is_stale())
+
+    def _sync(self) -> None:
+        """Перечитать задачи, если хранилище изменил другой процесс."""
+        if self._stale():
+            self.load_task()
+
+    @contextmanager
+    def _reading(self):
+        """
+        Блокировка для операции чтения.
+
+        Перед чтением задачи перечитываются, если хранилище устарело;
+        в режиме lazy чтение меняет индекс, поэтому берётся запись.
+        """
+        lock = self._lock
+        if self.lazy:
+            with lock.write():
+                self._sync()
+                yield
+            return
+        # Повысить уже взятое чтение до записи нельзя, поэтому
+        # вложенное чтение работает с тем, что видит внешнее
+        if not lock.reading() and self._stale():
+            with lock.write():
+                self._sync()
+        with lock.read():
+            yield
+
+    def _emit(self, event: str, data: dict) -> None:
+        """Уведомить наблюдателей сразу или отложить до конца пакета (или save_pending)."""
+        if self._batch is not None:
+            self._batch.events.append((event, data))
+        elif not self.autosave:
+            self._unsaved.events.append((event, data))
+        else:
+            self.notify_observers(event, data)
+
+    def _on_rollback(self, action: Callable[[], None]) -> None:
+        """Запомнить действие для отката пакета или одиночного изменения."""
+        if self._batch is not None:
+            self._batch.undo.append(action)
+        else:
+            self._undo.append(action)
+
+    def _remember(self, task: Task, fields: Tuple[str, ...]) -> None:
+        """
+        Запомнить значения полей задачи для отката.
+
+        Версия задачи при откате не возвращается, а растёт: иначе
+        следующее изменение получило бы номер несохранённого
+        состояния, и кэши по версии (CachedPriorityStrategy)
+        отдали бы его данные.
+        """
+        old_values = {
+            name: getattr(task, name) for name in fields
+            if hasattr(task, name) and name != 'version'
+        }
+
+        def restore():
+            for name, value in old_values.items():
+                setattr(task, name, value)
+            task.version += 1
+            self._on_task_changed(task)
+
+        self._on_rollback(restore)
+
+    def _rollback(self, batch: _Batch) -> None:
+        self._version += 1
+        for action in reversed(batch.undo):
+            action()
+
+    @_reader
     def get_statistics(self) -> dict:
         """
             Возвращает статистику по задачам.
@@ -329,49 +1095,69 @@ class TaskManager:
             - процент выполнения
             - распределение по приоритетам и статусам
 
+            Счётчики поддерживаются индексом при каждом изменении,
+            а просроченные считаются бинарным поиском по дедлайнам,
+            поэтому вызов не перебирает задачи.
+
             Returns:
                 dict: Статистическая информация по задачам
             """
-        total = len(self.tasks)
-        completed = len(self.get_completed_tasks())
-        uncompleted = total - completed
-        overdue = len(self.get_overdue_tasks())
+        index = self._index
+        total = len(index)
+        completed = index.count_completed()
         return {
             "total": total,
             "completed": completed,
-            "uncompleted": uncompleted,
-            "overdue": overdue,
-            "competion_percent": (completed/total*100) if total else  0,
+            "incomplete": total - completed,
+            "overdue": index.count_overdue(datetime.now()),
+            "completion_rate": round(completed / total * 100, 1) if total else 0,
             "by_priority": {
-                "high":(self.get_tasks_by_priority("high")),
-                "medium":(self.get_tasks_by_priority("medium")),
-                "low":(self.get_tasks_by_priority("low"))
+                priority.value: index.count_by_priority(priority)
+                for priority in Priority
             },
             "by_status": {
-                status: len(self.get_tasks_by_status(status))
-                for status in ["todo", "in_progress", "done", "cancelled"]
+                status.name.lower(): index.count_by_status(status)
+                for status in TaskStatus
             }
         }
 
+    @_writer
+    @timed("load")
     def load_task(self):
         """
            Загружает задачи из хранилища.
 
            Перезаписывает текущий список задач и уведомляет наблюдателей.
+           Изменения, отложенные при autosave=False, отбрасываются.
 
            Returns:
                bool: True при успешной загрузке, иначе False
            """
         try:
-            self.tasks = self.storage.load()
-            self.notify_observer("task_loaded", {
-                "count": len(self.tasks)
+            if self.lazy:
+                self._reset_lazy()
+            elif not self.pushdown:
+                self._replace_tasks(self.storage.iter_load())
+            self._unsaved = _Batch()
+            self.notify_observers("task_loaded", {
+                "count": len(self._index)
             })
             return True
         except Exception as e:
-            self.notify_observer('error', {'message': str(e)})
+            self.notify_observers('error', {'message': str(e)})
             return False
 
+    def _reset_lazy(self) -> None:
+        """Сбросить прочитанные задачи режима lazy."""
+        self._version += 1
+        for task in self._index.loaded():
+            task.remove_listener(self._on_task_changed)
+        self._index.reset()
+        self._search = None
+        for ranking in self._rankings.values():
+            ranking.rebuild(self._index.values())
+
+    @_reader
     def export_tasks(self, format: str, path: Path):
         """
            Экспортирует задачи в файл указанного формата.
@@ -389,28 +1175,79 @@ class TaskManager:
            """
         try:
             if format == "json":
+                from storage.json_storage import JSONStorage
                 storage = JSONStorage(path)
             elif format == "csv":
+                from storage.csv_storage import CSVStorage
                 storage = CSVStorage(path)
             else:
                 raise ValueError(f"Неизвестный формат {format}")
             return storage.export(self.tasks, path)
         except Exception as e:
-            self.notify_observer('error', {'message': str(e)})
+            self.notify_observers('error', {'message': str(e)})
             return False
 
-    def get_history(self, limit: int = 50) -> list[dict]:
+    @_writer
+    def import_tasks(self, path: Path) -> int:
+        """
+           Импортирует задачи из CSV-файла (формат CSVStorage.export).
+
+           Строки разбираются потоково и добавляются одним пакетом
+           с одним сохранением. Некорректные строки и задачи с уже
+           существующими id пропускаются; их номера и причины
+           передаются наблюдателям в событии tasks_imported.
+
+           Args:
+               path (Path): Путь к CSV-файлу
+
+           Returns:
+               int: Количество импортированных задач
+                   (0, если пакет не удалось сохранить)
+           """
+        from storage.csv_storage import CSVStorage
+        storage = CSVStorage(path)
+        duplicates = []
+
+        def new_tasks():
+            for task in storage.iter_load():
+                if task.id in self._index:
+                    duplicates.append((storage.line_num, f"Задача {task.id} уже существует"))
+                else:
+                    yield task
+
+        count = self.add_tasks(new_tasks())
+        self.notify_observers('tasks_imported', {
+            'count': count,
+            'errors': sorted(storage.errors + duplicates)
+        })
+        return count
+
+    def get_history(self, limit: int = 50, task_id: str = None,
+                    since: datetime = None) -> list[dict]:
         """
             Возвращает историю действий над задачами.
 
             Args:
                 limit (int): Максимальное количество записей
+                task_id (str, optional): Только записи об этой задаче
+                since (datetime, optional): Только записи не раньше этого
+                    момента; тогда возвращаются первые limit записей,
+                    иначе последние
 
             Returns:
-                list[dict]: Список записей истории
+                list[dict]: Список записей истории от старых к новым
             """
-        return self.history[-limit:]
-
+        if task_id is not None:
+            if since is None:
+                return self.history.for_task(task_id, limit)
+            entries = [entry for entry in self.history.for_task(task_id)
+                       if datetime.fromisoformat(entry['timestamp']) >= since]
+            return entries[:limit]
+        if since is not None:
+            return self.history.since(since, limit)
+        return self.history.tail(limit)
+
+    @_writer
     def clear_history(self):
         """
            Полностью очищает историю изменений задач.
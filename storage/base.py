@@ -1,13 +1,44 @@
 from abc import ABC, abstractmethod
-from typing import List
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 from models.task import Task
+from models.enums import Priority, TaskStatus
+
+
+@dataclass
+class Change:
+    """Одна мутация задачи, переданная в хранилище"""
+    action: str  # created, updated, completed, deleted
+    task: Task
+    fields: Optional[Tuple[str, ...]] = None  # изменённые поля для updated
+
+    def field_values(self) -> dict:
+        """Сериализованные значения изменённых полей задачи"""
+        data = self.task.to_dict()
+        if self.fields is None:
+            return data
+        return {name: data[name] for name in self.fields if name in data}
+
+
+class ConflictError(IOError):
+    """Задачи изменены в хранилище другим процессом после загрузки"""
+
+    def __init__(self, task_ids: Iterable[str]):
+        self.task_ids = list(task_ids)
+        super().__init__(
+            f"Задачи изменены другим процессом: {', '.join(self.task_ids)}"
+        )
 
 
 class Storage(ABC):
     def __init__(self, file_path: Path):
         self.file_path = file_path
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        # Счётчики объёма ввода-вывода для метрик, в байтах
+        self.bytes_read = 0
+        self.bytes_written = 0
 
     @abstractmethod
     def save(self, tasks: List[Task]) -> bool:
@@ -27,4 +58,138 @@ class Storage(ABC):
         """ Абстрактный метод для экспорта """
         pass
 
+    def iter_load(self) -> Iterator[Task]:
+        """
+        Загружать задачи по одной.
+
+        По умолчанию отдаёт результат load(); хранилища, умеющие
+        читать потоково, переопределяют этот метод.
+        """
+        yield from self.load()
+
+    def save_changes(self, changes: List[Change], tasks: Iterable[Task]) -> bool:
+        """
+        Сохранить набор изменений.
+
+        По умолчанию переписывает все задачи через save(); хранилища,
+        умеющие писать инкрементально, переопределяют этот метод.
+
+        Args:
+            changes: Изменения с момента прошлого сохранения
+            tasks: Все текущие задачи
+        """
+        return self.save(list(tasks))
+
+    def is_stale(self) -> bool:
+        """
+        Изменено ли хранилище извне после последней загрузки.
+
+        По умолчанию хранилища этого не отслеживают и возвращают False;
+        хранилища для нескольких процессов переопределяют метод.
+        """
+        return False
+
+
+class QueryableStorage(Storage):
+    """
+    Хранилище, которое умеет выполнять выборки само.
+
+    TaskManager в режиме pushdown не загружает задачи в память,
+    а передаёт запросы такому хранилищу.
+    """
+
+    @abstractmethod
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """Задача по идентификатору или None"""
+        pass
+
+    @abstractmethod
+    def iter_tasks(self) -> Iterator[Task]:
+        """Все задачи в порядке добавления, без загрузки в память целиком"""
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        """Количество задач"""
+        pass
+
+    @abstractmethod
+    def find_by_status(self, status: TaskStatus) -> List[Task]:
+        """Задачи с данным статусом"""
+        pass
+
+    @abstractmethod
+    def find_by_priority(self, priority: Priority) -> List[Task]:
+        """Задачи с данным приоритетом"""
+        pass
+
+    @abstractmethod
+    def find_by_tag(self, tag: str) -> List[Task]:
+        """Задачи с данным тегом"""
+        pass
+
+    @abstractmethod
+    def find_by_completed(self, completed: bool) -> List[Task]:
+        """Завершённые или незавершённые задачи"""
+        pass
+
+    @abstractmethod
+    def find_overdue(self, now: datetime) -> List[Task]:
+        """Незавершённые задачи с дедлайном раньше now"""
+        pass
+
+    @abstractmethod
+    def search(self, query: str) -> List[Task]:
+        """
+        Задачи, в названии, описании или тегах которых каждое слово
+        query является началом какого-либо слова (как SearchIndex)
+        """
+        pass
+
+    def count_by_status(self, status: TaskStatus) -> int:
+        """Количество задач с данным статусом"""
+        return len(self.find_by_status(status))
+
+    def count_by_priority(self, priority: Priority) -> int:
+        """Количество задач с данным приоритетом"""
+        return len(self.find_by_priority(priority))
 
+    def count_completed(self) -> int:
+        """Количество завершённых задач"""
+        return len(self.find_by_completed(True))
+
+    def count_overdue(self, now: datetime) -> int:
+        """Количество просроченных задач"""
+        return len(self.find_overdue(now))
+
+
+class LazyStorage(Storage):
+    """
+    Хранилище, из которого задачи можно читать по одной.
+
+    TaskManager в режиме lazy не загружает задачи при старте:
+    число задач и задача по id читаются напрямую, а индексы
+    строятся по ключевым полям без создания объектов Task.
+    """
+
+    @abstractmethod
+    def count(self) -> int:
+        """Количество задач"""
+        pass
+
+    @abstractmethod
+    def read_task(self, task_id: str) -> Optional[Task]:
+        """Прочитать одну задачу по идентификатору или None"""
+        pass
+
+    @abstractmethod
+    def iter_keys(self) -> Iterator[Tuple[str, TaskStatus, Priority, bool,
+                                          Tuple[str, ...], Optional[datetime]]]:
+        """
+        Ключевые поля всех задач в порядке хранения.
+
+        Returns:
+            Iterator: Кортежи (id, статус, приоритет, выполнена,
+                теги, дедлайн) — всё, что нужно TaskIndex
+        """
+        pass
@@ -0,0 +1,540 @@
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from storage.base import Change, LazyStorage
+from storage.json_storage import JSONStorage
+from models.compact_task import (
+    NO_DEADLINE, PRIORITIES, PRIORITY_CODES, STATUSES, STATUS_CODES,
+    pack_time, unpack_time,
+)
+from models.enums import Priority, TaskStatus
+from models.task import Task
+
+MAGIC = b"TMBS"
+FORMAT_VERSION = 2
+
+# Заголовок: сигнатура, версия формата, число задач, число строк,
+# число ссылок на теги
+HEADER = struct.Struct("<4sHxxIII")
+# Запись задачи фиксированной ширины. Строки (id, title, description)
+# хранятся номерами в таблице строк; теги — отрезком массива ссылок.
+# Флаги упакованы как в CompactTask: приоритет | статус << 2 | выполнена << 5
+RECORD = struct.Struct("<IIIIHBqqqI")
+STRING_REF = struct.Struct("<I")
+STRING_OFFSET = struct.Struct("<Q")
+
+
+class _Snapshot:
+    """
+    Разобранный снимок поверх mmap или bytes.
+
+    Разделы файла по порядку: заголовок, записи, ссылки на теги,
+    номера записей, отсортированные по id (с версии 2), смещения
+    строк и данные строк. Любое поле читается по смещению,
+    без разбора остального файла.
+    """
+
+    def __init__(self, buffer):
+        if len(buffer) < HEADER.size:
+            raise ValueError("Файл снимка обрезан")
+        magic, version, task_count, string_count, tag_count = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version not in (1, FORMAT_VERSION):
+            raise ValueError("Неизвестный формат снимка")
+
+        self.buffer = buffer
+        self.count = task_count
+        self.string_count = string_count
+        self.records_start = HEADER.size
+        self.tags_start = self.records_start + task_count * RECORD.size
+        self.id_index_start = self.tags_start + tag_count * STRING_REF.size
+        # В версии 1 индекса по id ещё не было
+        self.has_id_index = version >= 2
+        self.offsets_start = self.id_index_start + (
+            task_count * STRING_REF.size if self.has_id_index else 0
+        )
+        self.data_start = self.offsets_start + (string_count + 1) * STRING_OFFSET.size
+        if len(buffer) < self.data_start:
+            raise ValueError("Файл снимка обрезан")
+        (data_size,) = STRING_OFFSET.unpack_from(
+            buffer, self.offsets_start + string_count * STRING_OFFSET.size
+        )
+        if self.data_start + data_size > len(buffer):
+            raise ValueError("Файл снимка обрезан")
+
+    def string(self, index: int) -> str:
+        start, end = struct.unpack_from(
+            "<QQ", self.buffer, self.offsets_start + index * STRING_OFFSET.size
+        )
+        return self.buffer[self.data_start + start:self.data_start + end].decode("utf-8")
+
+    def offsets(self) -> List[int]:
+        return [offset for (offset,) in STRING_OFFSET.iter_unpack(
+            self.buffer[self.offsets_start:self.data_start]
+        )]
+
+    def data(self) -> bytes:
+        """Данные всех строк таблицы одним блоком"""
+        (size,) = STRING_OFFSET.unpack_from(self.buffer, self.data_start - STRING_OFFSET.size)
+        return self.buffer[self.data_start:self.data_start + size]
+
+    def raw_strings(self) -> List[bytes]:
+        """Все строки таблицы в байтах, без декодирования"""
+        offsets = self.offsets()
+        data = self.data()
+        return [data[offsets[index]:offsets[index + 1]]
+                for index in range(self.string_count)]
+
+    def record(self, number: int) -> tuple:
+        return RECORD.unpack_from(self.buffer, self.records_start + number * RECORD.size)
+
+    def raw_record(self, number: int) -> bytes:
+        start = self.records_start + number * RECORD.size
+        return self.buffer[start:start + RECORD.size]
+
+    def records(self) -> Iterator[tuple]:
+        return RECORD.iter_unpack(self.buffer[self.records_start:self.tags_start])
+
+    def raw_tag_refs(self) -> bytes:
+        return self.buffer[self.tags_start:self.id_index_start]
+
+    def tag_refs(self) -> List[int]:
+        return [index for (index,) in STRING_REF.iter_unpack(self.raw_tag_refs())]
+
+    def id_index(self) -> List[int]:
+        return list(struct.unpack_from(f"<{self.count}I", self.buffer, self.id_index_start))
+
+    def find(self, task_id: str) -> Optional[int]:
+        """Номер записи задачи: бинарный поиск по индексу id"""
+        if not self.has_id_index:
+            for number, record in enumerate(self.records()):
+                if self.string(record[0]) == task_id:
+                    return number
+            return None
+
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            (number,) = STRING_REF.unpack_from(
+                self.buffer, self.id_index_start + middle * STRING_REF.size
+            )
+            (id_ref,) = STRING_REF.unpack_from(
+                self.buffer, self.records_start + number * RECORD.size
+            )
+            current = self.string(id_ref)
+            if current == task_id:
+                return number
+            if current < task_id:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def task(self, number: int) -> Task:
+        (id_ref, title_ref, description_ref, tag_start, tags_len, flags,
+         deadline, created_at, updated_at, version) = self.record(number)
+        tag_refs = struct.unpack_from(
+            f"<{tags_len}I", self.buffer, self.tags_start + tag_start * STRING_REF.size
+        )
+        return Task._restore(
+            self.string(title_ref),
+            self.string(description_ref),
+            PRIORITIES[flags & 0b11],
+            None if deadline == NO_DEADLINE else unpack_time(deadline),
+            STATUSES[(flags >> 2) & 0b111],
+            bool(flags >> 5),
+            self.string(id_ref),
+            unpack_time(created_at),
+            unpack_time(updated_at),
+            [self.string(index) for index in tag_refs],
+            version,
+        )
+
+    def tasks(self) -> Iterator[Task]:
+        strings = [value.decode("utf-8") for value in self.raw_strings()]
+        tag_refs = self.tag_refs()
+
+        # Одинаковые метки времени (например, created_at == updated_at
+        # у неизменённых задач) превращаются в datetime один раз
+        times = {NO_DEADLINE: None}
+        missing = object()
+
+        # Значения записаны из Task, поэтому повторная проверка не нужна
+        restore = Task._restore
+        for (id_ref, title_ref, description_ref, tag_start, tags_len, flags,
+             deadline, created_at, updated_at, version) in self.records():
+            moments = []
+            for micros in (deadline, created_at, updated_at):
+                value = times.get(micros, missing)
+                if value is missing:
+                    value = times[micros] = unpack_time(micros)
+                moments.append(value)
+            yield restore(
+                strings[title_ref],
+                strings[description_ref],
+                PRIORITIES[flags & 0b11],
+                moments[0],
+                STATUSES[(flags >> 2) & 0b111],
+                bool(flags >> 5),
+                strings[id_ref],
+                moments[1],
+                moments[2],
+                [strings[index] for index in tag_refs[tag_start:tag_start + tags_len]]
+                if tags_len else [],
+                version,
+            )
+
+    def keys(self) -> Iterator[tuple]:
+        """Ключевые поля задач; названия и описания не декодируются"""
+        offsets = self.offsets()
+        data = self.data()
+        tag_refs = self.tag_refs()
+        tags: Dict[int, str] = {}
+        times = {NO_DEADLINE: None}
+        missing = object()
+
+        for (id_ref, _, _, tag_start, tags_len, flags,
+             deadline, _, _, _) in self.records():
+            moment = times.get(deadline, missing)
+            if moment is missing:
+                moment = times[deadline] = unpack_time(deadline)
+            task_tags = ()
+            if tags_len:
+                refs = tag_refs[tag_start:tag_start + tags_len]
+                for index in refs:
+                    if index not in tags:
+                        tags[index] = data[offsets[index]:offsets[index + 1]].decode("utf-8")
+                task_tags = tuple(tags[index] for index in refs)
+            yield (
+                data[offsets[id_ref]:offsets[id_ref + 1]].decode("utf-8"),
+                STATUSES[(flags >> 2) & 0b111],
+                PRIORITIES[flags & 0b11],
+                bool(flags >> 5),
+                task_tags,
+                moment,
+            )
+
+
+class _Writer:
+    """
+    Сборка снимка: записи, ссылки на теги и таблица строк.
+
+    Если передан base, его таблица строк и ссылки на теги переносятся
+    как есть, а новые строки дописываются в конец таблицы.
+    """
+
+    def __init__(self, base: Optional[_Snapshot] = None):
+        self.records = bytearray()
+        self.ids: List[str] = []
+        self.strings: List[bytes] = []
+        # Повторы ищутся только среди строк, добавленных этим писателем
+        self.refs: Dict[str, int] = {}
+        if base is None:
+            self.base_count = 0
+            self.base_offsets = b""
+            self.base_data = b""
+            self.tag_refs = bytearray()
+        else:
+            self.base_count = base.string_count
+            self.base_offsets = base.buffer[base.offsets_start:
+                                            base.data_start - STRING_OFFSET.size]
+            self.base_data = base.data()
+            self.tag_refs = bytearray(base.raw_tag_refs())
+
+    @property
+    def string_count(self) -> int:
+        return self.base_count + len(self.strings)
+
+    @property
+    def live_strings(self) -> int:
+        """Оценка сверху числа строк, на которые ссылаются записи"""
+        return (3 * len(self.records) // RECORD.size
+                + len(self.tag_refs) // STRING_REF.size)
+
+    def ref(self, value: str) -> int:
+        index = self.refs.get(value)
+        if index is None:
+            index = self.refs[value] = self.string_count
+            self.strings.append(value.encode("utf-8"))
+        return index
+
+    def pack(self, task: Task) -> bytes:
+        """Запись задачи; её строки и теги добавляются в таблицы"""
+        tag_start = len(self.tag_refs) // STRING_REF.size
+        for tag in task.tags:
+            self.tag_refs += STRING_REF.pack(self.ref(tag))
+        return RECORD.pack(
+            self.ref(task.id),
+            self.ref(task.title),
+            self.ref(task.description),
+            tag_start,
+            len(task.tags),
+            PRIORITY_CODES[task.priority]
+            | STATUS_CODES[task.status] << 2
+            | int(bool(task.completed)) << 5,
+            pack_time(task.deadline) if task.deadline else NO_DEADLINE,
+            pack_time(task.created_at),
+            pack_time(task.updated_at),
+            task.version,
+        )
+
+    def add_task(self, task: Task) -> None:
+        self.records += self.pack(task)
+        self.ids.append(task.id)
+
+    def add_raw(self, task_id: str, record: bytes) -> None:
+        self.records += record
+        self.ids.append(task_id)
+
+    def build(self, id_index: Optional[List[int]] = None) -> bytes:
+        """
+        Args:
+            id_index: Номера записей, упорядоченные по id; по умолчанию
+                строится сортировкой id, переданных в add_task/add_raw
+        """
+        if id_index is None:
+            ids = self.ids
+            id_index = sorted(range(len(ids)), key=ids.__getitem__)
+        offsets = bytearray(self.base_offsets)
+        position = len(self.base_data)
+        for value in self.strings:
+            offsets += STRING_OFFSET.pack(position)
+            position += len(value)
+        offsets += STRING_OFFSET.pack(position)
+
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, len(self.records) // RECORD.size,
+                             self.string_count, len(self.tag_refs) // STRING_REF.size)
+        return b"".join((header, self.records, self.tag_refs,
+                         struct.pack(f"<{len(id_index)}I", *id_index),
+                         offsets, self.base_data, *self.strings))
+
+
+class BinaryStorage(LazyStorage):
+    """
+    Хранилище в компактном бинарном снимке.
+
+    Файл состоит из заголовка, массива записей фиксированной ширины,
+    массива ссылок на теги, индекса записей по id и таблицы строк
+    без повторов (смещения и данные в UTF-8). Метки времени хранятся
+    целыми числами микросекунд, поэтому при загрузке нет разбора
+    ISO-строк и JSON. Файл читается через mmap, а пишется атомарно
+    (временный файл и os.replace).
+
+    Подходит для режима lazy TaskManager: число задач берётся
+    из заголовка, задача по id находится бинарным поиском,
+    а save_changes переносит записи неизменённых задач байт в байт,
+    не создавая объектов Task.
+
+    Для обмена данными остаётся JSON: export пишет JSON-массив.
+    """
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        self._snapshot: Optional[_Snapshot] = None
+        self._mapping: Optional[mmap.mmap] = None
+        self._stamp = None
+
+    def save(self, tasks: List[Task]) -> bool:
+        """Записать все задачи в новый снимок"""
+        try:
+            writer = _Writer()
+            for task in tasks:
+                writer.add_task(task)
+            self._write(writer.build())
+            return True
+        except Exception:
+            return False
+
+    def save_changes(self, changes: List[Change], tasks: Iterable[Task]) -> bool:
+        """
+        Записать снимок с учётом изменений.
+
+        Записи неизменённых задач и старая таблица строк копируются
+        как есть; заново кодируются только затронутые задачи, а их
+        строки дописываются в конец таблицы. Когда устаревших строк
+        становится больше, чем живых, снимок пересобирается из tasks.
+        """
+        if not changes:
+            return True
+        try:
+            snapshot = self._current()
+            if snapshot is None or not snapshot.has_id_index:
+                return self.save(list(tasks))
+
+            # Для каждой задачи важно только её последнее состояние
+            latest: Dict[str, Change] = {}
+            for change in changes:
+                latest.pop(change.task.id, None)
+                latest[change.task.id] = change
+
+            # Несколько задач находим бинарным поиском, для большого
+            # пакета дешевле один проход по всем записям
+            if len(latest) * 8 < snapshot.count:
+                writer, id_index = self._patch(snapshot, latest)
+            else:
+                writer, id_index = self._rewrite(snapshot, latest), None
+
+            if writer.string_count > 2 * writer.live_strings + 1024:
+                return self.save(list(tasks))
+            self._write(writer.build(id_index))
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _patch(snapshot: _Snapshot, latest: Dict[str, Change]) -> Tuple[_Writer, List[int]]:
+        """Заменить записи изменённых задач на месте"""
+        writer = _Writer(snapshot)
+        records = writer.records = bytearray(
+            snapshot.buffer[snapshot.records_start:snapshot.tags_start]
+        )
+        deleted: List[int] = []
+        created: List[Task] = []
+        for task_id, change in latest.items():
+            number = snapshot.find(task_id)
+            if change.action == "deleted":
+                if number is not None:
+                    deleted.append(number)
+            elif number is None:
+                created.append(change.task)
+            else:
+                start = number * RECORD.size
+                records[start:start + RECORD.size] = writer.pack(change.task)
+
+        id_index = snapshot.id_index()
+        if deleted:
+            deleted.sort()
+            for number in reversed(deleted):
+                del records[number * RECORD.size:(number + 1) * RECORD.size]
+            gone = set(deleted)
+            id_index = [number - bisect_left(deleted, number)
+                        for number in id_index if number not in gone]
+
+        if created:
+            def task_id_of(number: int) -> str:
+                (ref,) = STRING_REF.unpack_from(records, number * RECORD.size)
+                if ref < writer.base_count:
+                    return snapshot.string(ref)
+                return writer.strings[ref - writer.base_count].decode("utf-8")
+
+            for task in created:
+                number = len(records) // RECORD.size
+                records += writer.pack(task)
+                id_index.insert(bisect_left(id_index, task.id, key=task_id_of), number)
+        return writer, id_index
+
+    @staticmethod
+    def _rewrite(snapshot: _Snapshot, latest: Dict[str, Change]) -> _Writer:
+        """Пройти по всем записям, перенося неизменённые байт в байт"""
+        offsets = snapshot.offsets()
+        data = snapshot.data()
+        writer = _Writer(snapshot)
+        for number, record in enumerate(snapshot.records()):
+            id_ref = record[0]
+            task_id = data[offsets[id_ref]:offsets[id_ref + 1]].decode("utf-8")
+            change = latest.pop(task_id, None)
+            if change is None:
+                writer.add_raw(task_id, snapshot.raw_record(number))
+            elif change.action != "deleted":
+                writer.add_task(change.task)
+        for change in latest.values():
+            if change.action != "deleted":
+                writer.add_task(change.task)
+        return writer
+
+    def load(self) -> List[Task]:
+        """Загрузить задачи; при повреждённом файле — пустой список"""
+        try:
+            return list(self.iter_load())
+        except ValueError:
+            return []
+
+    def iter_load(self) -> Iterator[Task]:
+        """
+        Отдавать задачи по одной из отображённого в память файла.
+
+        Raises:
+            ValueError: Если файл не является снимком BinaryStorage
+        """
+        if not self.file_path.exists() or self.file_path.stat().st_size == 0:
+            return
+
+        with open(self.file_path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            self.bytes_read += len(view)
+            yield from _Snapshot(view).tasks()
+
+    def export(self, tasks, export_path):
+        """Экспорт задач в JSON-массив (формат JSONStorage)"""
+        return JSONStorage(export_path).export(tasks, export_path)
+
+    def count(self) -> int:
+        snapshot = self._current()
+        return snapshot.count if snapshot is not None else 0
+
+    def read_task(self, task_id: str) -> Optional[Task]:
+        snapshot = self._current()
+        if snapshot is None:
+            return None
+        number = snapshot.find(task_id)
+        return snapshot.task(number) if number is not None else None
+
+    def iter_keys(self) -> Iterator[Tuple[str, TaskStatus, Priority, bool,
+                                          Tuple[str, ...], Optional[datetime]]]:
+        snapshot = self._current()
+        return snapshot.keys() if snapshot is not None else iter(())
+
+    def close(self) -> None:
+        """Освободить отображение файла в память"""
+        self._snapshot = None
+        self._stamp = None
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def _current(self) -> Optional[_Snapshot]:
+        """
+        Снимок из текущего файла.
+
+        Файл отображается заново, если его заменили (save или другой
+        процесс) — это видно по inode, размеру и времени изменения.
+
+        Raises:
+            ValueError: Если файл не является снимком BinaryStorage
+        """
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            self.close()
+            return None
+        stamp = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if stamp == self._stamp:
+            return self._snapshot
+
+        self.close()
+        if stat.st_size == 0:
+            return None
+        with open(self.file_path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._snapshot = _Snapshot(mapping)
+        except ValueError:
+            mapping.close()
+            raise
+        self._mapping = mapping
+        self._stamp = stamp
+        return self._snapshot
+
+    def _write(self, data: bytes) -> None:
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # Старое отображение больше не нужно; новое создастся по требованию
+        self.close()
+        os.replace(tmp_path, self.file_path)
+        self.bytes_written += len(data)
@@ -1,20 +1,81 @@
 import csv
-from typing import List
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
 from pathlib import Path
 from storage.base import Storage
 from models.task import Task
+from models.enums import Priority, TaskStatus
+
+# В экспорте перечисления записаны по имени (HIGH), в таблицах
+# встречаются и значения (high) — принимаем оба варианта
+PRIORITY_LOOKUP = {
+    **{priority.name.casefold(): priority for priority in Priority},
+    **{priority.value.casefold(): priority for priority in Priority},
+}
+STATUS_LOOKUP = {
+    **{status.name.casefold(): status for status in TaskStatus},
+    **{status.value.casefold(): status for status in TaskStatus},
+}
+TRUE_VALUES = {"true", "1", "yes", "да"}
+FALSE_VALUES = {"false", "0", "no", "нет", ""}
 
 
 class CSVStorage(Storage):
-    """Экспорт задач в CSV формате"""
+    """Экспорт и импорт задач в CSV формате"""
+
+    def __init__(self, file_path: Path):
+        super().__init__(file_path)
+        # Ошибки последней загрузки: (номер строки, описание)
+        self.errors: List[Tuple[int, str]] = []
+        # Номер строки последней отданной iter_load задачи
+        self.line_num = 0
 
     def save(self, tasks: List[Task]) -> bool:
         """CSV используется только для экспорта, не для основного хранения"""
         return self.export(tasks, self.file_path)
 
     def load(self) -> List[Task]:
-        """Загрузка из CSV не поддерживается в текущей версии"""
-        return []
+        """Загрузить все корректные строки CSV-файла (см. iter_load)"""
+        return list(self.iter_load())
+
+    def iter_load(self) -> Iterator[Task]:
+        """
+        Потоковая загрузка задач из CSV-файла.
+
+        Строки читаются и разбираются по одной. Обязателен только
+        столбец title; остальные столбцы экспорта необязательны.
+        Некорректные строки пропускаются, а их номера и причины
+        записываются в self.errors — импорт не прерывается.
+        Если файл не существует — ничего не отдаёт.
+        """
+        self.errors = []
+        self.line_num = 0
+        if not self.file_path.exists():
+            return
+
+        with self.file_path.open("r", newline="", encoding="utf-8-sig") as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, None)
+            if header is None:
+                return
+            columns = {name.strip(): position for position, name in enumerate(header)}
+            if "title" not in columns:
+                self.errors.append((1, "Нет столбца title"))
+                return
+
+            try:
+                for row in reader:
+                    if not any(row):
+                        continue
+                    try:
+                        task = self._row_task(row, columns)
+                    except (ValueError, KeyError, IndexError) as e:
+                        self.errors.append((reader.line_num, str(e)))
+                        continue
+                    self.line_num = reader.line_num
+                    yield task
+            finally:
+                self.bytes_read += csvfile.buffer.tell()
 
     def export(self, tasks: List[Task], export_path: Path) -> bool:
         """
@@ -60,9 +121,53 @@ class CSVStorage(Storage):
                         "updated_at": task.updated_at.isoformat() if task.updated_at else "",
                         "tags": ",".join(task.tags) if task.tags else "",
                     })
+                self.bytes_written += csvfile.tell()
 
             return True
 
         except Exception as e:
             print(f"CSV export failed: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    @staticmethod
+    def _row_task(row: List[str], columns: dict) -> Task:
+        def get(name: str) -> str:
+            position = columns.get(name)
+            if position is None or position >= len(row):
+                return ""
+            return row[position].strip()
+
+        priority = get("priority")
+        status = get("status")
+        completed = get("completed").casefold()
+        if completed not in TRUE_VALUES and completed not in FALSE_VALUES:
+            raise ValueError(f"Некорректное значение completed: {completed!r}")
+        tags = get("tags")
+        fields = {
+            "title": get("title"),
+            "description": get("description"),
+            "priority": _lookup(PRIORITY_LOOKUP, priority, Priority.MEDIUM, "priority"),
+            "status": _lookup(STATUS_LOOKUP, status, TaskStatus.TODO, "status"),
+            "completed": completed in TRUE_VALUES,
+            "deadline": _parse_time(get("deadline")),
+            "tags": [tag.strip() for tag in tags.split(",") if tag.strip()],
+        }
+        # Пустые id и метки времени Task сгенерирует сам
+        for name in ("id", "created_at", "updated_at"):
+            value = get(name)
+            if value:
+                fields[name] = value if name == "id" else _parse_time(value)
+        return Task(**fields)
+
+
+def _lookup(mapping: dict, value: str, default, name: str):
+    if not value:
+        return default
+    try:
+        return mapping[value.casefold()]
+    except KeyError:
+        raise ValueError(f"Некорректное значение {name}: {value!r}") from None
+
+
+def _parse_time(value: str) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
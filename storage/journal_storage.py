@@ -0,0 +1,169 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from storage.base import Change, Storage
+from models.task import Task
+
+# Размер журнала, после которого он сворачивается в новый снимок
+DEFAULT_COMPACT_THRESHOLD = 1024 * 1024
+
+
+class JournalStorage(Storage):
+    """
+    Хранилище «снимок + журнал операций».
+
+    Каждая мутация дописывает в журнал одну JSON-строку (created,
+    updated с изменёнными полями, completed, deleted) вместо полной
+    перезаписи файла. При загрузке состояние восстанавливается из
+    последнего снимка и хвоста журнала. Когда журнал превышает порог,
+    он сворачивается в новый снимок.
+    """
+
+    def __init__(self, file_path: Path, journal_path: Optional[Path] = None,
+                 compact_threshold: int = DEFAULT_COMPACT_THRESHOLD):
+        """
+        Args:
+            file_path: Путь к файлу снимка
+            journal_path: Путь к журналу (по умолчанию <снимок>.journal)
+            compact_threshold: Размер журнала в байтах для свёртки
+        """
+        super().__init__(file_path)
+        self.journal_path = journal_path or file_path.with_suffix(".journal")
+        self.compact_threshold = compact_threshold
+        # Номер последней записи; None — хранилище ещё не загружалось
+        self._seq: Optional[int] = None
+
+    def save(self, tasks: List[Task]) -> bool:
+        """Записать полный снимок и очистить журнал"""
+        try:
+            if self._seq is None:
+                self.load()
+            self._write_snapshot(tasks)
+            return True
+        except Exception:
+            return False
+
+    def save_changes(self, changes: List[Change], tasks: Iterable[Task]) -> bool:
+        """Дописать изменения в журнал; при переполнении — свернуть его"""
+        if not changes:
+            return True
+        try:
+            if self._seq is None:
+                self.load()
+            lines = []
+            for change in changes:
+                self._seq += 1
+                lines.append(json.dumps(
+                    self._make_record(change), ensure_ascii=False
+                ))
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                start = f.tell()
+                f.write("\n".join(lines) + "\n")
+                size = f.tell()
+            self.bytes_written += size - start
+
+            if size >= self.compact_threshold:
+                self._write_snapshot(tasks)
+            return True
+        except Exception:
+            return False
+
+    def load(self) -> List[Task]:
+        """Восстановить задачи из снимка и журнала"""
+        state, self._seq = self._read_snapshot()
+
+        if self.journal_path.exists():
+            with open(self.journal_path, "r+b") as f:
+                while True:
+                    position = f.tell()
+                    line = f.readline()
+                    if not line:
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Недописанная строка после сбоя: отрезаем её,
+                        # чтобы следующие записи начинались с новой строки
+                        f.truncate(position)
+                        break
+                    self.bytes_read += len(line)
+                    if record["seq"] <= self._seq:
+                        continue
+                    self._apply(state, record)
+                    self._seq = record["seq"]
+
+        return [Task.from_dict(item) for item in state.values()]
+
+    def export(self, tasks, export_path):
+        """Экспорт задач в обычный JSON-массив"""
+        try:
+            export_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(export_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    [task.to_dict() for task in tasks],
+                    f,
+                    indent=2,
+                    ensure_ascii=False
+                )
+            return True
+        except Exception:
+            return False
+
+    def compact(self, tasks: Iterable[Task]) -> bool:
+        """Принудительно свернуть журнал в снимок"""
+        return self.save(list(tasks))
+
+    def _make_record(self, change: Change) -> dict:
+        record = {"seq": self._seq, "op": change.action, "id": change.task.id}
+        if change.action == "created":
+            record["task"] = change.task.to_dict()
+        elif change.action in ("updated", "completed"):
+            record["fields"] = change.field_values()
+        return record
+
+    @staticmethod
+    def _apply(state: Dict[str, dict], record: dict) -> None:
+        op = record["op"]
+        task_id = record["id"]
+        if op == "created":
+            state[task_id] = record["task"]
+        elif op == "deleted":
+            state.pop(task_id, None)
+        elif task_id in state:
+            state[task_id].update(record.get("fields", {}))
+
+    def _read_snapshot(self) -> tuple[Dict[str, dict], int]:
+        if not self.file_path.exists():
+            return {}, 0
+        try:
+            with open(self.file_path, "rb") as f:
+                raw = f.read()
+            self.bytes_read += len(raw)
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            return {}, 0
+
+        # Обычный JSON-массив (например, файл JSONStorage) — снимок без журнала
+        if isinstance(data, list):
+            items, seq = data, 0
+        else:
+            items, seq = data.get("tasks", []), data.get("seq", 0)
+        return {item["id"]: item for item in items}, seq
+
+    def _write_snapshot(self, tasks: Iterable[Task]) -> None:
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        # json.dumps без отступов работает через C-кодировщик,
+        # в отличие от потокового json.dump
+        text = json.dumps(
+            {"seq": self._seq, "tasks": [task.to_dict() for task in tasks]},
+            ensure_ascii=False
+        )
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+            self.bytes_written += f.tell()
+        os.replace(tmp_path, self.file_path)
+        # Все записи журнала уже вошли в снимок
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
@@ -1,7 +1,77 @@
 import json
+from typing import Iterator, TextIO
 from storage.base import Storage
 from models.task import Task
 
+# Размер блока, которым читается файл при потоковой загрузке
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\r\n"
+
+
+def iter_json_array(f: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Потоково разобрать JSON-массив объектов верхнего уровня.
+
+    Файл читается блоками по chunk_size символов, и в памяти
+    находится только текущий блок и один разобранный элемент.
+
+    Raises:
+        json.JSONDecodeError: Если файл не является JSON-массивом
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    expect = "["  # "[" — начало, "value" — элемент, "," — разделитель
+
+    while True:
+        # Пропускаем пробелы, при необходимости дочитывая файл
+        while True:
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+
+        if pos >= len(buffer):
+            raise json.JSONDecodeError("Unexpected end of array", buffer, pos)
+
+        char = buffer[pos]
+        if expect == "[":
+            if char != "[":
+                raise json.JSONDecodeError("Expecting '['", buffer, pos)
+            pos += 1
+            expect = "first"
+            continue
+
+        if char == "]" and expect in ("first", ","):
+            return
+
+        if expect == ",":
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+            expect = "value"
+            continue
+
+        # Элемент может не поместиться в буфер — дочитываем и пробуем снова
+        while True:
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+                break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+
+        yield item
+        expect = ","
+
+
 class JSONStorage(Storage):
 
 
@@ -21,6 +91,7 @@ class JSONStorage(Storage):
                         indent=2,
                         ensure_ascii=False
                     )
+                    self.bytes_written += f.tell()
                 return True
             except Exception:
                 return False
@@ -34,16 +105,29 @@ class JSONStorage(Storage):
 
             """
 
-            if not self.file_path.exists():
-                return []
-
             try:
-                with open(self.file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                return [Task.from_dict(item) for item in data]
+                return list(self.iter_load())
             except json.JSONDecodeError:
                 return []
 
+        def iter_load(self):
+            """
+            Потоковая загрузка: разбирает массив поэлементно и отдаёт
+            задачи по одной, не держа в памяти весь файл.
+            Если файл не существует — ничего не отдаёт.
+            При повреждённом файле бросает json.JSONDecodeError.
+            """
+
+            if not self.file_path.exists():
+                return
+
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                try:
+                    for item in iter_json_array(f):
+                        yield Task.from_dict(item)
+                finally:
+                    self.bytes_read += f.buffer.tell()
+
         def export(self, tasks, export_path):
             """
             Аналогичен методу save, но сохраняет данные по указанному пути export_path.
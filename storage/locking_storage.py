@@ -0,0 +1,195 @@
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from storage.base import Change, ConflictError
+from storage.json_storage import JSONStorage, iter_json_array
+from models.task import Task
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировка недоступна, запись остаётся атомарной
+    fcntl = None
+
+# Отпечаток файла: inode, размер и время изменения. Запись идёт через
+# os.replace, поэтому каждая запись даёт новый inode
+Stamp = Tuple[int, int, int]
+
+
+class LockingJSONStorage(JSONStorage):
+    """
+    JSON-хранилище для нескольких процессов, работающих с одним файлом.
+
+    Формат файла тот же, что у JSONStorage. Отличия:
+
+    - запись атомарна: данные пишутся во временный файл рядом
+      и подменяют основной через os.replace, поэтому читатель всегда
+      видит целый файл и читает без блокировки;
+    - писатели сериализуются рекомендательной блокировкой fcntl.flock
+      на файле <имя>.lock;
+    - save_changes сравнивает версии изменяемых задач (Task.version)
+      с теми, что были загружены: если другой процесс успел изменить
+      ту же задачу, запись отменяется с ConflictError, а изменения
+      других задач из файла сохраняются, а не затираются;
+    - is_stale по отпечатку файла (os.stat) дёшево сообщает, что файл
+      изменил кто-то другой и задачи пора перечитать.
+    """
+
+    def __init__(self, file_path: Path, lock_path: Optional[Path] = None):
+        """
+        Args:
+            file_path: Путь к JSON-файлу задач
+            lock_path: Путь к файлу блокировки (по умолчанию <имя>.lock)
+        """
+        super().__init__(file_path)
+        self.lock_path = lock_path or file_path.with_name(file_path.name + ".lock")
+        # Отпечаток файла и версии задач на момент последней загрузки или записи
+        self._stamp: Optional[Stamp] = None
+        self._versions: Dict[str, int] = {}
+        # В файл попали чужие изменения, которых ещё нет в памяти
+        self._stale = False
+
+    def save(self, tasks: List[Task]) -> bool:
+        """Записать все задачи, заменив содержимое файла"""
+        try:
+            with self._locked():
+                self._write([task.to_dict() for task in tasks])
+                self._stale = False
+            return True
+        except Exception:
+            return False
+
+    def save_changes(self, changes: List[Change], tasks: Iterable[Task]) -> bool:
+        """
+        Записать изменения с проверкой версий.
+
+        Если файл не менялся с последней загрузки, он записывается
+        из tasks. Иначе изменения накладываются на текущее содержимое
+        файла, чтобы не потерять задачи, записанные другими процессами.
+
+        Raises:
+            ConflictError: Если изменяемую задачу уже изменил или удалил
+                другой процесс; файл при этом не меняется
+        """
+        if not changes:
+            return True
+        try:
+            with self._locked():
+                # Для каждой задачи важно только её последнее состояние
+                latest: Dict[str, Change] = {}
+                for change in changes:
+                    latest.pop(change.task.id, None)
+                    latest[change.task.id] = change
+
+                if not self._stale and self._current_stamp() == self._stamp:
+                    self._write([task.to_dict() for task in tasks])
+                else:
+                    self._write(self._merge(latest))
+                    # В памяти нет задач, записанных другими процессами
+                    self._stale = True
+            return True
+        except ConflictError:
+            raise
+        except Exception:
+            return False
+
+    def iter_load(self) -> Iterator[Task]:
+        """
+        Потоково загрузить задачи и запомнить их версии.
+
+        Файл подменяется целиком, поэтому открытый файл остаётся
+        согласованным, даже если другой процесс запишет новый.
+        """
+        if not self.file_path.exists():
+            self._remember(None, {})
+            return
+
+        versions = {}
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            stamp = self._stamp_of(os.fstat(f.fileno()))
+            try:
+                for item in iter_json_array(f):
+                    task = Task.from_dict(item)
+                    versions[task.id] = task.version
+                    yield task
+            finally:
+                self.bytes_read += f.buffer.tell()
+        self._remember(stamp, versions)
+
+    def is_stale(self) -> bool:
+        """Изменён ли файл после последней загрузки; стоит один os.stat"""
+        return self._stale or self._current_stamp() != self._stamp
+
+    def _merge(self, latest: Dict[str, Change]) -> List[dict]:
+        """Наложить изменения на текущее содержимое файла"""
+        current: Dict[str, dict] = {}
+        if self.file_path.exists():
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                for item in iter_json_array(f):
+                    current[item["id"]] = item
+                self.bytes_read += f.buffer.tell()
+
+        conflicts = []
+        for task_id, change in latest.items():
+            item = current.get(task_id)
+            on_disk = item.get("version", 0) if item is not None else None
+            expected = None if change.action == "created" else self._versions.get(task_id)
+            if on_disk != expected:
+                conflicts.append(task_id)
+        if conflicts:
+            self._stale = True
+            raise ConflictError(conflicts)
+
+        for task_id, change in latest.items():
+            if change.action == "deleted":
+                current.pop(task_id, None)
+            else:
+                # Изменённая задача остаётся на своём месте, новая — в конце
+                current[task_id] = change.task.to_dict()
+        return list(current.values())
+
+    def _write(self, items: List[dict]) -> None:
+        tmp_path = self.file_path.with_name(f".{self.file_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(items, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+                self.bytes_written += f.tell()
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._remember(
+            self._current_stamp(),
+            {item["id"]: item.get("version", 0) for item in items},
+        )
+
+    def _remember(self, stamp: Optional[Stamp], versions: Dict[str, int]) -> None:
+        self._stamp = stamp
+        self._versions = versions
+        self._stale = False
+
+    def _current_stamp(self) -> Optional[Stamp]:
+        try:
+            return self._stamp_of(os.stat(self.file_path))
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _stamp_of(stat: os.stat_result) -> Stamp:
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    @contextmanager
+    def _locked(self):
+        """Эксклюзивная блокировка писателя на время чтения-изменения-записи"""
+        with open(self.lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
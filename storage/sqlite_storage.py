@@ -0,0 +1,334 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from storage.base import Change, QueryableStorage
+from models.task import Task
+from models.enums import Priority, TaskStatus
+from services.search_index import task_tokens, tokenize
+
+# Номер схемы в PRAGMA user_version; базы со старшим номером не мигрируются
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    status TEXT NOT NULL,
+    completed INTEGER NOT NULL,
+    deadline TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS task_tags (
+    task_id TEXT NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (task_id, position)
+) WITHOUT ROWID;
+-- Слова названия, описания и тегов (как в SearchIndex) для поиска по префиксу
+CREATE TABLE IF NOT EXISTS task_words (
+    word TEXT NOT NULL,
+    task_id TEXT NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    PRIMARY KEY (word, task_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_deadline ON tasks(deadline) WHERE completed = 0;
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags(tag);
+CREATE INDEX IF NOT EXISTS idx_task_words_task ON task_words(task_id);
+"""
+
+# Теги собираются одним подзапросом, чтобы не делать запрос на каждую задачу
+SELECT_TASKS = """
+SELECT t.id, t.title, t.description, t.priority, t.status, t.completed,
+       t.deadline, t.created_at, t.updated_at, t.version,
+       (SELECT json_group_array(tag) FROM
+           (SELECT tag FROM task_tags WHERE task_id = t.id ORDER BY position))
+FROM tasks AS t
+"""
+
+UPSERT_TASK = """
+INSERT INTO tasks (id, title, description, priority, status, completed,
+                   deadline, created_at, updated_at, version)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    title = excluded.title,
+    description = excluded.description,
+    priority = excluded.priority,
+    status = excluded.status,
+    completed = excluded.completed,
+    deadline = excluded.deadline,
+    created_at = excluded.created_at,
+    updated_at = excluded.updated_at,
+    version = excluded.version
+"""
+
+DELETE_TAGS = "DELETE FROM task_tags WHERE task_id = ?"
+INSERT_TAG = "INSERT INTO task_tags (task_id, position, tag) VALUES (?, ?, ?)"
+DELETE_WORDS = "DELETE FROM task_words WHERE task_id = ?"
+INSERT_WORD = "INSERT INTO task_words (word, task_id) VALUES (?, ?)"
+# Слова с префиксом ? лежат в диапазоне [?, ? + последний символ Юникода)
+MATCH_WORD = "t.id IN (SELECT task_id FROM task_words WHERE word >= ? AND word < ?)"
+DELETE_TASK = "DELETE FROM tasks WHERE id = ?"
+
+
+class SQLiteStorage(QueryableStorage):
+    """
+    Хранилище задач в SQLite.
+
+    База работает в режиме WAL, запросы по статусу, приоритету,
+    дедлайну и тегам идут по индексам. При сохранении записываются
+    только изменившиеся строки, поэтому save() не переписывает всю базу.
+    """
+
+    def __init__(self, file_path: Path):
+        """
+        Args:
+            file_path: Путь к файлу базы данных
+        """
+        super().__init__(file_path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(file_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        # Отпечатки последних записанных строк: id -> hash(строка)
+        self._fingerprints: Dict[str, int] = {}
+
+    def _migrate(self) -> None:
+        """Довести базу прежних версий до текущей схемы"""
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        with self._conn:
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+            if "version" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+                )
+            # Таблица слов появилась вместе с номером схемы — заполняем её
+            self._conn.execute("DELETE FROM task_words")
+            self._conn.executemany(INSERT_WORD, [
+                (word, task.id) for task in list(self.iter_tasks())
+                for word in task_tokens(task)
+            ])
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def save(self, tasks: List[Task]) -> bool:
+        """Записать изменившиеся задачи и удалить отсутствующие"""
+        try:
+            with self._lock:
+                if not self._fingerprints:
+                    self._load_fingerprints()
+                rows = [self._task_row(task) for task in tasks]
+                changed = [
+                    (row, task) for row, task in zip(rows, tasks)
+                    if self._fingerprints.get(task.id) != hash(row)
+                ]
+                alive = {task.id for task in tasks}
+                removed = [task_id for task_id in self._fingerprints
+                           if task_id not in alive]
+
+                with self._conn:
+                    self._write_rows(changed)
+                    self._conn.executemany(
+                        DELETE_TASK, [(task_id,) for task_id in removed]
+                    )
+                for task_id in removed:
+                    del self._fingerprints[task_id]
+            return True
+        except Exception:
+            return False
+
+    def save_changes(self, changes: List[Change], tasks: Iterable[Task]) -> bool:
+        """Записать только затронутые задачи"""
+        try:
+            with self._lock:
+                # Для каждой задачи важно только её последнее состояние
+                latest: Dict[str, Change] = {}
+                for change in changes:
+                    latest.pop(change.task.id, None)
+                    latest[change.task.id] = change
+
+                upserts = [
+                    (self._task_row(change.task), change.task)
+                    for change in latest.values() if change.action != "deleted"
+                ]
+                removed = [task_id for task_id, change in latest.items()
+                           if change.action == "deleted"]
+
+                with self._conn:
+                    self._write_rows(upserts)
+                    self._conn.executemany(
+                        DELETE_TASK, [(task_id,) for task_id in removed]
+                    )
+                for task_id in removed:
+                    self._fingerprints.pop(task_id, None)
+            return True
+        except Exception:
+            return False
+
+    def load(self) -> List[Task]:
+        """Загрузить все задачи"""
+        tasks = list(self.iter_tasks())
+        with self._lock:
+            self._fingerprints = {
+                task.id: hash(self._task_row(task)) for task in tasks
+            }
+        return tasks
+
+    def export(self, tasks, export_path):
+        """Экспорт задач в отдельную базу SQLite"""
+        target = SQLiteStorage(export_path)
+        try:
+            return target.save(list(tasks))
+        finally:
+            target.close()
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        tasks = self._query("WHERE t.id = ?", (task_id,))
+        return tasks[0] if tasks else None
+
+    def iter_tasks(self) -> Iterator[Task]:
+        with self._lock:
+            cursor = self._conn.execute(SELECT_TASKS + "ORDER BY t.rowid")
+            rows = cursor.fetchmany(1000)
+        while rows:
+            for row in rows:
+                yield self._row_task(row)
+            with self._lock:
+                rows = cursor.fetchmany(1000)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM tasks").fetchone()[0]
+
+    def count_by_status(self, status: TaskStatus) -> int:
+        return self._count("WHERE status = ?", (TaskStatus(status).value,))
+
+    def count_by_priority(self, priority: Priority) -> int:
+        return self._count("WHERE priority = ?", (Priority(priority).value,))
+
+    def count_completed(self) -> int:
+        return self._count("WHERE completed = 1", ())
+
+    def count_overdue(self, now: datetime) -> int:
+        return self._count(
+            "WHERE completed = 0 AND deadline IS NOT NULL AND deadline < ?",
+            (now.isoformat(),)
+        )
+
+    def find_by_status(self, status: TaskStatus) -> List[Task]:
+        return self._query("WHERE t.status = ?", (TaskStatus(status).value,))
+
+    def find_by_priority(self, priority: Priority) -> List[Task]:
+        return self._query("WHERE t.priority = ?", (Priority(priority).value,))
+
+    def find_by_tag(self, tag: str) -> List[Task]:
+        return self._query(
+            "WHERE t.id IN (SELECT task_id FROM task_tags WHERE tag = ?)", (tag,)
+        )
+
+    def find_by_completed(self, completed: bool) -> List[Task]:
+        return self._query("WHERE t.completed = ?", (int(completed),))
+
+    def find_overdue(self, now: datetime) -> List[Task]:
+        return self._query(
+            "WHERE t.completed = 0 AND t.deadline IS NOT NULL AND t.deadline < ?",
+            (now.isoformat(),)
+        )
+
+    def search(self, query: str) -> List[Task]:
+        # Те же правила, что у SearchIndex: каждое слово запроса —
+        # префикс какого-либо слова задачи
+        terms = sorted(set(tokenize(query)), key=len, reverse=True)
+        if not terms:
+            return self._query("", ())
+        params = []
+        for term in terms:
+            params += [term, term + "\U0010ffff"]
+        return self._query(
+            "WHERE " + " AND ".join([MATCH_WORD] * len(terms)), tuple(params)
+        )
+
+    def _query(self, where: str, params: tuple) -> List[Task]:
+        with self._lock:
+            rows = self._conn.execute(
+                SELECT_TASKS + where + " ORDER BY t.rowid", params
+            ).fetchall()
+        return [self._row_task(row) for row in rows]
+
+    def _count(self, where: str, params: tuple) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT count(*) FROM tasks " + where, params
+            ).fetchone()[0]
+
+    def _load_fingerprints(self) -> None:
+        self._fingerprints = {
+            task.id: hash(self._task_row(task)) for task in self.iter_tasks()
+        }
+
+    def _write_rows(self, rows: list) -> None:
+        if not rows:
+            return
+        self._conn.executemany(UPSERT_TASK, [row[:-1] for row, _ in rows])
+        self._conn.executemany(DELETE_TAGS, [(task.id,) for _, task in rows])
+        self._conn.executemany(INSERT_TAG, [
+            (task.id, position, tag)
+            for _, task in rows
+            for position, tag in enumerate(task.tags)
+        ])
+        self._conn.executemany(DELETE_WORDS, [(task.id,) for _, task in rows])
+        self._conn.executemany(INSERT_WORD, [
+            (word, task.id) for _, task in rows for word in task_tokens(task)
+        ])
+        for row, task in rows:
+            self._fingerprints[task.id] = hash(row)
+
+    @staticmethod
+    def _task_row(task: Task) -> tuple:
+        # Последний элемент (теги) участвует только в отпечатке строки
+        return (
+            task.id,
+            task.title,
+            task.description,
+            task.priority.value,
+            task.status.value,
+            int(task.completed),
+            task.deadline.isoformat() if task.deadline else None,
+            task.created_at.isoformat(),
+            task.updated_at.isoformat(),
+            task.version,
+            tuple(task.tags),
+        )
+
+    @staticmethod
+    def _row_task(row: tuple) -> Task:
+        (task_id, title, description, priority, status, completed,
+         deadline, created_at, updated_at, version, tags) = row
+        return Task(
+            id=task_id,
+            title=title,
+            description=description,
+            priority=Priority(priority),
+            status=TaskStatus(status),
+            completed=bool(completed),
+            deadline=datetime.fromisoformat(deadline) if deadline else None,
+            created_at=datetime.fromisoformat(created_at),
+            updated_at=datetime.fromisoformat(updated_at),
+            tags=json.loads(tags),
+            version=version,
+        )
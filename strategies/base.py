@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List, Sequence
 from models.task import Task
 
 
@@ -17,6 +18,19 @@ class PriorityStrategy(ABC):
         """
         pass
 
+    def calculate_priorities(self, tasks: Sequence[Task]) -> List[float]:
+        """
+        Рассчитать приоритеты сразу для набора задач
+
+        Стратегии переопределяют метод, чтобы считать все задачи
+        за один проход по столбцам (см. strategies.columns).
+        Результат совпадает с calculate_priority для каждой задачи.
+
+        Returns:
+            List[float]: Приоритеты в порядке задач
+        """
+        return [self.calculate_priority(task) for task in tasks]
+
     @abstractmethod
     def get_name(self) -> str:
         """Название стратегии"""
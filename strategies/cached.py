@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, List, Sequence
+
+from strategies.base import PriorityStrategy
+from models.task import Task
+
+DEFAULT_MAX_SIZE = 100_000
+
+
+class CachedPriorityStrategy(PriorityStrategy):
+    """
+    Стратегия-обёртка, запоминающая рассчитанные приоритеты.
+
+    Приоритеты стратегий меняются только при изменении задачи
+    или при смене календарного дня, поэтому ключ кэша — id задачи,
+    её версия (растёт в update/mark_completed/mark_uncompleted)
+    и текущая дата. Номер версии может повториться с другим
+    содержимым — после отката несохранённого изменения в режиме
+    pushdown или после перечитывания задач, изменённых другим
+    процессом, — поэтому в ключ входят и поля, по которым считают
+    встроенные стратегии. Размер кэша ограничен, вытесняются
+    давно не использованные записи (LRU).
+    """
+
+    def __init__(self, strategy: PriorityStrategy, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Args:
+            strategy: Исходная стратегия
+            max_size: Максимальное число запомненных приоритетов
+        """
+        self.strategy = strategy
+        self.max_size = max_size
+        self._cache: OrderedDict[tuple, float] = OrderedDict()
+        self._day = date.today()
+        self.hits = 0
+        self.misses = 0
+
+    def calculate_priority(self, task: Task) -> float:
+        self._check_day()
+        key = self._key(task)
+        score = self._cache.get(key)
+        if score is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return score
+
+        self.misses += 1
+        score = self.strategy.calculate_priority(task)
+        self._store(key, score)
+        return score
+
+    def calculate_priorities(self, tasks: Sequence[Task]) -> List[float]:
+        """Пакетный расчёт: исходная стратегия считает только промахи"""
+        self._check_day()
+        cache = self._cache
+        scores: List[float] = []
+        missing: List[int] = []
+        for position, task in enumerate(tasks):
+            key = self._key(task)
+            score = cache.get(key)
+            if score is None:
+                missing.append(position)
+            else:
+                cache.move_to_end(key)
+            scores.append(score)
+
+        self.hits += len(tasks) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            computed = self.strategy.calculate_priorities([tasks[i] for i in missing])
+            for position, score in zip(missing, computed):
+                task = tasks[position]
+                scores[position] = score
+                self._store(self._key(task), score)
+        return scores
+
+    def get_name(self) -> str:
+        return self.strategy.get_name()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Статистика попаданий в кэш"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "hit_rate": round(self.hits / total * 100, 1) if total else 0,
+        }
+
+    def clear(self) -> None:
+        """Очистить кэш и статистику"""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(task: Task) -> tuple:
+        return (task.id, task.version, task.priority, task.status,
+                task.completed, task.deadline, task.created_at)
+
+    def _check_day(self) -> None:
+        # Дата входит в ключ: при смене дня все записи устаревают разом
+        today = date.today()
+        if today != self._day:
+            self._cache.clear()
+            self._day = today
+
+    def _store(self, key: tuple, score: float) -> None:
+        self._cache[key] = score
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
@@ -1,6 +1,11 @@
 from datetime import datetime
+from typing import List, Sequence
 from strategies.base import PriorityStrategy
+from strategies.columns import STATUS_CODES, build_columns, np
 from models.task import Task
+from models.enums import TaskStatus
+
+IN_PROGRESS_CODE = STATUS_CODES[TaskStatus.IN_PROGRESS]
 
 class CombinedPriorityStrategy(PriorityStrategy):
     """
@@ -37,15 +42,57 @@ class CombinedPriorityStrategy(PriorityStrategy):
         
         # 3. Возраст задачи (0-100)
         # Старые невыполненные задачи важнее
-        age_days = (datetime.now() - task.created_at).days
+        age_days = (datetime.now().date() - task.created_at.date()).days
         if not task.completed and age_days > 7:
             score += min(age_days * 2, 100)
         
         # 4. Статус (бонус за задачи в работе)
-        if task.status.value == "in_progress":
+        if task.status == TaskStatus.IN_PROGRESS:
             score += 50
         
         return score
+
+    def calculate_priorities(self, tasks: Sequence[Task]) -> List[float]:
+        """Пакетный расчёт по столбцам (NumPy, если установлен)"""
+        columns = build_columns(tasks)
+
+        if np is not None:
+            days = columns.deadline_days
+            age = columns.age_days
+            score = columns.priority * 100.0
+            deadline_bonus = np.select(
+                [days < 0, days == 0, days <= 3, days <= 7],
+                [500.0, 400.0, 300.0, 200.0],
+                100.0
+            )
+            score += np.where(columns.has_deadline == 1, deadline_bonus, 0.0)
+            score += np.where((columns.completed == 0) & (age > 7),
+                              np.minimum(age * 2, 100), 0)
+            score += np.where(columns.status == IN_PROGRESS_CODE, 50.0, 0.0)
+            return score.tolist()
+
+        scores = []
+        for priority, has_deadline, days, age, status, completed in zip(
+                columns.priority, columns.has_deadline, columns.deadline_days,
+                columns.age_days, columns.status, columns.completed):
+            score = priority * 100.0
+            if has_deadline:
+                if days < 0:
+                    score += 500
+                elif days == 0:
+                    score += 400
+                elif days <= 3:
+                    score += 300
+                elif days <= 7:
+                    score += 200
+                else:
+                    score += 100
+            if not completed and age > 7:
+                score += min(age * 2, 100)
+            if status == IN_PROGRESS_CODE:
+                score += 50
+            scores.append(score)
+        return scores
     
     def get_name(self) -> str:
         return "Combined Priority"
\ No newline at end of file
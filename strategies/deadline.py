@@ -1,4 +1,6 @@
+from typing import List, Sequence
 from strategies.base import PriorityStrategy
+from strategies.columns import build_columns, np
 from models.task import Task
 
 
@@ -48,5 +50,38 @@ class DeadlinePriorityStrategy(PriorityStrategy):
 
         return base_priority + bonus
 
+    def calculate_priorities(self, tasks: Sequence[Task]) -> List[float]:
+        """Пакетный расчёт по столбцам (NumPy, если установлен)"""
+        columns = build_columns(tasks)
+
+        if np is not None:
+            days = columns.deadline_days
+            base = columns.priority * 100.0
+            safe_days = np.where(days == 0, 1, days)
+            bonus = np.select(
+                [days < 0, days == 0, days <= 3, days <= 7],
+                [1000.0 + np.abs(days), 500.0, 300 / safe_days, 100 / safe_days],
+                50 / safe_days
+            )
+            return np.where(columns.has_deadline == 1, base + bonus, base).tolist()
+
+        scores = []
+        for priority, has_deadline, days in zip(
+                columns.priority, columns.has_deadline, columns.deadline_days):
+            base_priority = priority * 100
+            if not has_deadline:
+                scores.append(base_priority)
+            elif days < 0:
+                scores.append(base_priority + 1000 + abs(days))
+            elif days == 0:
+                scores.append(base_priority + 500)
+            elif days <= 3:
+                scores.append(base_priority + 300 / days)
+            elif days <= 7:
+                scores.append(base_priority + 100 / days)
+            else:
+                scores.append(base_priority + 50 / days)
+        return scores
+
     def get_name(self) -> str:
         return "Deadline Priority"
@@ -1,4 +1,6 @@
+from typing import List, Sequence
 from strategies.base import PriorityStrategy
+from strategies.columns import PRIORITY_VALUES
 from models.task import Task
 
 
@@ -12,6 +14,10 @@ class ImportancePriorityStrategy(PriorityStrategy):
     def calculate_priority(self, task: Task) -> float:
         """Просто возвращаем числовое значение приоритета"""
         return task.priority.numeric_value
+
+    def calculate_priorities(self, tasks: Sequence[Task]) -> List[float]:
+        """Пакетный расчёт: столбцы не нужны, достаточно одного прохода"""
+        return [PRIORITY_VALUES[task.priority] for task in tasks]
     
     def get_name(self) -> str:
         return "Importance Priority"
\ No newline at end of file